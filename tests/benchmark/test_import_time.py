@@ -0,0 +1,41 @@
+"""Regression tests for the import time of ZnTrack.
+
+`dvc repro` pays the import time once per stage, so heavy dependencies
+must only be imported on first use.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"dvc", "pandas", "git", "yaml", "tqdm", "fsspec", "znjson", "rich"}
+
+
+def _importtime(module: str) -> dict[str, int]:
+    """Get the cumulative import time in microseconds per imported module."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        result[name.strip()] = int(cumulative)
+    return result
+
+
+@pytest.mark.parametrize("module", ["zntrack", "zntrack.cli"])
+def test_no_heavy_imports(module):
+    imported = {name.split(".")[0] for name in _importtime(module)}
+    assert imported & HEAVY_MODULES == set()
+
+
+@pytest.mark.benchmark(group="import")
+@pytest.mark.parametrize("module", ["zntrack", "zntrack.cli"])
+def test_import_time(benchmark, module):
+    benchmark(subprocess.check_call, [sys.executable, "-c", f"import {module}"])
@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+import zntrack
+import zntrack.examples
+from zntrack.deployment import ZnTrackDeployment
+
+
+def build(background_save: bool):
+    deployment = ZnTrackDeployment(background_save=background_save)
+    with zntrack.Project(deployment=deployment) as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+        c = zntrack.examples.AddOne(number=b.outs)
+    return project, [a, b, c]
+
+
+def node_meta(node) -> dict:
+    return json.loads((node.nwd / "node-meta.json").read_text())
+
+
+def test_background_save(proj_path):
+    project, nodes = build(background_save=True)
+    project.run()
+    assert [node.outs for node in nodes] == [1, 2, 3]
+    meta = [node_meta(node) for node in nodes]
+    assert all(x["input_hash"] is not None for x in meta)
+    assert all(x["output_hash"] is not None for x in meta)
+    assert all((node.nwd / "outs.json").exists() for node in nodes)
+
+    # the hashes match the ones of a run without background saving
+    project, nodes = build(background_save=False)
+    project.run()
+    assert all("outs" not in node.__dict__ for node in nodes)
+    assert [node_meta(node) for node in nodes] == meta
+
+
+def test_background_save_error(proj_path, monkeypatch):
+    def fail(node, usage=None):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("zntrack.deployment._save_results", fail)
+    project, nodes = build(background_save=True)
+    with pytest.raises(OSError, match="disk full"):
+        project.run()
+    assert [node.outs for node in nodes] == [1, 2, 3]
@@ -0,0 +1,49 @@
+import pathlib
+import subprocess
+
+from dvc.dependency.base import Dependency
+
+import zntrack
+import zntrack.examples
+
+
+def test_changed(proj_path, monkeypatch):
+    pathlib.Path("data.txt").write_text("Hello World")
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+        with project.group("files") as group:
+            c = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"))
+            d = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"), name="D")
+    project.build()
+    nodes = [a, b, c, d]
+
+    assert zntrack.changed(nodes) == {x.name: True for x in nodes}
+    subprocess.check_call(["dvc", "repro"])
+    assert zntrack.changed(nodes) == {x.name: False for x in nodes}
+    assert group.changed() == {c.name: False, d.name: False}
+
+    a.params = 2
+    project.build()
+    pathlib.Path("data.txt").write_text("Lorem Ipsum")
+
+    hashed = []
+    save = Dependency.save
+
+    def counting_save(self):
+        hashed.append(self.def_path)
+        return save(self)
+
+    monkeypatch.setattr(Dependency, "save", counting_save)
+    assert zntrack.changed(nodes, jobs=2) == {
+        a.name: True,
+        b.name: False,  # the outputs of 'a' are unchanged until it runs
+        c.name: True,
+        d.name: True,
+    }
+    # the file shared by both nodes is hashed once
+    assert hashed.count("data.txt") == 1
+
+    assert a.state.changed
+    assert not b.state.changed
+    assert zntrack.changed(d) == {d.name: True}
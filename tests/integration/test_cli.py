@@ -1,5 +1,7 @@
 import json
+import os
 import subprocess
+import sys
 
 import pytest
 from typer.testing import CliRunner
@@ -7,6 +9,21 @@ from typer.testing import CliRunner
 import zntrack
 import zntrack.examples
 from zntrack.cli import app
+from zntrack.utils.state import get_node_status
+
+
+class EnvNode(zntrack.Node):
+    """Record and modify the environment of the process."""
+
+    upstream: dict | None = zntrack.deps(None)
+    outs: dict = zntrack.outs()
+
+    def run(self) -> None:
+        self.outs = {
+            "leaked": os.environ.get("ZNTRACK_TEST_LEAK"),
+            "sys_path": sys.path.count(os.getcwd()),
+        }
+        os.environ["ZNTRACK_TEST_LEAK"] = self.name
 
 
 @pytest.fixture()
@@ -358,3 +375,134 @@ def test_list_multi_nested_groups(proj_path, runner):
         └── dynamics_400K_B_ParamsToOuts_1 ❌
 """
     assert result.stdout in outs
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_many(proj_path, runner, jobs):
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.ParamsToOuts(params=2)
+        c = zntrack.examples.AddNodeNumbers(numbers=[a, b])
+        d = zntrack.examples.ParamsToOuts(params=4)
+
+    proj.build()
+
+    # the order of the arguments does not matter
+    result = runner.invoke(app, ["run-many", c.name, a.name, b.name, "--jobs", str(jobs)])
+    assert result.exit_code == 0
+
+    assert c.sum == 3
+    for node in [a, b, c]:
+        assert node.state.fs.exists(node.nwd / "node-meta.json")
+        # the lockfile in node-meta.json is the same as for 'zntrack run'
+        assert get_node_status(node.name, remote=None, rev=None) is False
+    assert get_node_status(d.name, remote=None, rev=None) is True
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_run_many_isolation(proj_path, runner, jobs):
+    with zntrack.Project() as proj:
+        a = EnvNode()
+        b = EnvNode(upstream=a.outs)
+        c = EnvNode(upstream=b.outs)
+
+    proj.build()
+
+    result = runner.invoke(app, ["run-many", a.name, b.name, c.name, "-j", str(jobs)])
+    assert result.exit_code == 0
+    for node in [a, b, c]:
+        # neither environment variables nor 'sys.path' entries pile up
+        assert node.outs == {"leaked": None, "sys_path": 1}
+    assert "ZNTRACK_TEST_LEAK" not in os.environ
+
+
+def test_run_many_group(proj_path, runner):
+    proj = zntrack.Project()
+    with proj.group("grp"):
+        a = zntrack.examples.ParamsToOuts(params=1)
+    with proj.group("grp", "nested"):
+        b = zntrack.examples.ParamsToOuts(params=2)
+    with proj:
+        c = zntrack.examples.ParamsToOuts(params=3)
+
+    proj.build()
+
+    result = runner.invoke(app, ["run-many", "--group", "grp"])
+    assert result.exit_code == 0
+
+    assert a.outs == 1
+    assert b.outs == 2
+    assert c.outs is zntrack.NOT_AVAILABLE
+
+
+def test_run_many_fused(proj_path, runner):
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+
+    proj.build(fuse=True)
+
+    result = runner.invoke(app, ["run-many", b.name])
+    assert result.exit_code == 0
+    assert a.outs == 1
+    assert b.outs == 2
+    # the lockfile of the fused stage is saved by the last node
+    assert get_node_status(b.name, remote=None, rev=None) is False
+
+
+def test_run_many_failure(proj_path, runner):
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params="text")
+        b = zntrack.examples.AddNodeNumbers(numbers=[a])
+        c = zntrack.examples.AddNodeNumbers(numbers=[b])
+
+    proj.build()
+
+    result = runner.invoke(app, ["run-many", a.name, b.name, c.name])
+    assert result.exit_code == 1
+    assert f"Stage '{b.name}' failed" in result.output
+    assert f"Stage '{c.name}' skipped" in result.output
+    assert a.outs == "text"
+
+    result = runner.invoke(app, ["run-many", "NonExistentNode"])
+    assert result.exit_code == 1
+
+
+def test_worker(proj_path, runner):
+    with zntrack.Project() as proj:
+        nodes = [zntrack.examples.ParamsToOuts(params=idx) for idx in range(6)]
+        total = zntrack.examples.AddNodeNumbers(numbers=nodes)
+        other = zntrack.examples.ParamsToOuts(params=10)
+
+    proj.build()
+
+    workers = [
+        subprocess.Popen(["zntrack", "worker", total.name, "--poll", "0.1"])
+        for _ in range(3)
+    ]
+    assert [proc.wait(timeout=300) for proc in workers] == [0, 0, 0]
+
+    assert total.sum == 15
+    assert other.outs is zntrack.NOT_AVAILABLE
+    # the lockfile in node-meta.json is the same as for 'zntrack run'
+    assert get_node_status(total.name, remote=None, rev=None) is False
+
+    # all stages are done, a new worker has nothing to do
+    result = runner.invoke(app, ["worker", total.name])
+    assert result.exit_code == 0
+    assert "Running stage" not in result.output
+
+
+def test_worker_failure(proj_path, runner):
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params="text")
+        b = zntrack.examples.AddNodeNumbers(numbers=[a])
+        c = zntrack.examples.AddNodeNumbers(numbers=[b])
+
+    proj.build()
+
+    result = runner.invoke(app, ["worker"])
+    assert result.exit_code == 1
+    assert f"Stage '{b.name}' failed: exit code 1" in result.output
+    assert f"Stage '{c.name}' skipped" in result.output
+    assert a.outs == "text"
@@ -0,0 +1,180 @@
+import gzip
+import json
+import pathlib
+import subprocess
+import threading
+
+import pandas as pd
+import pytest
+import yaml
+
+import zntrack
+from zntrack.config import NOT_AVAILABLE, FieldTypes
+from zntrack.utils.compression import DecompressingFileSystem
+
+
+class CompressedOuts(zntrack.Node):
+    size: int = zntrack.params()
+    outs: list = zntrack.outs(compression="gzip")
+    plots: pd.DataFrame = zntrack.plots(y="value", compression="gzip")
+
+    def run(self) -> None:
+        self.outs = list(range(self.size))
+        self.plots = pd.DataFrame({"value": self.outs})
+
+
+class CompressedAutosavePlots(zntrack.Node):
+    plots: pd.DataFrame = zntrack.plots(y="value", compression="gzip", autosave=True)
+
+    def run(self) -> None:
+        self.plots = pd.DataFrame({"value": [1, 2]})
+        # written on every update, before the node is saved
+        assert (self.nwd / "plots.csv.gz").exists()
+        assert not (self.nwd / "plots.csv").exists()
+
+
+def _text_getter(self: zntrack.Node, name: str, suffix: str) -> str:
+    with self.state.fs.open((self.nwd / name).with_suffix(suffix), mode="rb") as f:
+        return f.read().decode()
+
+
+def _text_dump(self: zntrack.Node, name: str, suffix: str) -> None:
+    self.nwd.mkdir(parents=True, exist_ok=True)
+    (self.nwd / name).with_suffix(suffix).write_text(getattr(self, name))
+
+
+class CompressedCustomField(zntrack.Node):
+    text: str = zntrack.field(
+        default=NOT_AVAILABLE,
+        field_type=FieldTypes.OUTS,
+        dump_fn=_text_dump,
+        load_fn=_text_getter,
+        suffix=".txt",
+        compression="gzip",
+        init=False,
+        repr=False,
+    )
+
+    def run(self) -> None:
+        self.text = "Lorem Ipsum"
+
+
+def _failing_getter(self: zntrack.Node, name: str, suffix: str) -> str:
+    seen = []
+    # other threads read the node with its original file system
+    thread = threading.Thread(target=lambda: seen.append(self.state.fs))
+    thread.start()
+    thread.join()
+    assert isinstance(self.state.fs, DecompressingFileSystem)
+    raise OSError(seen)
+
+
+class CompressedFailingField(zntrack.Node):
+    text: str = zntrack.field(
+        default=NOT_AVAILABLE,
+        field_type=FieldTypes.OUTS,
+        dump_fn=_text_dump,
+        load_fn=_failing_getter,
+        suffix=".txt",
+        compression="gzip",
+        init=False,
+        repr=False,
+    )
+
+    def run(self) -> None:
+        self.text = "Lorem Ipsum"
+
+
+def test_compressed_outs(proj_path):
+    with zntrack.Project() as project:
+        node = CompressedOuts(size=100)
+
+    project.repro()
+
+    dvc_yaml = yaml.safe_load(pathlib.Path("dvc.yaml").read_text())
+    outs = dvc_yaml["stages"]["CompressedOuts"]["outs"]
+    assert "nodes/CompressedOuts/outs.json.gz" in outs
+    assert "nodes/CompressedOuts/plots.csv.gz" in outs
+    # DVC can not render compressed plots
+    assert "plots" not in dvc_yaml
+
+    assert not (node.nwd / "outs.json").exists()
+    with gzip.open(node.nwd / "outs.json.gz") as f:
+        assert json.load(f) == list(range(100))
+
+    node = zntrack.from_rev(node.name)
+    assert node.outs == list(range(100))
+    pd.testing.assert_frame_equal(node.plots, pd.DataFrame({"value": range(100)}))
+
+
+def test_compressed_autosave_plots(proj_path):
+    with zntrack.Project() as project:
+        node = CompressedAutosavePlots()
+
+    project.repro()
+
+    assert not (node.nwd / "plots.csv").exists()
+    plots = zntrack.from_rev(node.name).plots
+    pd.testing.assert_frame_equal(plots, pd.DataFrame({"value": [1, 2]}))
+    assert json.loads(subprocess.check_output(["dvc", "status", "--json"])) == {}
+
+
+def test_compressed_custom_field(proj_path):
+    with zntrack.Project() as project:
+        node = CompressedCustomField()
+
+    project.repro()
+
+    assert (node.nwd / "text.txt.gz").exists()
+    assert zntrack.from_rev(node.name).text == "Lorem Ipsum"
+
+
+def test_compressed_field_state(proj_path):
+    with zntrack.Project() as project:
+        node = CompressedFailingField()
+
+    project.repro()
+
+    node = zntrack.from_rev(node.name)
+    fs = node.state.fs
+    with pytest.raises(OSError) as err:
+        _ = node.text
+    assert err.value.args[0] == [fs]
+    # the state of the node is not modified while loading
+    assert node.__dict__["state"]["fs"] is fs
+    assert node.state.fs is fs
+
+
+@pytest.mark.parametrize(
+    ("compression", "package"), [("zstd", "zstandard"), ("lz4", "lz4.frame")]
+)
+def test_compressed_outs_codecs(proj_path, compression, package):
+    pytest.importorskip(package)
+
+    class CodecOuts(zntrack.Node):
+        outs: dict = zntrack.outs(compression=compression)
+
+        def run(self) -> None:
+            self.outs = {"a": [1, 2, 3]}
+
+    node = CodecOuts.from_rev(running=True)
+    node.run()
+    node.save()
+
+    assert (
+        (node.nwd / "outs.json")
+        .with_suffix({"zstd": ".json.zst", "lz4": ".json.lz4"}[compression])
+        .exists()
+    )
+    assert CodecOuts.from_rev().outs == {"a": [1, 2, 3]}
+
+
+def test_invalid_compression():
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        zntrack.outs(compression="bz2")
+    with pytest.raises(ValueError, match="Metrics can not be compressed"):
+        zntrack.field(
+            field_type=FieldTypes.METRICS,
+            suffix=".json",
+            compression="gzip",
+        )
@@ -0,0 +1,78 @@
+import yaml
+
+import zntrack
+import zntrack.examples
+from zntrack.utils.dedup import get_fingerprint
+
+
+def build(deduplicate: bool):
+    with zntrack.Project(deduplicate=deduplicate) as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.ParamsToOuts(params=1)
+        c = zntrack.examples.ParamsToOuts(params=2)
+        d = zntrack.examples.AddNodeNumbers(numbers=[a, b, c])
+        e = zntrack.examples.AddOne(number=a.outs)
+        f = zntrack.examples.AddOne(number=b.outs)
+    return project, [a, b, c, d, e, f]
+
+
+def test_deduplicate(proj_path, caplog):
+    project, (a, b, c, d, e, f) = build(deduplicate=True)
+    assert project.aliases == {"ParamsToOuts_1": "ParamsToOuts", "AddOne_1": "AddOne"}
+    assert b.name == a.name
+    assert len(project.nodes) == 4
+
+    with caplog.at_level("INFO", logger="zntrack.project"):
+        project.build()
+    assert "Removed 2 duplicate node(s): ParamsToOuts_1 -> ParamsToOuts" in caplog.text
+    stages = yaml.safe_load((proj_path / "dvc.yaml").read_text())["stages"]
+    assert set(stages) == {a.name, c.name, d.name, e.name}
+
+    project.run()
+    assert d.sum == 4
+    assert e.outs == 2
+    # the removed nodes load the outputs of the remaining ones
+    assert b.outs == 1
+    assert f.outs == 2
+
+
+def test_deduplicate_disabled(proj_path):
+    project, nodes = build(deduplicate=False)
+    assert project.aliases == {}
+    assert len(project.nodes) == 6
+    assert len({node.name for node in nodes}) == 6
+
+
+def test_fingerprint_node_deps(proj_path, monkeypatch):
+    # e.g. nodes loaded via 'zntrack.from_rev' are not connected through the graph
+    a = zntrack.examples.ParamsToOuts(params=1)
+    b = zntrack.examples.ParamsToOuts(params=1)
+    c = zntrack.examples.AddNodeNumbers(numbers=[a])
+    d = zntrack.examples.AddNodeNumbers(numbers=[a])
+    e = zntrack.examples.AddNodeNumbers(numbers=[b])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the outputs of the node were loaded")
+
+    monkeypatch.setattr(zntrack.examples.ParamsToOuts, "outs", property(fail))
+    # nodes are fingerprinted by identity, without loading their outputs
+    assert get_fingerprint(c) == get_fingerprint(d) != get_fingerprint(e)
+
+
+def test_deduplicate_run_targets(proj_path):
+    project, (a, b, c, d, e, f) = build(deduplicate=True)
+
+    # the removed nodes are resolved to the nodes they alias
+    assert project._get_targets([b, f, a]) == [a, e]
+
+    project.run(nodes=[f])
+    assert e.outs == 2
+    assert not (proj_path / c.nwd).exists()
+
+
+def test_deduplicate_repro_targets(proj_path):
+    project, (a, b, c, d, e, f) = build(deduplicate=True)
+
+    project.repro(nodes=[b])
+    lock = yaml.safe_load((proj_path / "dvc.lock").read_text())
+    assert set(lock["stages"]) == {a.name}
@@ -0,0 +1,212 @@
+import json
+import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import zntrack.examples
+from zntrack.config import ZNTRACK_JSON_RESOURCES_KEY
+from zntrack.deployment import ExecutorDeployment, ProcessPoolDeployment
+from zntrack.exceptions import NodeRunError
+
+
+class ProcessID(zntrack.Node):
+    value: int = zntrack.params()
+    outs: dict = zntrack.outs()
+
+    def run(self) -> None:
+        self.outs = {"value": self.value, "pid": os.getpid()}
+
+
+class Sleep(zntrack.Node):
+    value: int = zntrack.params()
+    outs: dict = zntrack.outs()
+
+    def run(self) -> None:
+        start = time.monotonic()
+        time.sleep(0.2)
+        self.outs = {
+            "value": self.value,
+            "thread": threading.get_ident(),
+            "interval": (start, time.monotonic()),
+        }
+
+
+class LargeSleep(Sleep):
+    resources = zntrack.Resources(cpus=2)
+
+
+class FailingNode(zntrack.Node):
+    outs: int = zntrack.outs()
+
+    def run(self) -> None:
+        raise ValueError("Node failed in worker")
+
+
+def test_process_pool(proj_path):
+    project = zntrack.Project(deployment=ProcessPoolDeployment(max_workers=2))
+    with project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.ParamsToOuts(params=2)
+        c = zntrack.examples.AddNodeAttributes(a=a.outs, b=b.outs)
+        d = ProcessID(value=3)
+
+    project.run()
+
+    assert c.c == 3
+    assert d.outs["value"] == 3
+    assert d.outs["pid"] != os.getpid()
+    assert d.state.run_count == 1
+    assert d.state.run_time.total_seconds() > 0
+
+    # the results have been saved by the worker
+    assert c.from_rev().c == 3
+    assert d.from_rev().outs == d.outs
+
+
+def test_process_pool_apply(proj_path):
+    project = zntrack.Project(deployment=ProcessPoolDeployment())
+    joined = zntrack.apply(zntrack.examples.ParamsToOuts, "join")
+    with project:
+        a = joined(params=["a", "b"])
+
+    project.run()
+    assert a.outs == "a-b"
+
+
+def test_process_pool_failure(proj_path):
+    project = zntrack.Project(deployment=ProcessPoolDeployment())
+    with project:
+        a = FailingNode()
+        b = zntrack.examples.AddNodeAttributes(a=a.outs, b=1)
+        c = ProcessID(value=1)
+
+    with pytest.raises(NodeRunError, match=f"{a.name}.*{b.name}") as err:
+        project.run()
+    assert "Node failed in worker" in str(err.value.__cause__)
+    # independent nodes still run
+    assert c.outs["value"] == 1
+
+
+def test_process_pool_subset(proj_path):
+    project = zntrack.Project(deployment=ProcessPoolDeployment())
+    with project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddNodeAttributes(a=a.outs, b=2)
+        c = ProcessID(value=1)
+
+    project.run(nodes=[b])
+    assert b.c == 3
+    assert c.state.run_count == 0
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 1])
+def test_thread_pool(proj_path, max_concurrency):
+    executor = ThreadPoolExecutor(max_workers=4)
+    project = zntrack.Project(
+        deployment=ExecutorDeployment(executor, max_concurrency=max_concurrency)
+    )
+    with project:
+        nodes = [Sleep(value=idx) for idx in range(4)]
+        total = zntrack.examples.SumNodeAttributesToMetrics(
+            inputs=[node.outs["value"] for node in nodes], shift=0
+        )
+
+    project.run()
+    executor.shutdown()
+
+    assert total.metrics == {"value": 6}
+    assert all(node.outs["thread"] != threading.get_ident() for node in nodes)
+    assert nodes[0].from_rev().outs["value"] == 0
+
+    intervals = sorted(node.outs["interval"] for node in nodes)
+    overlapping = any(b[0] < a[1] for a, b in zip(intervals, intervals[1:]))
+    assert overlapping == (max_concurrency is None)
+
+
+def test_executor_failure(proj_path):
+    with ThreadPoolExecutor() as executor:
+        project = zntrack.Project(deployment=ExecutorDeployment(executor))
+        with project:
+            a = FailingNode()
+            b = zntrack.examples.AddNodeAttributes(a=a.outs, b=1)
+
+        with pytest.raises(NodeRunError, match=f"{a.name}.*{b.name}"):
+            project.run()
+    assert a.state.run_count == 1
+
+
+def test_resource_budget(proj_path):
+    executor = ThreadPoolExecutor(max_workers=4)
+    budget = zntrack.Resources(cpus=3)
+    project = zntrack.Project(deployment=ExecutorDeployment(executor, budget=budget))
+    with project:
+        large = [LargeSleep(value=idx) for idx in range(2)]
+        small = Sleep(value=2)
+
+    project.run()
+    executor.shutdown()
+
+    # the large nodes can not run at the same time, but each with the small one
+    a, b = sorted(node.outs["interval"] for node in large)
+    assert a[1] <= b[0]
+    assert any(
+        x[0] < small.outs["interval"][1] and small.outs["interval"][0] < x[1]
+        for x in (a, b)
+    )
+
+    project.build()
+    config = json.loads(pathlib.Path("zntrack.json").read_text())
+    assert config[large[0].name][ZNTRACK_JSON_RESOURCES_KEY] == {
+        "cpus": 2,
+        "memory": None,
+        "gpus": 0,
+        "exclusive": False,
+    }
+    assert ZNTRACK_JSON_RESOURCES_KEY not in config[small.name]
+
+
+class Wait(zntrack.Node):
+    seconds: float = zntrack.params()
+    outs: dict = zntrack.outs()
+
+    def run(self) -> None:
+        start = time.monotonic()
+        time.sleep(self.seconds)
+        self.outs = {"seconds": self.seconds, "interval": (start, time.monotonic())}
+
+
+class LargeWait(Wait):
+    resources = zntrack.Resources(cpus=2)
+
+
+@pytest.mark.parametrize("max_backfill_wait", [0, None])
+def test_resource_budget_starvation(proj_path, max_backfill_wait):
+    executor = ThreadPoolExecutor(max_workers=4)
+    deployment = ExecutorDeployment(
+        executor,
+        budget=zntrack.Resources(cpus=2),
+        max_backfill_wait=max_backfill_wait,
+    )
+    project = zntrack.Project(deployment=deployment)
+    with project:
+        first = Wait(seconds=0.1)
+        large = LargeWait(seconds=first.outs["seconds"])
+        chains = []
+        for _ in range(2):
+            node = Wait(seconds=0.4)
+            chains.append(node)
+            for _ in range(2):
+                node = Wait(seconds=node.outs["seconds"])
+                chains.append(node)
+
+    project.run()
+    executor.shutdown()
+
+    ready, started = first.outs["interval"][1], large.outs["interval"][0]
+    overtaken = [x for x in chains if ready < x.outs["interval"][0] < started]
+    # the small nodes keep overtaking the large one, unless it waited too long
+    assert bool(overtaken) == (max_backfill_wait is None)
@@ -0,0 +1,134 @@
+import json
+
+import pytest
+import yaml
+
+import zntrack
+import zntrack.examples
+from zntrack.config import ZNTRACK_JSON_STAGE_KEY
+
+
+def test_build_fuse(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+        c = zntrack.examples.AddOne(number=b.outs)
+        d = zntrack.examples.ParamsToOuts(params=5)
+
+    project.build(fuse=True)
+    stages = yaml.safe_load((proj_path / "dvc.yaml").read_text())["stages"]
+    assert set(stages) == {c.name, d.name}
+    assert stages[c.name]["cmd"] == (
+        "zntrack run-fused zntrack.examples.nodes.ParamsToOuts:ParamsToOuts"
+        " zntrack.examples.nodes.AddOne:AddOne zntrack.examples.nodes.AddOne:AddOne_1"
+    )
+    assert "deps" not in stages[c.name]
+    zntrack_json = json.loads((proj_path / "zntrack.json").read_text())
+    assert zntrack_json[a.name][ZNTRACK_JSON_STAGE_KEY] == c.name
+    assert zntrack_json[b.name][ZNTRACK_JSON_STAGE_KEY] == c.name
+    assert ZNTRACK_JSON_STAGE_KEY not in zntrack_json[c.name]
+
+    project.repro(build=False)
+    assert zntrack.examples.ParamsToOuts.from_rev(a.name).outs == 1
+    assert zntrack.examples.AddOne.from_rev(b.name).outs == 2
+    assert zntrack.from_rev(b.name).outs == 2
+    assert zntrack.from_rev(c.name).outs == 3
+    assert zntrack.from_rev(d.name).outs == 5
+    assert zntrack.from_rev(c.name).state.lockfile is not None
+
+
+def test_fused(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        with project.fused():
+            b = zntrack.examples.AddOne(number=a.outs)
+            c = zntrack.examples.AddOne(number=b.outs)
+        d = zntrack.examples.AddOne(number=c.outs)
+
+    project.repro()
+    stages = yaml.safe_load((proj_path / "dvc.yaml").read_text())["stages"]
+    assert set(stages) == {a.name, c.name, d.name}
+    assert stages[c.name]["deps"] == [(a.nwd / "outs.json").as_posix()]
+    assert zntrack.from_rev(d.name).outs == 4
+    assert zntrack.from_rev(b.name).outs == 2
+
+
+def test_fused_cycle(proj_path):
+    with zntrack.Project() as project:
+        with project.fused():
+            a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+        with project.fused():
+            c = zntrack.examples.AddNodeAttributes(a=a.outs, b=b.outs)
+
+    project.build()  # nodes created in different contexts are not fused
+
+    project.fused_nodes = [[a.uuid, c.uuid]]
+    with pytest.raises(ValueError, match="Unable to fuse the nodes"):
+        project.build()
+
+
+def test_fused_node_status(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+    project.build(fuse=True)
+
+    # 'a' has no stage of its own, but is run by the stage of 'b'
+    assert a.state.stage_name == b.name
+    assert b.state.stage_name == b.name
+    assert a.state.changed
+    assert zntrack.changed([a, b]) == {a.name: True, b.name: True}
+
+    project.repro(build=False)
+    assert not a.state.changed
+    assert a.state.get_stage().name == b.name
+    assert a.state.get_stage_hash() == b.state.get_stage_hash()
+
+    a.params = 2
+    project.build(fuse=True)
+    assert a.state.changed
+    assert b.state.changed
+
+
+def test_fused_repro_nodes(proj_path):
+    with zntrack.Project() as project:
+        with project.fused():
+            a = zntrack.examples.ParamsToOuts(params=1)
+            b = zntrack.examples.AddOne(number=a.outs)
+        c = zntrack.examples.ParamsToOuts(params=2)
+
+    # 'a' is reproduced by the fused stage of 'b'
+    project.repro(nodes=[a, b])
+    lock = yaml.safe_load((proj_path / "dvc.lock").read_text())
+    assert set(lock["stages"]) == {b.name}
+    assert zntrack.from_rev(a.name).outs == 1
+    assert c.name not in lock["stages"]
+
+
+class StageField(zntrack.Node):
+    """A user field named like the fused stage marker used to be."""
+
+    stage: int = zntrack.deps()
+    outs: int = zntrack.outs()
+
+    def run(self) -> None:
+        self.outs = self.stage + 1
+
+
+def test_fused_stage_field(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = StageField(stage=a.outs)
+    project.repro()
+
+    node = zntrack.from_rev(b.name)
+    assert node.state.stage_name == b.name
+    assert not node.state.changed
+    assert node.state.get_stage().name == b.name
+
+    project.build(fuse=True)
+    zntrack_json = json.loads((proj_path / "zntrack.json").read_text())
+    assert zntrack_json[b.name]["stage"]["_type"] == "znflow.Connection"
+    assert zntrack_json[a.name][ZNTRACK_JSON_STAGE_KEY] == b.name
+    assert zntrack.from_rev(a.name).state.stage_name == b.name
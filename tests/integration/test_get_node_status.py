@@ -32,9 +32,8 @@ def test_get_node_status(proj_path):
 
     assert get_node_status(a.name, remote=None, rev=None) is True
     assert get_node_status(b.name, remote=None, rev=None) is False
-    assert (
-        get_node_status(c.name, remote=None, rev=None) is False
-    )  # DVC the deps have not been updated, so this still assumes it is True
+    # the deps of c have not been updated, but its upstream node a changed
+    assert get_node_status(c.name, remote=None, rev=None) is True
 
     subprocess.check_call(["dvc", "repro", a.name])
     assert get_node_status(a.name, remote=None, rev=None) is False
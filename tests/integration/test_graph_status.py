@@ -0,0 +1,127 @@
+import json
+import os
+import pathlib
+import subprocess
+
+from dvc.dependency.base import Dependency
+from typer.testing import CliRunner
+
+import zntrack
+import zntrack.examples
+from zntrack.cli import app
+from zntrack.utils.state import StageStatus, get_graph_status
+
+
+def test_get_graph_status(proj_path, monkeypatch):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs, name="B")
+        c = zntrack.examples.AddOne(number=b.outs, name="C")
+        d = zntrack.examples.ParamsToOuts(params=2, name="D")
+    project.build()
+    subprocess.check_call(["dvc", "repro"])
+
+    status = get_graph_status()
+    assert status == {x.name: StageStatus(False) for x in [a, b, c, d]}
+
+    a.params = 10
+    project.build()
+
+    hashed = []
+    save = Dependency.save
+
+    def counting_save(self):
+        hashed.append(self.def_path)
+        return save(self)
+
+    monkeypatch.setattr(Dependency, "save", counting_save)
+    status = get_graph_status(jobs=2)
+    assert status == {
+        a.name: StageStatus(True, reasons=("params",)),
+        b.name: StageStatus(True, upstream=(a.name,), reasons=("upstream",)),
+        c.name: StageStatus(True, upstream=(b.name,), reasons=("upstream",)),
+        d.name: StageStatus(False),
+    }
+    # the stages with a changed upstream stage are not hashed
+    assert not any(path.startswith("nodes/") for path in hashed)
+    # upstream stages are checked first
+    assert [*status].index(a.name) < [*status].index(b.name) < [*status].index(c.name)
+
+    assert get_graph_status(targets=[b.name]) == {
+        a.name: StageStatus(True, reasons=("params",)),
+        b.name: StageStatus(True, upstream=(a.name,), reasons=("upstream",)),
+    }
+
+
+def test_status_cli(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+    project.build()
+    subprocess.check_call(["dvc", "repro", a.name])
+
+    result = CliRunner().invoke(app, ["status"])
+    assert result.exit_code == 0
+    assert result.stdout.splitlines() == [
+        "unchanged  ParamsToOuts",
+        "changed    AddOne (never_run)",
+    ]
+
+    a.params = 2
+    project.build()
+    result = CliRunner().invoke(app, ["status", b.name])
+    assert result.stdout.splitlines() == [
+        "changed    ParamsToOuts (params)",
+        "changed    AddOne (upstream: ParamsToOuts)",
+    ]
+
+
+def test_status_json(proj_path):
+    pathlib.Path("data.txt").write_text("Hello World")
+    with zntrack.Project() as project:
+        a = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"))
+        b = zntrack.examples.ParamsToOuts(params=1)
+    project.build()
+    subprocess.check_call(["dvc", "repro"])
+
+    pathlib.Path("data.txt").write_text("Lorem Ipsum")
+    result = CliRunner().invoke(app, ["status", "--json"])
+    assert result.exit_code == 0
+    assert sorted(json.loads(result.stdout), key=lambda x: x["name"]) == [
+        {"name": b.name, "status": "unchanged", "reasons": [], "upstream": []},
+        {"name": a.name, "status": "changed", "reasons": ["deps"], "upstream": []},
+    ]
+
+
+def test_status_hash_cache(proj_path, monkeypatch):
+    data = pathlib.Path("data.txt")
+    data.write_text("Hello World")
+    with zntrack.Project() as project:
+        zntrack.examples.ReadFile(path=data)
+    project.build()
+    subprocess.check_call(["dvc", "repro"])
+    # files modified within the last seconds are not cached
+    os.utime(data, (1e9, 1e9))
+
+    hashed = []
+    save = Dependency.save
+
+    def counting_save(self):
+        hashed.append(self.def_path)
+        return save(self)
+
+    monkeypatch.setattr(Dependency, "save", counting_save)
+
+    def status() -> list[str]:
+        return CliRunner().invoke(app, ["status"]).stdout.splitlines()
+
+    assert status() == ["unchanged  ReadFile"]
+    assert hashed == ["data.txt"]
+    assert pathlib.Path(".dvc", "tmp", "zntrack-hashes.json").exists()
+
+    assert status() == ["unchanged  ReadFile"]
+    assert hashed == ["data.txt"]  # served from the cache
+
+    data.write_text("Lorem Ipsum")
+    assert status() == ["changed    ReadFile (deps)"]
+    assert hashed == ["data.txt", "data.txt"]
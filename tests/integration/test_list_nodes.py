@@ -0,0 +1,56 @@
+import pathlib
+import subprocess
+
+import dvc.api
+import pytest
+from dvc.dependency.base import Dependency
+
+import zntrack
+import zntrack.examples
+from zntrack.utils.list_nodes import list_nodes
+from zntrack.utils.state import StatusCache, get_node_status, get_stage_status
+
+
+@pytest.fixture
+def project(proj_path):
+    pathlib.Path("data.txt").write_text("Hello World")
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"), name="A")
+        b = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"), name="B")
+        c = zntrack.examples.ParamsToOuts(params=1)
+        d = zntrack.examples.AddOne(number=c.outs)
+    proj.build()
+    subprocess.check_call(["dvc", "repro", a.name, c.name])
+    return [a, b, c, d]
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_list_nodes_status(project, jobs):
+    df = list_nodes(verbose=0, jobs=jobs)
+    status = dict(zip(df["name"], df["changed"]))
+
+    assert status == {"A": False, "B": True, "ParamsToOuts": False, "AddOne": True}
+    for node in project:
+        assert status[node.name] is get_node_status(node.name, remote=None, rev=None)
+
+
+def test_status_cache(project, monkeypatch):
+    paths = []
+    save = Dependency.save
+
+    def counting_save(self):
+        paths.append(self.def_path)
+        return save(self)
+
+    monkeypatch.setattr(Dependency, "save", counting_save)
+    fs = dvc.api.DVCFileSystem()
+    cache = StatusCache(fs)
+    stages = {x.name: x for x in fs.repo.stage.collect()}
+
+    assert get_stage_status(stages["A"], fs, cache) is False
+    assert get_stage_status(stages["B"], fs, cache) is True
+    # the shared dependency is hashed once
+    assert paths.count("data.txt") == 1
+
+    pathlib.Path("data.txt").write_text("Lorem Ipsum")
+    assert get_stage_status(stages["A"], fs, StatusCache(fs)) is True
@@ -1,11 +1,18 @@
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import MagicMock
 
 import pytest
+from dvc.dependency.base import DependencyDoesNotExistError
 
 import zntrack
+from zntrack.deployment import ExecutorDeployment
+from zntrack.utils import lockfile
 from zntrack.utils.lockfile import get_stage_lock
+from zntrack.utils.usage import UsageTracker, reset_peak_rss
 
 
 class ReadFileContent(zntrack.Node):
@@ -66,3 +73,157 @@ def test_node_meta_lock_mp(proj_path, lockfile_01):
     assert lockfile["cmd"] == lockfile_01["cmd"]
     assert lockfile["deps"] == lockfile_01["deps"]
     assert lockfile["params"] == lockfile_01["params"]
+
+
+@pytest.mark.parametrize("mode", ["auto", "inline", "thread", "process"])
+def test_node_meta_lock_mode(proj_path, lockfile_01, monkeypatch, mode):
+    monkeypatch.setenv("ZNTRACK_LOCKFILE_MODE", mode)
+    project = zntrack.Project()
+
+    file = Path("data.txt")
+    file.write_text("Lorem Ipsum")
+
+    with project:
+        _ = ReadFileContent(deps_file=file, params="test")
+
+    project.repro()
+    node = ReadFileContent.from_rev()
+    assert node.state.lockfile == lockfile_01
+    assert node.state.lockfile_time.total_seconds() > 0
+
+    node_meta = json.loads((node.nwd / "node-meta.json").read_text())
+    assert node_meta["lockfile_time"] == node.state.lockfile_time.total_seconds()
+
+
+def test_start_stage_lock_auto(proj_path, lockfile_01, monkeypatch):
+    project = zntrack.Project()
+
+    file = Path("data.txt")
+    file.write_text("Lorem Ipsum")
+
+    with project:
+        node = ReadFileContent(deps_file=file, params="test")
+
+    project.build()
+
+    assert lockfile._has_small_deps(node.name)
+    monkeypatch.setattr(zntrack.config, "LOCKFILE_INLINE_MAX_SIZE", 10)
+    assert not lockfile._has_small_deps(node.name)
+
+    lock, _ = lockfile.start_stage_lock(node.name, "auto")()
+    assert lock["deps"] == lockfile_01["deps"]
+
+    with pytest.raises(ValueError, match="Invalid lockfile mode"):
+        lockfile.start_stage_lock(node.name, "fork")
+
+
+def test_start_stage_lock_process_error(proj_path):
+    Path("dvc.yaml").write_text("stages:\n  Node:\n    cmd: echo\n    deps:\n    - a\n")
+    # the error of the child process is raised instead of blocking forever
+    join = lockfile.start_stage_lock("Node", "process")
+    with pytest.raises(DependencyDoesNotExistError):
+        join()
+
+
+class WriteData(zntrack.Node):
+    size: int = zntrack.params()
+    data: str = zntrack.outs()
+
+    def run(self):
+        self.data = "x" * self.size
+
+
+@pytest.mark.parametrize("repro", [True, False])
+def test_node_meta_usage(proj_path, repro):
+    with zntrack.Project() as project:
+        WriteData(size=1024**2)
+
+    if repro:
+        project.repro()
+    else:
+        project.run()
+    node = WriteData.from_rev()
+    usage = node.state.usage
+    assert set(usage) >= {"cpu_user", "cpu_system", "peak_rss", "run", "save"}
+    assert usage["peak_rss"] > 0
+    assert usage["run"] >= 0
+    if "write_bytes" in usage:
+        # the outputs are written to disk while saving
+        assert usage["write_bytes"] >= 1024**2
+    content = json.loads((node.nwd / "node-meta.json").read_text())
+    assert content["usage"] == usage
+
+
+class AllocateMemory(zntrack.Node):
+    size: int = zntrack.params()
+    outs: int = zntrack.outs()
+
+    def run(self):
+        self.outs = len(bytearray(self.size))
+
+
+@pytest.mark.skipif(not reset_peak_rss(), reason="requires /proc/self/clear_refs")
+def test_node_meta_usage_per_node(proj_path):
+    with zntrack.Project() as project:
+        large = AllocateMemory(size=256 * 1024**2, name="large")
+        small = AllocateMemory(size=1024, name="small")
+    project.run()
+
+    large_peak = large.state.usage["peak_rss"]
+    # the peak of a node is not the peak of all nodes run before in the process
+    assert small.state.usage["peak_rss"] < large_peak - 128 * 1024**2
+
+
+# both nodes wait for each other to run at the same time
+_BARRIER = threading.Barrier(2, timeout=30)
+
+
+class ConcurrentNode(zntrack.Node):
+    value: int = zntrack.params()
+    outs: int = zntrack.outs()
+
+    def run(self):
+        _BARRIER.wait()
+        self.outs = self.value
+
+
+def test_node_meta_usage_concurrent(proj_path):
+    _BARRIER.reset()
+    with zntrack.Project(
+        deployment=ExecutorDeployment(ThreadPoolExecutor(max_workers=2))
+    ) as project:
+        a = ConcurrentNode(value=1)
+        b = ConcurrentNode(value=2)
+    project.run()
+
+    # the peak memory of the process can not be attributed to one of the nodes
+    assert a.state.usage["peak_rss"] is None
+    assert b.state.usage["peak_rss"] is None
+    assert a.state.usage["run"] >= 0
+
+
+def test_usage_tracker_stop():
+    tracker = UsageTracker()
+    tracker.stop()
+    start = time.process_time()
+    while time.process_time() - start < 0.2:
+        pass
+    with tracker.phase("save"):
+        pass
+    usage = tracker.result()
+    # only the phases are recorded after stopping
+    assert usage.get("cpu_user", 0) < 0.15
+    assert "save" in usage
+
+
+def test_usage_tracker_overlap():
+    first = UsageTracker()
+    second = UsageTracker()
+    first.stop()
+    third = UsageTracker()
+    assert first.result()["peak_rss"] is None
+    assert second.result()["peak_rss"] is None
+    assert third.result()["peak_rss"] is None
+    # measured alone, once the others stopped
+    alone = UsageTracker().result()
+    assert (alone.get("peak_rss") or alone["peak_rss_process"]) > 0
@@ -0,0 +1,87 @@
+import pathlib
+import subprocess
+
+import pytest
+import yaml
+from typer.testing import CliRunner
+
+import zntrack
+import zntrack.examples
+from zntrack.cli import app
+from zntrack.utils.profiling import PROFILE_DIR
+
+
+@pytest.fixture()
+def runner() -> CliRunner:
+    return CliRunner()
+
+
+@pytest.mark.parametrize(
+    ("mode", "files"),
+    [
+        ("cprofile", ["profile.prof"]),
+        ("sample", ["profile.folded"]),
+        ("1", ["profile.prof", "profile.folded"]),
+    ],
+)
+def test_profile(proj_path, runner, monkeypatch, mode, files):
+    monkeypatch.setenv("ZNTRACK_PROFILE", mode)
+    with zntrack.Project() as proj:
+        node = zntrack.examples.ParamsToOuts(params=15)
+    proj.build()
+
+    result = runner.invoke(app, ["run", "zntrack.examples.ParamsToOuts"])
+    assert result.exit_code == 0
+    assert node.outs == 15
+    assert not [*node.nwd.glob("profile.*")]
+    profile_dir = node.nwd / PROFILE_DIR
+    assert sorted(x.name for x in profile_dir.glob("profile.*")) == sorted(files)
+    # the profiles are ignored by git
+    status = subprocess.check_output(
+        ["git", "status", "--porcelain", "--untracked-files=all"], text=True
+    )
+    assert PROFILE_DIR not in status
+
+    dvc_yaml = yaml.safe_load(pathlib.Path("dvc.yaml").read_text())
+    assert "profile" not in str(dvc_yaml)
+
+    result = runner.invoke(app, ["profile", "ParamsToOuts"])
+    assert result.exit_code == 0
+    if "profile.prof" in files:
+        assert "function calls" in result.stdout
+    if "profile.folded" in files:
+        assert "samples" in result.stdout
+
+
+def test_profile_env_file(proj_path, runner, monkeypatch):
+    monkeypatch.setenv("ZNTRACK_PROFILE", "0")
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params=1, name="A")
+        b = zntrack.examples.ParamsToOuts(params=2, name="B")
+    proj.build()
+    pathlib.Path("env.yaml").write_text(
+        yaml.safe_dump({"stages": {"B": {"ZNTRACK_PROFILE": "cprofile"}}})
+    )
+
+    for name in ["A", "B"]:
+        result = runner.invoke(
+            app, ["run", "zntrack.examples.ParamsToOuts", "--name", name]
+        )
+        assert result.exit_code == 0
+
+    assert not (a.nwd / PROFILE_DIR / "profile.prof").exists()
+    assert (b.nwd / PROFILE_DIR / "profile.prof").exists()
+
+    result = runner.invoke(app, ["profile", "A"])
+    assert result.exit_code == 1
+    assert "No profile found" in result.stderr
+
+
+def test_profile_invalid(proj_path, runner, monkeypatch):
+    monkeypatch.setenv("ZNTRACK_PROFILE", "perf")
+    with zntrack.Project() as proj:
+        zntrack.examples.ParamsToOuts(params=15)
+    proj.build()
+
+    result = runner.invoke(app, ["run", "zntrack.examples.ParamsToOuts"])
+    assert isinstance(result.exception, ValueError)
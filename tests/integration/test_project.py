@@ -3,6 +3,7 @@ import typing as t
 
 import git
 import pytest
+import yaml
 
 import zntrack.examples
 
@@ -592,3 +593,47 @@ def test_group_names(proj_path):
     assert grp1.names == ("Group1",)
     assert grp2.names == ("Group2",)
     assert grp3.names == ("NamedGrp",)
+
+
+def test_run_nodes(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.SumNodeAttributesToMetrics(inputs=[a.outs], shift=0)
+        c = zntrack.examples.ParamsToOuts(params=2)
+
+    assert project.get_upstream_nodes([b]) == [a, b]
+
+    project.run(nodes=[b])
+    assert b.metrics == {"value": 1}
+    assert "outs" in a.__dict__
+    assert not c.nwd.exists()
+
+    with pytest.raises(TypeError):
+        project.run(nodes=c)
+    with pytest.raises(ValueError):
+        project.run(nodes=[42])
+
+
+def test_run_nodes_group(proj_path):
+    with zntrack.Project() as project:
+        with project.group("A") as group:
+            a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.ParamsToOuts(params=2)
+
+    project.run(nodes=[group])
+    assert a.outs == 1
+    assert not b.nwd.exists()
+
+
+def test_repro_nodes(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.SumNodeAttributesToMetrics(inputs=[a.outs], shift=0)
+        c = zntrack.examples.ParamsToOuts(params=2)
+
+    project.repro(nodes=[b])
+    assert b.from_rev().metrics == {"value": 1}
+    assert a.from_rev().outs == 1
+    lock = yaml.safe_load(pathlib.Path("dvc.lock").read_text())
+    assert set(lock["stages"]) == {a.name, b.name}
+    assert c.name not in lock["stages"]
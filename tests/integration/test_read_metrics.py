@@ -0,0 +1,87 @@
+import pathlib
+import subprocess
+import sys
+
+import git
+import pytest
+import yaml
+
+import zntrack
+import zntrack.examples
+
+
+class MetricsNode(zntrack.Node):
+    value: int = zntrack.params()
+    config: pathlib.Path = zntrack.params_path()
+    metrics: dict = zntrack.metrics()
+    report: pathlib.Path = zntrack.metrics_path(zntrack.nwd / "report.yaml")
+
+    def run(self):
+        self.metrics = {"value": self.value}
+        config = yaml.safe_load(self.config.read_text())
+        self.report.parent.mkdir(parents=True, exist_ok=True)
+        self.report.write_text(yaml.safe_dump({"lr": config["lr"]}))
+
+
+def test_read_metrics(proj_path):
+    pathlib.Path("config.yaml").write_text(yaml.safe_dump({"lr": 0.1}))
+    with zntrack.Project() as project:
+        node = MetricsNode(value=1, config=pathlib.Path("config.yaml"))
+        with project.group("grp"):
+            grouped = MetricsNode(value=3, config=pathlib.Path("config.yaml"))
+    project.repro()
+    repo = git.Repo()
+    repo.git.add(all=True)
+    repo.index.commit("first run")
+
+    node.value = 2
+    pathlib.Path("config.yaml").write_text(yaml.safe_dump({"lr": 0.2}))
+    project.repro()
+
+    assert zntrack.read_metrics(node.name) == {
+        "metrics": {"value": 2},
+        "report": {"lr": 0.2},
+    }
+    assert zntrack.read_metrics(node.name, rev="HEAD") == {
+        "metrics": {"value": 1},
+        "report": {"lr": 0.1},
+    }
+    assert zntrack.read_params(node.name, rev="HEAD") == {
+        "value": 1,
+        "config": {"lr": 0.1},
+    }
+    assert zntrack.read_params(grouped.name) == {"value": 3, "config": {"lr": 0.2}}
+    metrics = MetricsNode.from_rev(grouped.name).metrics
+    assert zntrack.read_metrics(grouped.name)["metrics"] == metrics == {"value": 3}
+
+    with pytest.raises(ValueError, match="not found"):
+        zntrack.read_metrics("MissingNode")
+
+
+def test_read_metrics_without_import(proj_path):
+    with zntrack.Project() as project:
+        node = zntrack.examples.ParamsToMetrics(params={"loss": 0.5})
+    project.repro()
+
+    code = (
+        "import sys, zntrack;"
+        f"print(zntrack.read_metrics({node.name!r})['metrics']);"
+        "assert 'zntrack.examples' not in sys.modules"
+    )
+    output = subprocess.check_output([sys.executable, "-c", code], text=True)
+    assert output.strip() == "{'loss': 0.5}"
+
+
+def test_read_metrics_fused(proj_path):
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToMetrics(params={"loss": 0.5})
+        b = zntrack.examples.DepsToMetrics(deps=a.metrics)
+    project.build(fuse=True)
+    project.repro(build=False)
+    stages = yaml.safe_load(pathlib.Path("dvc.yaml").read_text())["stages"]
+    assert set(stages) == {b.name}
+
+    assert zntrack.read_metrics(a.name) == {"metrics": {"loss": 0.5}}
+    assert zntrack.read_metrics(b.name) == {"metrics": {"loss": 0.5}}
+    assert zntrack.read_params(a.name) == {"params": {"loss": 0.5}}
+    assert zntrack.read_params(b.name) == {}
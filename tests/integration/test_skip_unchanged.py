@@ -0,0 +1,174 @@
+import json
+import os
+import pathlib
+
+import pytest
+import znflow
+
+import zntrack
+import zntrack.examples
+from zntrack.config import HASH_CACHE_PATH
+from zntrack.deployment import ExecutorDeployment
+from zntrack.utils import hashing
+
+
+class CountRuns(zntrack.Node):
+    """Floor division, so different params can give the same outputs."""
+
+    params: int = zntrack.params()
+    outs: int = zntrack.outs()
+
+    def run(self) -> None:
+        self.outs = self.params // 10
+
+
+def build(params: int, deployment=None):
+    with zntrack.Project(deployment=deployment) as project:
+        a = CountRuns(params=params)
+        b = zntrack.examples.AddNodeNumbers(numbers=[a])
+    return project, a, b
+
+
+def node_meta(node) -> dict:
+    return json.loads((node.nwd / "node-meta.json").read_text())
+
+
+@pytest.mark.parametrize("executor", [False, True])
+def test_skip_unchanged(proj_path, executor):
+    def deployment():
+        if executor:
+            from concurrent.futures import ThreadPoolExecutor
+
+            return ExecutorDeployment(ThreadPoolExecutor())
+        return None
+
+    project, a, b = build(10, deployment())
+    project.run()
+    assert b.sum == 1
+    first = node_meta(a)
+    assert first["input_hash"] is not None
+    assert first["output_hash"] is not None
+
+    # nothing changed, the outputs are loaded lazily
+    project, a, b = build(10, deployment())
+    project.run()
+    assert "outs" not in a.__dict__
+    assert a.outs == 1
+    assert b.sum == 1
+    assert node_meta(a) == first
+    assert a.state.input_hash == first["input_hash"]
+
+    # changed params
+    project, a, b = build(25, deployment())
+    project.run()
+    assert "outs" in a.__dict__
+    assert b.sum == 2
+    assert node_meta(a)["input_hash"] != first["input_hash"]
+
+    # force
+    project, a, b = build(25, deployment())
+    project.run(force=True)
+    assert "outs" in a.__dict__
+    assert "sum" in b.__dict__
+
+
+def test_skip_unchanged_missing_outputs(proj_path):
+    project, a, _ = build(10)
+    project.run()
+    (a.nwd / "outs.json").unlink()
+
+    project, a, _ = build(10)
+    project.run()
+    assert "outs" in a.__dict__
+    assert (a.nwd / "outs.json").exists()
+
+
+def test_skip_unchanged_always_changed(proj_path):
+    with zntrack.Project() as project:
+        a = CountRuns(params=10, always_changed=True)
+    project.run()
+
+    with zntrack.Project() as project:
+        a = CountRuns(params=10, always_changed=True)
+    project.run()
+    assert "outs" in a.__dict__
+
+
+@pytest.mark.parametrize("executor", [False, True])
+def test_early_cutoff(proj_path, executor, caplog):
+    def deployment():
+        if executor:
+            from concurrent.futures import ThreadPoolExecutor
+
+            return ExecutorDeployment(ThreadPoolExecutor())
+        return None
+
+    project, a, b = build(10, deployment())
+    project.run()
+    first = node_meta(b)
+    output_hash = node_meta(a)["output_hash"]
+
+    # 'a' runs again, but its outputs are the same
+    project, a, b = build(15, deployment())
+    with caplog.at_level("INFO", logger="zntrack.deployment"):
+        project.run()
+    assert "outs" in a.__dict__
+    assert node_meta(a)["output_hash"] == output_hash
+    assert "sum" not in b.__dict__
+    assert b.sum == 1
+    assert node_meta(b) == first
+    assert "The outputs of 'CountRuns' did not change." in caplog.text
+    assert "the outputs of its upstream nodes did not change" in caplog.text
+
+
+def test_skip_unchanged_hashes(proj_path, monkeypatch):
+    data = pathlib.Path("data.txt")
+    data.write_text("Hello World")
+    os.utime(data, (1e9, 1e9))
+
+    def build_with_file():
+        project, a, b = build(10)
+        with project:
+            c = zntrack.examples.ReadFile(path=data)
+        return project, a, b, c
+
+    project, *_ = build_with_file()
+    project.run()
+    cache = json.loads(HASH_CACHE_PATH.read_text())
+    assert cache[data.as_posix()]["hash"]["name"] == "md5"
+
+    # the upstream outputs are represented by their output hash and the
+    # unchanged file is not read again
+    hashed = []
+    read_md5 = hashing._read_md5
+    monkeypatch.setattr(
+        hashing, "_read_md5", lambda path: hashed.append(path) or read_md5(path)
+    )
+    project, a, b, c = build_with_file()
+    project.run()
+    assert "sum" not in b.__dict__
+    assert "content" not in c.__dict__
+    assert hashed == []
+
+    data.write_text("Lorem Ipsum")
+    os.utime(data, (1e9, 1e9 + 1))
+    project, a, b, c = build_with_file()
+    project.run()
+    assert "sum" not in b.__dict__
+    assert c.content == "Lorem Ipsum"
+    assert "content" in c.__dict__
+
+
+def test_hash_inputs_serialization(proj_path):
+    inputs = {"params": {"path": pathlib.Path("data.txt")}, "files": []}
+    assert hashing.hash_inputs(inputs) == hashing.hash_inputs({**inputs})
+
+    # connections are represented by reference, e.g. 'node.outs["key"]'
+    node = zntrack.examples.ParamsToOuts(params=1)
+    connection = znflow.Connection(instance=node, attribute="outs", item="key")
+    inputs = {"params": {"value": connection}, "files": []}
+    assert hashing.hash_inputs(inputs) == hashing.hash_inputs({**inputs})
+
+    # the repr of the object would change the hash in every process
+    with pytest.raises(TypeError, match="Unable to hash the inputs"):
+        hashing.hash_inputs({"params": {"value": object()}, "files": []})
@@ -0,0 +1,74 @@
+import os
+import pathlib
+import subprocess
+
+import pytest
+
+import zntrack
+import zntrack.examples
+from zntrack.utils import stage_hash
+
+
+@pytest.fixture
+def project(proj_path):
+    pathlib.Path("data.txt").write_text("Hello World")
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"))
+    project.build()
+    subprocess.check_call(["dvc", "repro"])
+    stage_hash.clear()
+    yield a, b
+    stage_hash.clear()
+
+
+def _age(path: str, seconds: int = 60) -> None:
+    """Make the file older than ``RACY_SECONDS`` to memoize its hash."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns - seconds * 10**9))
+
+
+@pytest.mark.parametrize("include_outs", [False, True])
+def test_stage_hash_matches_dvc(project, include_outs):
+    for node in project:
+        node = node.from_rev()
+        expected = stage_hash.hash_lock(node.state.get_stage_lock(), include_outs)
+        assert node.state.get_stage_hash(include_outs) == expected
+
+
+def test_stage_hash_memoized(project, monkeypatch):
+    _, b = project
+    _age("data.txt")
+    computed = []
+    compute_lock = stage_hash.compute_lock
+
+    def counting_compute_lock(name, include_outs=False):
+        computed.append(name)
+        return compute_lock(name, include_outs)
+
+    monkeypatch.setattr(stage_hash, "compute_lock", counting_compute_lock)
+    value = b.state.get_stage_hash()
+    assert b.state.get_stage_hash() == value
+    assert computed == [b.name]
+
+    pathlib.Path("data.txt").write_text("Lorem Ipsum")
+    # not memoized while the file was just modified
+    assert b.state.get_stage_hash() != value
+    assert b.state.get_stage_hash() != value
+    assert computed == [b.name] * 3
+
+    _age("data.txt")
+    new_value = b.state.get_stage_hash()
+    assert b.state.get_stage_hash() == new_value
+    assert computed == [b.name] * 4
+
+
+def test_stage_hash_params_only(project, monkeypatch):
+    a, _ = project
+    expected = stage_hash.hash_lock(a.state.get_stage_lock())
+
+    def compute_lock(name, include_outs=False):
+        raise AssertionError("params-only stages are hashed without DVC")
+
+    monkeypatch.setattr(stage_hash, "compute_lock", compute_lock)
+    assert a.state.get_stage_hash() == expected
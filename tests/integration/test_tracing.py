@@ -0,0 +1,76 @@
+import os
+
+import zntrack
+import zntrack.examples
+from zntrack.utils.tracing import load_trace
+
+
+def test_trace_run(proj_path, monkeypatch):
+    path = proj_path / "trace.jsonl"
+    monkeypatch.setenv("ZNTRACK_TRACE", path.as_posix())
+
+    with zntrack.Project() as proj:
+        a = zntrack.examples.ParamsToOuts(params=3)
+        zntrack.examples.AddOne(number=a.outs)
+    proj.build()
+    proj.run()
+
+    spans = load_trace(path)
+    assert {
+        "Project.build",
+        "Node.run",
+        "Node.save",
+        "plugin.setup",
+        "plugin.save",
+        "NodeStatus.save_node_meta",
+        "field.get",
+    } <= {x["name"] for x in spans}
+    saves = [x for x in spans if x["name"] == "plugin.save"]
+    assert {x["attributes"]["field"] for x in saves} >= {"params", "outs"}
+    ids = {x["span_id"]: x for x in spans}
+    # the plugin save is recorded within the save of the node
+    assert all(ids[x["parent_id"]]["name"] == "Node.save" for x in saves)
+
+    path.unlink()
+    node = zntrack.examples.AddOne.from_rev()
+    assert node.outs == 4
+    assert node.outs == 4
+
+    spans = load_trace(path)
+    (from_rev,) = [x for x in spans if x["name"] == "Node.from_rev"]
+    assert from_rev["attributes"]["node"] == "AddOne"
+    outs = [
+        x
+        for x in spans
+        if x["name"] == "field.get"
+        and x["attributes"]["node"] == "AddOne"
+        and x["attributes"]["field"] == "outs"
+    ]
+    assert [x["attributes"]["cache"] for x in outs] == ["miss", "hit"]
+    assert outs[0]["attributes"]["getter"] == "_outs_getter"
+    assert outs[0]["attributes"]["bytes"] > 0
+
+
+def test_trace_repro_chrome(proj_path, monkeypatch):
+    path = proj_path / "trace.json"
+    monkeypatch.setenv("ZNTRACK_TRACE", path.as_posix())
+
+    with zntrack.Project() as proj:
+        zntrack.examples.ParamsToOuts(params=3)
+    proj.repro()
+
+    events = load_trace(path)
+    assert all(x["ph"] == "X" for x in events)
+    names = {x["name"] for x in events}
+    assert {"Project.build", "Node.run", "lockfile"} <= names
+    # 'zntrack run' is executed in a subprocess by 'dvc repro'
+    assert {x["pid"] for x in events if x["name"] == "Node.run"} != {os.getpid()}
+
+
+def test_trace_disabled(proj_path, monkeypatch):
+    monkeypatch.delenv("ZNTRACK_TRACE", raising=False)
+    with zntrack.Project() as proj:
+        zntrack.examples.ParamsToOuts(params=3)
+    proj.run()
+
+    assert not [*proj_path.glob("trace*")]
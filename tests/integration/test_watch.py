@@ -0,0 +1,65 @@
+import pathlib
+import queue
+import subprocess
+import threading
+
+import yaml
+
+import zntrack
+import zntrack.examples
+from zntrack.utils.state import StageStatus
+from zntrack.utils.watch import watch
+
+
+def _wait_for(updates: queue.Queue, status: dict, expected: dict) -> None:
+    """Apply the updates until the status is as expected."""
+    while status != expected:
+        name, value = updates.get(timeout=30)
+        status[name] = value
+
+
+def test_watch(proj_path):
+    pathlib.Path("data.txt").write_text("Hello World")
+    with zntrack.Project() as project:
+        a = zntrack.examples.ParamsToOuts(params=1)
+        b = zntrack.examples.AddOne(number=a.outs)
+        c = zntrack.examples.ReadFile(path=pathlib.Path("data.txt"))
+    project.build()
+    subprocess.check_call(["dvc", "repro"])
+
+    updates = queue.Queue()
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch,
+        args=(lambda *x: updates.put(x),),
+        kwargs={"interval": 0.1, "stop": stop, "use_events": False},
+    )
+    thread.start()
+    status = {}
+    try:
+        unchanged = {x.name: StageStatus(False) for x in [a, b, c]}
+        _wait_for(updates, status, unchanged)
+
+        pathlib.Path("data.txt").write_text("Lorem Ipsum")
+        _wait_for(
+            updates, status, {**unchanged, c.name: StageStatus(True, reasons=("deps",))}
+        )
+
+        params = yaml.safe_load(pathlib.Path("params.yaml").read_text())
+        params[a.name]["params"] = 2
+        pathlib.Path("params.yaml").write_text(yaml.safe_dump(params))
+        _wait_for(
+            updates,
+            status,
+            {
+                a.name: StageStatus(True, reasons=("params",)),
+                b.name: StageStatus(True, upstream=(a.name,), reasons=("upstream",)),
+                c.name: StageStatus(True, reasons=("deps",)),
+            },
+        )
+
+        subprocess.check_call(["dvc", "repro"])
+        _wait_for(updates, status, unchanged)
+    finally:
+        stop.set()
+        thread.join()
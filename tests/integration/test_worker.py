@@ -0,0 +1,163 @@
+import json
+import os
+import pathlib
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import zntrack
+
+
+class ParentPID(zntrack.Node):
+    value: int = zntrack.params()
+    outs: dict = zntrack.outs()
+
+    def run(self) -> None:
+        self.outs = {
+            "value": self.value,
+            "ppid": os.getppid(),
+            "env": os.environ.get("ZNTRACK_TEST_ENV"),
+        }
+
+
+class FailingNode(zntrack.Node):
+    def run(self) -> None:
+        raise ValueError("Node failed in worker")
+
+
+class ExitNode(zntrack.Node):
+    code: int | str | None = zntrack.params()
+
+    def run(self) -> None:
+        sys.exit(self.code)
+
+
+@pytest.fixture
+def worker(proj_path):
+    proc = subprocess.Popen(["zntrack", "serve"])
+    socket = pathlib.Path(".zntrack-worker.sock")
+    for _ in range(200):
+        if socket.exists():
+            break
+        time.sleep(0.1)
+    else:
+        proc.kill()
+        raise RuntimeError("worker did not start")
+    yield proc
+    proc.terminate()
+    proc.wait(timeout=10)
+    assert not socket.exists()
+
+
+def test_run_with_worker(worker):
+    with zntrack.Project() as project:
+        a = ParentPID(value=1)
+        b = ParentPID(value=2)
+
+    project.build()
+
+    subprocess.check_call(
+        ["zntrack", "run", "test_worker.ParentPID", "--name", a.name],
+        env={**os.environ, "ZNTRACK_TEST_ENV": "from-client"},
+    )
+    # the worker forks a child per run
+    assert a.outs == {"value": 1, "ppid": worker.pid, "env": "from-client"}
+    assert ParentPID.from_rev(a.name).state.run_count == 1
+
+    subprocess.check_call(
+        ["zntrack", "run", "test_worker.ParentPID", "--name", b.name],
+        env={**os.environ, "ZNTRACK_WORKER_DISABLE": "1"},
+    )
+    assert b.outs["value"] == 2
+    assert b.outs["ppid"] != worker.pid
+
+
+def test_run_with_worker_failure(worker):
+    with zntrack.Project() as project:
+        FailingNode()
+
+    project.build()
+
+    proc = subprocess.run(
+        ["zntrack", "run", "test_worker.FailingNode", "--name", "FailingNode"],
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 1
+    assert "Node failed in worker" in proc.stderr
+
+
+@pytest.mark.parametrize(
+    ("code", "returncode"), [(None, 0), (0, 0), (3, 3), ("Exit message", 1)]
+)
+def test_run_with_worker_exit(worker, code, returncode):
+    with zntrack.Project() as project:
+        ExitNode(code=code)
+
+    project.build()
+
+    proc = subprocess.run(
+        ["zntrack", "run", "test_worker.ExitNode", "--name", "ExitNode"],
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == returncode
+    if isinstance(code, str):
+        assert code in proc.stderr
+
+
+def test_worker_preload(proj_path):
+    # report the modules imported in the forked child before handling the request
+    script = textwrap.dedent(
+        """
+        import json
+        import sys
+
+        from zntrack.utils import worker
+
+        MODULES = ["dvc.repo", "pandas", "yaml", "git", "zntrack.utils.lockfile"]
+
+        def modules(path):
+            with open(path, "w") as f:
+                json.dump({x: x in sys.modules for x in MODULES}, f)
+
+        worker.serve(handlers={"modules": modules})
+        """
+    )
+    proc = subprocess.Popen([sys.executable, "-c", script])
+    socket = pathlib.Path(".zntrack-worker.sock")
+    try:
+        for _ in range(200):
+            if socket.exists():
+                break
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("worker did not start")
+        subprocess.check_call(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from zntrack.utils import worker;"
+                " sys.exit(worker.forward('modules', {'path': 'modules.json'}))",
+            ]
+        )
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    modules = json.loads(pathlib.Path("modules.json").read_text())
+    assert modules == dict.fromkeys(modules, True)
+
+
+def test_stale_socket(proj_path):
+    with zntrack.Project() as project:
+        node = ParentPID(value=3)
+
+    project.build()
+    # no worker is listening on this socket
+    pathlib.Path(".zntrack-worker.sock").touch()
+
+    subprocess.check_call(["zntrack", "run", "test_worker.ParentPID"])
+    assert node.outs["value"] == 3
@@ -0,0 +1,54 @@
+from zntrack.utils import dag
+
+STAGES = {
+    "A": {
+        "cmd": "a",
+        "outs": ["nodes/A/outs.json"],
+        "metrics": ["nodes/A/node-meta.json"],
+    },
+    "B": {"cmd": "b", "deps": ["nodes/A/outs.json"], "outs": ["data/B"]},
+    "C": {"cmd": "c", "deps": ["data/B/file.txt", "nodes/A/node-meta.json"]},
+    "D": {
+        "cmd": "d",
+        "deps": ["data"],
+        "outs": [{"nodes/D/outs.json": {"cache": False}}],
+    },
+    "E": {"cmd": "e", "deps": ["input.txt"]},
+}
+
+
+def test_get_stage_graph():
+    graph = dag.get_stage_graph(STAGES)
+    assert graph == {
+        "A": set(),
+        "B": {"A"},
+        "C": {"A", "B"},
+        "D": {"B"},
+        "E": set(),
+    }
+
+
+def test_upstream_closure():
+    graph = dag.get_stage_graph(STAGES)
+    assert dag.upstream_closure(graph, ["C"]) == {"A", "B", "C"}
+    assert dag.upstream_closure(graph, ["E"]) == {"E"}
+
+
+def test_topological_sort():
+    graph = dag.get_stage_graph(STAGES)
+    assert dag.topological_sort(graph, ["C", "B", "A"]) == ["A", "B", "C"]
+    # dependencies which are not selected are ignored
+    assert dag.topological_sort(graph, ["D", "C"]) == ["D", "C"]
+
+
+def test_stage_params():
+    stage = {
+        "cmd": "a",
+        "params": ["A", "B.x", {"config.yaml": ["lr"]}, {"data.json": None}],
+    }
+    assert dag.stage_params(stage) == {
+        "params.yaml": ["A", "B.x"],
+        "config.yaml": ["lr"],
+        "data.json": [],
+    }
+    assert dag.stage_params({"cmd": "b"}) == {}
@@ -0,0 +1,40 @@
+import os
+
+from zntrack.utils.hash_cache import HashCache
+
+ENTRY = {"hash": {"name": "md5", "value": "abc"}, "meta": {"size": 5}}
+
+
+def test_hash_cache(tmp_path):
+    file = tmp_path / "data.txt"
+    file.write_text("Hello")
+    os.utime(file, (1e9, 1e9))
+    cache = HashCache(tmp_path / "cache.json")
+
+    stat, entry = cache.get(file.as_posix(), "md5")
+    assert entry is None
+    cache.set(file.as_posix(), stat, "md5", ENTRY)
+    cache.save()
+
+    cache = HashCache(tmp_path / "cache.json")
+    _, entry = cache.get(file.as_posix(), "md5")
+    assert entry["hash"] == ENTRY["hash"]
+    assert cache.get(file.as_posix(), "md5-dos2unix")[1] is None
+
+    file.write_text("World")
+    os.utime(file, (1e9, 1e9 + 1))
+    assert cache.get(file.as_posix(), "md5")[1] is None
+    assert cache.get((tmp_path / "missing").as_posix(), "md5") == (None, None)
+
+
+def test_hash_cache_racy(tmp_path):
+    file = tmp_path / "data.txt"
+    file.write_text("Hello")
+    cache = HashCache(tmp_path / "cache.json")
+
+    stat, _ = cache.get(file.as_posix(), "md5")
+    # the file was just modified and could change within the mtime resolution
+    cache.set(file.as_posix(), stat, "md5", ENTRY)
+    assert cache.get(file.as_posix(), "md5")[1] is None
+    cache.save()
+    assert not (tmp_path / "cache.json").exists()
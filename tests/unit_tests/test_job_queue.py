@@ -0,0 +1,66 @@
+import time
+
+from zntrack.utils.job_queue import DONE, FAILED, PENDING, RUNNING, JobQueue
+
+GRAPH = {"A": set(), "B": {"A"}, "C": {"A"}, "D": {"B", "C"}}
+
+
+def test_claim_order(tmp_path):
+    with JobQueue(tmp_path / "queue.db") as jobs:
+        jobs.add(GRAPH, GRAPH)
+        assert jobs.claim("w1") == "A"
+        # B and C depend on A
+        assert jobs.claim("w2") is None
+        assert jobs.is_active()
+
+        jobs.finish("A", "w1")
+        assert {jobs.claim("w1"), jobs.claim("w2")} == {"B", "C"}
+        jobs.finish("B", "w1")
+        jobs.finish("C", "w2", error="exit code 1")
+
+        assert jobs.claim("w1") is None
+        assert not jobs.is_active()
+        status = {name: job["status"] for name, job in jobs.status().items()}
+        assert status == {"A": DONE, "B": DONE, "C": FAILED, "D": PENDING}
+
+        jobs.reset([FAILED])
+        assert jobs.claim("w1") == "C"
+
+
+def test_add_keeps_status(tmp_path):
+    with JobQueue(tmp_path / "queue.db") as jobs:
+        jobs.add(GRAPH, ["A", "B"])
+        jobs.claim("w1")
+        jobs.finish("A", "w1")
+
+    # e.g. a second worker starting with all stages
+    with JobQueue(tmp_path / "queue.db") as jobs:
+        jobs.add(GRAPH, GRAPH)
+        status = {name: job["status"] for name, job in jobs.status().items()}
+        assert status == {"A": DONE, "B": PENDING, "C": PENDING, "D": PENDING}
+
+
+def test_expired_lease(tmp_path):
+    with JobQueue(tmp_path / "queue.db", lease=0.1, max_attempts=2) as jobs:
+        jobs.add(GRAPH, ["A"])
+        assert jobs.claim("w1") == "A"
+        assert jobs.heartbeat("A", "w1")
+        assert jobs.status()["A"]["status"] == RUNNING
+
+        time.sleep(0.2)
+        # the worker died, another one takes over
+        assert not jobs.is_active()
+        assert jobs.claim("w2") == "A"
+        assert not jobs.heartbeat("A", "w1")
+        # the finish of the old worker is ignored
+        jobs.finish("A", "w1")
+        assert jobs.status()["A"] == {
+            "status": RUNNING,
+            "worker": "w2",
+            "attempts": 2,
+            "error": None,
+        }
+
+        time.sleep(0.2)
+        assert jobs.claim("w3") is None
+        assert jobs.status()["A"]["status"] == FAILED
@@ -0,0 +1,50 @@
+import pytest
+
+import zntrack
+from zntrack.resources import ResourcePool, get_resources, parse_size
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(1024, 1024), ("1024", 1024), ("512M", 512 * 1024**2), ("4GB", 4 * 1024**3)],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+def test_parse_size_invalid():
+    with pytest.raises(ValueError, match="Invalid size"):
+        parse_size("lots")
+    with pytest.raises(ValueError, match="must not be negative"):
+        zntrack.Resources(cpus=-1)
+
+
+def test_get_resources():
+    class Train(zntrack.Node):
+        resources = zntrack.Resources(cpus=4, memory="1G", gpus=1)
+
+    class WithField(zntrack.Node):
+        resources: dict = zntrack.params()
+
+    assert get_resources(Train) == zntrack.Resources(cpus=4, memory=1024**3, gpus=1)
+    assert get_resources(WithField) == zntrack.Resources()
+
+
+def test_resource_pool():
+    pool = ResourcePool(zntrack.Resources(cpus=4, memory="4G"))
+    small = zntrack.Resources(cpus=1, memory="1G")
+    large = zntrack.Resources(cpus=8)
+
+    # nodes larger than the budget can run on their own
+    assert pool.fits(large)
+    pool.acquire(small)
+    assert not pool.fits(large)
+    assert not pool.fits(zntrack.Resources(cpus=1, memory="4G"))
+    assert not pool.fits(zntrack.Resources(exclusive=True))
+    for _ in range(3):
+        assert pool.fits(small)
+        pool.acquire(small)
+    assert not pool.fits(small)
+
+    pool.release(small)
+    assert pool.fits(small)
@@ -0,0 +1,62 @@
+import networkx as nx
+import pytest
+
+from zntrack.utils import fusion
+
+
+def test_find_chains():
+    # A -> B -> C -> D, C -> E, F -> G, H
+    graph = nx.DiGraph([("A", "B"), ("B", "C"), ("C", "D"), ("C", "E"), ("F", "G")])
+    graph.add_node("H")
+    assert fusion.find_chains(graph, graph.nodes) == [["A", "B", "C"], ["F", "G"]]
+    assert fusion.find_chains(graph, ["A", "C", "D", "F", "G"]) == [["F", "G"]]
+    # connected through more than one attribute
+    graph = nx.MultiDiGraph([("A", "B"), ("A", "B")])
+    assert fusion.find_chains(graph, graph.nodes) == [["A", "B"]]
+
+
+def test_check_fusable():
+    graph = nx.DiGraph([("A", "B"), ("B", "C"), ("A", "C")])
+    for node in graph.nodes:
+        graph.nodes[node]["value"] = type("Node", (), {"name": node})
+    fusion.check_fusable(graph, ["A", "B"])
+    fusion.check_fusable(graph, ["A", "B", "C"])
+    with pytest.raises(ValueError, match="'B' depends on one of them"):
+        fusion.check_fusable(graph, ["A", "C"])
+
+
+def test_fuse_stages():
+    stages = [
+        {
+            "cmd": "zntrack run module.A --name A",
+            "params": ["A"],
+            "outs": ["nodes/A/outs.json", "nodes/A/data"],
+            "metrics": [{"nodes/A/node-meta.json": {"cache": True}}],
+        },
+        {
+            "cmd": "zntrack run module.B --name B --method fit",
+            "deps": ["input.txt", "nodes/A/data/file.txt", "nodes/A/outs.json"],
+            "params": ["B", {"config.yaml": None}],
+            "outs": ["nodes/B/outs.json"],
+            "metrics": [{"nodes/B/node-meta.json": {"cache": True}}],
+            "always_changed": True,
+        },
+    ]
+    fused = fusion.fuse_stages(stages)
+    assert fused == {
+        "cmd": "zntrack run-fused module.A:A module.B:B:fit",
+        "deps": ["input.txt"],
+        "params": ["A", "B", {"config.yaml": None}],
+        "outs": ["nodes/A/data", "nodes/A/outs.json", "nodes/B/outs.json"],
+        "metrics": [
+            {"nodes/A/node-meta.json": {"cache": True}},
+            {"nodes/B/node-meta.json": {"cache": True}},
+        ],
+        "always_changed": True,
+    }
+    assert fusion.is_fused_cmd(fused["cmd"])
+    assert not fusion.is_fused_cmd(stages[0]["cmd"])
+    assert fusion.parse_fused_cmd(fused["cmd"]) == [
+        ("module.A", "A", "run"),
+        ("module.B", "B", "fit"),
+    ]
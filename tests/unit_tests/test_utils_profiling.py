@@ -0,0 +1,54 @@
+import sys
+import time
+
+import pytest
+
+from zntrack.utils.profiling import (
+    StackSampler,
+    get_profile_dir,
+    get_profile_modes,
+    summarize,
+)
+
+
+@pytest.mark.parametrize(
+    ("value", "modes"),
+    [
+        ("", set()),
+        ("0", set()),
+        ("cprofile", {"cprofile"}),
+        ("sample,cprofile", {"cprofile", "sample"}),
+        ("True", {"cprofile", "sample"}),
+        ("all", {"cprofile", "sample"}),
+    ],
+)
+def test_get_profile_modes(value, modes):
+    assert get_profile_modes(value) == modes
+
+
+def test_get_profile_modes_invalid():
+    with pytest.raises(ValueError, match="perf"):
+        get_profile_modes("cprofile,perf")
+
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_stack_sampler(tmp_path):
+    sampler = StackSampler(root=sys._getframe(), interval=0.001)
+    sampler.start()
+    busy_wait(0.1)
+    sampler.stop()
+
+    path = get_profile_dir(tmp_path, create=True) / "profile.folded"
+    sampler.dump(path)
+    lines = path.read_text().splitlines()
+    assert lines
+    # the stacks start below the root frame
+    stacks = [line.split(";")[0].split()[0] for line in lines]
+    assert "busy_wait" in stacks
+    assert set(stacks) <= {"busy_wait", "StackSampler.stop"}
+    assert "busy_wait" in summarize(tmp_path)
@@ -0,0 +1,49 @@
+import pytest
+
+from zntrack.utils import tracing
+
+
+def test_span(tmp_path, monkeypatch):
+    path = tmp_path / "trace.jsonl"
+    monkeypatch.setenv("ZNTRACK_TRACE", path.as_posix())
+
+    with tracing.span("outer", node="A"):
+        with tracing.span("inner"):
+            tracing.add_attributes(bytes=10)
+        with pytest.raises(KeyError):
+            with tracing.span("failed"):
+                raise KeyError
+
+    inner, failed, outer = tracing.load_trace(path)
+    assert outer["name"] == "outer"
+    assert outer["parent_id"] is None
+    assert outer["attributes"] == {"node": "A"}
+    assert inner["parent_id"] == outer["span_id"]
+    assert inner["attributes"] == {"bytes": 10}
+    assert failed["attributes"] == {"error": "KeyError"}
+    assert outer["duration"] >= inner["duration"] >= 0
+
+
+def test_traced_chrome(tmp_path, monkeypatch):
+    path = tmp_path / "trace.json"
+    monkeypatch.setenv("ZNTRACK_TRACE", path.as_posix())
+
+    @tracing.traced("add")
+    def add(a, b):
+        tracing.add_attributes(a=a, b=b)
+        return a + b
+
+    assert add(1, 2) == 3
+    assert add(3, 4) == 7
+
+    assert path.read_text().startswith("[\n")
+    events = tracing.load_trace(path)
+    assert [x["args"] for x in events] == [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+    assert all(x["name"] == "add" and x["ph"] == "X" for x in events)
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.delenv("ZNTRACK_TRACE", raising=False)
+    assert not tracing.is_enabled()
+    with tracing.span("span"):
+        tracing.add_attributes(bytes=10)
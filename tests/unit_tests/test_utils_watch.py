@@ -0,0 +1,74 @@
+import json
+import pathlib
+import socket
+
+from zntrack.utils.state import StageStatus
+from zntrack.utils.watch import (
+    Poller,
+    StatusBroadcaster,
+    get_downstream,
+    get_watched_paths,
+)
+
+
+def test_get_watched_paths():
+    stages = {
+        "A": {"cmd": "a", "params": ["A", {"config.yaml": ["lr"]}], "outs": ["a.txt"]},
+        "B": {
+            "cmd": "b",
+            "deps": ["a.txt", "data/"],
+            "params": ["x", {"other.yaml": None}],
+        },
+    }
+    nwds = {"A": pathlib.Path("nodes", "A")}
+    assert get_watched_paths(stages, nwds) == {
+        "params.yaml": {"A", "B"},
+        "config.yaml": {"A"},
+        "nodes/A/node-meta.json": {"A"},
+        "a.txt": {"B"},
+        "data": {"B"},
+        "other.yaml": {"B"},
+    }
+
+
+def test_get_downstream():
+    graph = {"A": set(), "B": {"A"}, "C": {"B"}, "D": set()}
+    assert get_downstream(graph, ["A"]) == {"A", "B", "C"}
+    assert get_downstream(graph, ["C", "D"]) == {"C", "D"}
+
+
+def test_poller(tmp_path):
+    file, directory = tmp_path / "file.txt", tmp_path / "data"
+    file.write_text("a")
+    directory.mkdir()
+    poller = Poller([file.as_posix(), directory.as_posix()])
+    assert poller.changes() == set()
+
+    file.write_text("abc")
+    (directory / "new.txt").write_text("b")
+    assert poller.changes() == {file.as_posix(), directory.as_posix()}
+    assert poller.changes() == set()
+
+    file.unlink()
+    assert poller.changes() == {file.as_posix()}
+
+
+def test_status_broadcaster(tmp_path):
+    broadcaster = StatusBroadcaster(tmp_path / "watch.sock")
+    try:
+        broadcaster("A", StageStatus(False))
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect((tmp_path / "watch.sock").as_posix())
+            file = client.makefile()
+            # the current status is sent on connect
+            assert json.loads(file.readline())["name"] == "A"
+            broadcaster("B", StageStatus(True, reasons=("deps",)))
+            assert json.loads(file.readline()) == {
+                "name": "B",
+                "status": "changed",
+                "reasons": ["deps"],
+                "upstream": [],
+            }
+    finally:
+        broadcaster.close()
+    assert not (tmp_path / "watch.sock").exists()
@@ -5,6 +5,7 @@ import sys
 from zntrack import config
 from zntrack.add import add
 from zntrack.apply import apply
+from zntrack.changed import changed
 from zntrack.config import NOT_AVAILABLE, FieldTypes
 from zntrack.fields import (
     deps,
@@ -22,6 +23,8 @@ from zntrack.fields import (
 from zntrack.from_rev import from_rev
 from zntrack.node import Node
 from zntrack.project import Project
+from zntrack.read import read_metrics, read_params
+from zntrack.resources import Resources
 from zntrack.utils import nwd
 
 __all__ = [
@@ -37,10 +40,14 @@ __all__ = [
     "metrics_path",
     "Node",
     "Project",
+    "Resources",
     "nwd",
     "from_rev",
     "apply",
     "add",
+    "changed",
+    "read_metrics",
+    "read_params",
     "field",
     "FieldTypes",
     "NOT_AVAILABLE",
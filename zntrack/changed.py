@@ -0,0 +1,68 @@
+"""Check if many nodes have to run again at once."""
+
+import pathlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from zntrack import Node
+    from zntrack.group import Group
+
+
+def changed(nodes: "Node | Group | t.Iterable[Node]", jobs: int = 1) -> dict[str, bool]:
+    """Check if nodes changed since their last run.
+
+    Compared to ``node.state.changed`` for every node, the repository is
+    opened, indexed and locked once per ``remote`` and ``rev`` and every
+    dependency is hashed once. In the workspace, the hashes of unchanged
+    files are reused from previous checks. The nodes of a fused stage
+    changed if the stage changed, see ``zntrack.utils.fusion``.
+
+    Parameters
+    ----------
+    nodes : zntrack.Node | zntrack.group.Group | Iterable[zntrack.Node]
+        The nodes to check.
+    jobs : int
+        The number of threads to check the nodes with. Experimental, see
+        ``zntrack.utils.state.get_graph_status``.
+
+    Returns
+    -------
+    dict[str, bool]
+        Whether the node changed, by the name of the node.
+
+    Examples
+    --------
+    >>> import zntrack
+    >>> with zntrack.Project() as project:
+    ...     with project.group("data") as group:
+    ...         a = zntrack.examples.ParamsToOuts(params=1)
+    >>> project.repro()
+    >>> zntrack.changed(group)
+    {'data_ParamsToOuts': False}
+    """
+    import dvc.api
+
+    from zntrack import Node, config
+    from zntrack.utils.hash_cache import HashCache
+    from zntrack.utils.state import StatusCache, get_changed
+
+    nodes = [nodes] if isinstance(nodes, Node) else [*nodes]
+    stage_names = {node.name: node.state.stage_name for node in nodes}
+    by_repo: dict[tuple, list[str]] = {}
+    for node in nodes:
+        names = by_repo.setdefault((node.state.remote, node.state.rev), [])
+        if stage_names[node.name] not in names:
+            names.append(stage_names[node.name])
+
+    result = {}
+    for (remote, rev), names in by_repo.items():
+        fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
+        cache = StatusCache(fs)
+        if remote is None and rev is None:
+            cache.hash_cache = HashCache(
+                pathlib.Path(fs.repo.root_dir, config.HASH_CACHE_PATH)
+            )
+        result.update(get_changed(fs, names, jobs=jobs, cache=cache))
+        if cache.hash_cache is not None:
+            cache.hash_cache.save()
+    return {node.name: result[stage_names[node.name]] for node in nodes}
@@ -6,19 +6,18 @@ import importlib.metadata
 import os
 import pathlib
 import sys
+import typing as t
 
-import git
 import typer
-import yaml
 
 from zntrack import Node, config, utils
 from zntrack.state import PLUGIN_LIST
+from zntrack.utils import dag, fusion, worker
 from zntrack.utils.import_handler import import_handler
-from zntrack.utils.list_nodes import list_nodes
-from zntrack.utils.lockfile import mp_join_stage_lock, mp_start_stage_lock
 from zntrack.utils.misc import load_env_vars
 
-load_env_vars()
+if t.TYPE_CHECKING:
+    import dvc.repo
 
 app = typer.Typer()
 
@@ -26,6 +25,8 @@ app = typer.Typer()
 def version_callback(value: bool) -> None:
     """Get the installed 'ZnTrack' version."""
     if value:
+        import git
+
         path = pathlib.Path(__file__).parent.parent.parent
         report = f"ZnTrack {importlib.metadata.version('zntrack')} at '{path}'"
 
@@ -65,27 +66,23 @@ def parse_command_from_dvc_yaml(stage_name: str) -> tuple[str, str | None]:
         If the stage is not found in dvc.yaml or command cannot be parsed
 
     """
-    dvc_yaml_path = config.DVC_FILE_PATH
-    if not dvc_yaml_path.exists():
-        raise FileNotFoundError(
-            f"{config.DVC_FILE_PATH} not found. "
-            "Make sure you're in the project root directory."
-        )
-
-    with dvc_yaml_path.open() as f:
-        dvc_config = yaml.safe_load(f)
-
-    if "stages" not in dvc_config:
+    stages = dag.load_stages(config.DVC_FILE_PATH)
+    if not stages:
         raise ValueError(f"No stages found in {config.DVC_FILE_PATH}")
+    node_path, name, _ = _parse_stage(stage_name, stages)
+    return node_path, name
+
 
-    if stage_name not in dvc_config["stages"]:
-        available_stages = ", ".join(dvc_config["stages"].keys())
+def _parse_stage(stage_name: str, stages: dict[str, dict]) -> tuple[str, str, str]:
+    """Get the (node_path, name, method) of a 'zntrack run' stage."""
+    if stage_name not in stages:
+        available_stages = ", ".join(stages.keys())
         raise ValueError(
             f"Stage '{stage_name}' not found in {config.DVC_FILE_PATH}. "
             f"Available stages: {available_stages}"
         )
 
-    stage = dvc_config["stages"][stage_name]
+    stage = stages[stage_name]
     if "cmd" not in stage:
         raise ValueError(
             f"No command found for stage '{stage_name}' in {config.DVC_FILE_PATH}"
@@ -105,14 +102,27 @@ def parse_command_from_dvc_yaml(stage_name: str) -> tuple[str, str | None]:
 
     node_path = parts[2]
     name = None
+    method = "run"
 
-    # Look for --name argument
+    # Look for --name and --method arguments
     if "--name" in parts:
         name_idx = parts.index("--name")
         if name_idx + 1 < len(parts):
             name = parts[name_idx + 1]
+    if "--method" in parts:
+        method_idx = parts.index("--method")
+        if method_idx + 1 < len(parts):
+            method = parts[method_idx + 1]
 
-    return node_path, name
+    return node_path, name, method
+
+
+def _parse_stage_nodes(stage_name: str, stages: dict[str, dict]) -> list[tuple]:
+    """Get the (node_path, name, method) of every node a stage runs."""
+    cmd = stages.get(stage_name, {}).get("cmd", "")
+    if fusion.is_fused_cmd(cmd):
+        return fusion.parse_fused_cmd(cmd)
+    return [_parse_stage(stage_name, stages)]
 
 
 @app.callback()
@@ -123,6 +133,82 @@ def main(
 ) -> None:
     """ZnTrack CLI main callback."""
     _ = version  # this would be greyed out otherwise
+    load_env_vars()
+
+
+def _restore_environ(environ: dict[str, str]) -> None:
+    """Undo the changes to ``os.environ`` without clearing it in between.
+
+    Other threads never see an empty environment.
+    """
+    for key in set(os.environ) - set(environ):
+        os.environ.pop(key, None)
+    for key, value in environ.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+
+
+def run_node(
+    node_path: str,
+    name: str | None = None,
+    method: str = "run",
+    save_lockfile: bool = True,
+    repo: "dvc.repo.Repo | None" = None,
+    lockfile_mode: str | None = None,
+) -> None:
+    """Execute a ZnTrack Node in the current process.
+
+    Arguments:
+    ---------
+    node_path : str
+        The full path to the Node, e.g. `ipsuite.nodes.SmilesToAtoms`.
+    name : str
+        The name of the node.
+    method : str, default 'run'
+        The method to run on the node.
+    save_lockfile : bool
+        Save the lockfile for the inputs into the node-meta.json file.
+    repo : dvc.repo.Repo, optional
+        Reuse this repository to compute the lockfile instead of
+        opening a new one.
+    lockfile_mode : str, optional
+        How to compute the lockfile, see `zntrack.utils.lockfile.LOCKFILE_MODES`.
+
+    """
+    from zntrack.utils import profiling, tracing
+    from zntrack.utils.lockfile import start_stage_lock
+    from zntrack.utils.usage import UsageTracker
+
+    start_time = datetime.datetime.now()
+    usage = UsageTracker()
+
+    try:
+        utils.misc.load_env_vars(name)
+        if (cwd := pathlib.Path.cwd().as_posix()) not in sys.path:
+            sys.path.append(cwd)
+
+        cls: Node = utils.import_handler.import_handler(node_path)
+        node: Node = cls.from_rev(name=name, running=True)
+        if save_lockfile:
+            join_stage_lock = start_stage_lock(node.name, lockfile_mode, repo)
+        node.state.increment_run_count()
+        node.state.save_node_meta()
+        # dynamic version of node.run()
+        with usage.phase("run"), profiling.profile(node.nwd):
+            with tracing.span("Node.run", node=node.name, method=method):
+                getattr(node, method)()
+        with usage.phase("save"), tracing.span("Node.save", node=node.name):
+            node.save()
+        if save_lockfile:
+            node.state.set_lockfile(*join_stage_lock())
+        run_time = datetime.datetime.now() - start_time
+        node.state.add_run_time(run_time)
+        node.state.set_usage(usage.result())
+
+        node.state.save_node_meta()
+    finally:
+        # e.g. if the node failed, later nodes are not run at the same time
+        usage.stop()
 
 
 @app.command()
@@ -132,6 +218,7 @@ def run(
     meta_only: bool = False,
     method: str = "run",
     save_lockfile: bool = True,
+    lockfile_mode: str = None,
 ) -> None:
     """Execute a ZnTrack Node.
 
@@ -140,6 +227,9 @@ def run(
     When providing just a node name (without dots), the command will be parsed
     from dvc.yaml.
 
+    If a worker started via 'zntrack serve' is available, the node is
+    executed by the worker. Otherwise, it runs in the current process.
+
     Arguments:
     ---------
     node_path : str
@@ -154,10 +244,12 @@ def run(
         The method to run on the node.
     save_lockfile : bool
         Save the lockfile for the inputs into the node-meta.json file.
+    lockfile_mode : str
+        Compute the lockfile 'inline', in a 'thread' or a 'process'.
+        Defaults to the 'ZNTRACK_LOCKFILE_MODE' environment variable or 'auto',
+        which computes the lockfile inline for small dependencies.
 
     """
-    start_time = datetime.datetime.now()
-
     # If node_path doesn't contain a dot, treat it as a stage name from dvc.yaml
     if "." not in node_path:
         try:
@@ -170,25 +262,275 @@ def run(
             typer.echo(f"Error: {e}", err=True)
             raise typer.Exit(1) from e
 
-    utils.misc.load_env_vars(name)
-    sys.path.append(pathlib.Path.cwd().as_posix())
+    kwargs = {
+        "node_path": node_path,
+        "name": name,
+        "method": method,
+        "save_lockfile": save_lockfile,
+        "lockfile_mode": lockfile_mode,
+    }
+    exit_code = worker.forward("run", kwargs)
+    if exit_code is None:
+        run_node(**kwargs)
+    elif exit_code != 0:
+        raise typer.Exit(exit_code)
+
+
+@app.command(name="run-fused")
+def run_fused(
+    nodes: t.List[str] = typer.Argument(
+        ..., help="The nodes as 'module.Node:name[:method]', in the order they run."
+    ),
+    save_lockfile: bool = True,
+    lockfile_mode: str = None,
+) -> None:
+    """Execute a chain of nodes fused into a single stage.
 
-    cls: Node = utils.import_handler.import_handler(node_path)
-    node: Node = cls.from_rev(name=name, running=True)
-    if save_lockfile:
-        queue, proc = mp_start_stage_lock(name)
-    node.state.increment_run_count()
-    node.state.save_node_meta()
-    # dynamic version of node.run()
-    getattr(node, method)()
-    node.save()
-    if save_lockfile:
-        stage_lock = mp_join_stage_lock(queue, proc)
-        node.state.set_lockfile(stage_lock)
-    run_time = datetime.datetime.now() - start_time
-    node.state.add_run_time(run_time)
+    The stages are written by 'Project.build(fuse=True)' and 'Project.fused'.
+    The lockfile of the fused stage is saved to the 'node-meta.json' of the
+    last node.
+    """
+    entries = [fusion.parse_entry(entry) for entry in nodes]
+    for idx, (node_path, name, method) in enumerate(entries):
+        environ = dict(os.environ)
+        try:
+            run_node(
+                node_path,
+                name,
+                method,
+                save_lockfile=save_lockfile and idx == len(entries) - 1,
+                lockfile_mode=lockfile_mode,
+            )
+        finally:
+            # do not leak node specific environment variables
+            _restore_environ(environ)
+
+
+@app.command()
+def serve(
+    socket: pathlib.Path = typer.Option(
+        None, help="Path to the Unix socket. Defaults to '.zntrack-worker.sock'."
+    ),
+    preload: str = typer.Option(
+        "",
+        help="Comma separated list of additional user modules to import once,"
+        " e.g. 'torch'. ZnTrack and its dependencies are always preloaded.",
+    ),
+) -> None:
+    """Start a worker that executes 'zntrack run' with warm imports.
+
+    While the worker is running, 'zntrack run' forwards the execution to it.
+    Each node runs in a forked process with the working directory, environment
+    and 'sys.path' of the calling 'zntrack run'. Set 'ZNTRACK_WORKER_DISABLE=1'
+    to bypass the worker.
+    """
+    worker.serve(
+        handlers={"run": run_node},
+        socket_path=socket,
+        preload=[x for x in preload.split(",") if x],
+    )
 
-    node.state.save_node_meta()
+
+def _select_stages(
+    all_stages: dict[str, dict], stages: t.List[str] | None, group: t.List[str] | None
+) -> t.List[str]:
+    """Get the names of the given stages and of all stages in the given groups."""
+    names = [*(stages or [])]
+    if group:
+        nwds = dag.load_nwds(config.ZNTRACK_FILE_PATH)
+        for grp in group:
+            names.extend(
+                name
+                for name, nwd in nwds.items()
+                if nwd.is_relative_to(config.NWD_PATH / grp) and name in all_stages
+            )
+    return names
+
+
+@app.command(name="run-many")
+def run_many(
+    stages: t.List[str] = typer.Argument(None, help="Names of the stages to run."),
+    group: t.List[str] = typer.Option(
+        None, help="Run all stages of a group, e.g. 'nested/GRP1'. Can be repeated."
+    ),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Run stages in parallel."),
+    save_lockfile: bool = True,
+) -> None:
+    """Run multiple stages in a single Python process.
+
+    Imports and the DVC repository are shared between the stages. Stages
+    are executed in dependency order and each stage writes its outputs and
+    'node-meta.json' exactly as 'zntrack run' does. This does not check
+    whether a stage has changed, use 'dvc repro' for that.
+    """
+    import concurrent.futures
+
+    all_stages = dag.load_stages(config.DVC_FILE_PATH)
+    names = _select_stages(all_stages, stages, group)
+    if not names:
+        typer.echo("Error: no stages selected.", err=True)
+        raise typer.Exit(1)
+    try:
+        commands = {name: _parse_stage_nodes(name, all_stages) for name in names}
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1) from e
+    if jobs > 1 and config.ENV_FILE_PATH.exists():
+        import yaml
+
+        env = yaml.safe_load(config.ENV_FILE_PATH.read_text()) or {}
+        if any(name in env.get("stages", {}) for name in commands):
+            typer.echo(
+                "Error: stage specific environment variables in"
+                f" '{config.ENV_FILE_PATH}' are not supported with '--jobs > 1'.",
+                err=True,
+            )
+            raise typer.Exit(1)
+
+    repo = None
+    if save_lockfile:
+        import dvc.repo
+
+        repo = dvc.repo.Repo()
+
+    graph = dag.get_stage_graph(all_stages)
+    order = dag.topological_sort(graph, commands)
+    upstream = {name: graph[name] & set(commands) for name in order}
+
+    # the environment before any stage ran, shared by all threads
+    environ = dict(os.environ)
+
+    def _run(name: str) -> None:
+        nodes = commands[name]
+        for idx, (node_path, node_name, method) in enumerate(nodes):
+            # the lockfile of a fused stage is saved by its last node
+            lockfile = save_lockfile and idx == len(nodes) - 1
+            try:
+                run_node(node_path, node_name, method, lockfile, repo=repo)
+            finally:
+                # do not leak environment variables set by a node
+                _restore_environ(environ)
+
+    failed: dict[str, BaseException] = {}
+    skipped: set[str] = set()
+    done: set[str] = set()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(jobs, 1)) as pool:
+        running: dict[concurrent.futures.Future, str] = {}
+        pending = [*order]
+        while pending or running:
+            for name in [*pending]:
+                if upstream[name] & (set(failed) | skipped):
+                    skipped.add(name)
+                    pending.remove(name)
+                elif upstream[name] <= done and len(running) < max(jobs, 1):
+                    running[pool.submit(_run, name)] = name
+                    pending.remove(name)
+            if not running:
+                continue
+            finished, _ = concurrent.futures.wait(
+                running, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in finished:
+                name = running.pop(future)
+                if (err := future.exception()) is not None:
+                    failed[name] = err
+                else:
+                    done.add(name)
+
+    for name, err in failed.items():
+        typer.echo(f"Stage '{name}' failed: {err!r}", err=True)
+    for name in skipped:
+        typer.echo(f"Stage '{name}' skipped, because an upstream stage failed.", err=True)
+    if failed:
+        raise typer.Exit(1)
+
+
+@app.command(name="worker")
+def run_worker(
+    stages: t.List[str] = typer.Argument(
+        None, help="Names of the stages to run, including their upstream stages."
+    ),
+    group: t.List[str] = typer.Option(
+        None, help="Run all stages of a group, e.g. 'nested/GRP1'. Can be repeated."
+    ),
+    queue: pathlib.Path = typer.Option(
+        config.QUEUE_PATH, help="Path to the queue database on the shared filesystem."
+    ),
+    lease: float = typer.Option(
+        60.0, help="Seconds until a stage of an unresponsive worker is claimed again."
+    ),
+    poll: float = typer.Option(
+        5.0, help="Seconds to wait while other workers run the upstream stages."
+    ),
+    max_attempts: int = typer.Option(
+        3, help="How often a stage is claimed again after its worker died."
+    ),
+    retry_failed: bool = typer.Option(False, help="Queue failed stages again."),
+) -> None:
+    """Run the stages of a built project from a shared job queue.
+
+    Start this command on several hosts sharing the project directory. The
+    first worker creates the queue from dvc.yaml, all workers then pull the
+    stages whose upstream stages are done and run their 'cmd', i.e.
+    'zntrack run'. Workers renew the lease of their stage while it runs, so
+    the stage of a worker that died is picked up by another one. A worker
+    exits once no stage is left to run. Run 'dvc commit' afterwards to
+    update dvc.lock.
+    """
+    import socket
+    import subprocess
+    import time
+
+    from zntrack.utils.job_queue import FAILED, PENDING, JobQueue
+
+    all_stages = dag.load_stages(config.DVC_FILE_PATH)
+    graph = dag.get_stage_graph(all_stages)
+    names = _select_stages(all_stages, stages, group) or [*all_stages]
+    if unknown := [name for name in names if name not in all_stages]:
+        typer.echo(f"Error: Stage(s) {', '.join(unknown)} not found.", err=True)
+        raise typer.Exit(1)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    with JobQueue(queue, lease=lease, max_attempts=max_attempts) as jobs:
+        jobs.add(graph, dag.upstream_closure(graph, names))
+        if retry_failed:
+            jobs.reset([FAILED])
+        while True:
+            name = jobs.claim(worker_id)
+            if name is None:
+                if not jobs.is_active():
+                    break
+                time.sleep(poll)
+                continue
+
+            cmd = all_stages[name]["cmd"]
+            if not isinstance(cmd, str):
+                cmd = " && ".join(cmd)
+            typer.echo(f"Running stage '{name}'")
+            proc = subprocess.Popen(cmd, shell=True)
+            while True:
+                try:
+                    exit_code = proc.wait(timeout=lease / 3)
+                    break
+                except subprocess.TimeoutExpired:
+                    if not jobs.heartbeat(name, worker_id):
+                        typer.echo(f"Lost the lease of stage '{name}'.", err=True)
+                        proc.terminate()
+                        exit_code = proc.wait()
+                        break
+            error = None if exit_code == 0 else f"exit code {exit_code}"
+            jobs.finish(name, worker_id, error)
+
+        status = jobs.status()
+
+    failed = [name for name, job in status.items() if job["status"] == FAILED]
+    blocked = [name for name, job in status.items() if job["status"] == PENDING]
+    for name in failed:
+        typer.echo(f"Stage '{name}' failed: {status[name]['error']}", err=True)
+    for name in blocked:
+        typer.echo(f"Stage '{name}' skipped, because an upstream stage failed.", err=True)
+    if failed or blocked:
+        raise typer.Exit(1)
 
 
 @app.command()
@@ -196,13 +538,132 @@ def list(
     remote: str = typer.Argument(None, help="The path/url to the repository"),
     rev: str = typer.Argument(None, help="The revision to list (default: HEAD)"),
     json: bool = typer.Option(False, help="Output in JSON format."),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Number of threads to compute the node status (experimental).",
+    ),
 ):
     """List all Nodes in the Project."""
-    df = list_nodes(remote=remote, rev=rev, verbose=0 if json else 1)
+    from zntrack.utils.list_nodes import list_nodes
+
+    df = list_nodes(remote=remote, rev=rev, verbose=0 if json else 1, jobs=jobs)
     if json:
         typer.echo(df.to_json(orient="records", indent=2))
 
 
+def _format_status(name: str, value) -> str:
+    line = f"{value.to_dict()['status']:<10} {name}"
+    if value.upstream:
+        line += f" (upstream: {', '.join(value.upstream)})"
+    elif value.reasons:
+        line += f" ({', '.join(value.reasons)})"
+    return line
+
+
+@app.command()
+def status(
+    names: t.List[str] = typer.Argument(
+        None, help="Only show these stages and their upstream stages."
+    ),
+    remote: str = typer.Option(None, help="The path/url to the repository."),
+    rev: str = typer.Option(None, help="The revision to check."),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Number of threads to compute the node status (experimental).",
+    ),
+    json: bool = typer.Option(False, help="Output in JSON format."),
+    hash_cache: bool = typer.Option(
+        True, help="Reuse the hashes of unchanged files in the workspace."
+    ),
+):
+    """Show which nodes have to run again, upstream nodes first."""
+    import json as json_
+
+    import dvc.api
+
+    from zntrack.utils.hash_cache import HashCache
+    from zntrack.utils.state import StatusCache, get_graph_status
+
+    fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
+    cache = StatusCache(fs)
+    if hash_cache and remote is None and rev is None:
+        cache.hash_cache = HashCache(
+            pathlib.Path(fs.repo.root_dir, config.HASH_CACHE_PATH)
+        )
+    result = get_graph_status(fs, targets=names or None, jobs=jobs, cache=cache)
+    if cache.hash_cache is not None:
+        cache.hash_cache.save()
+
+    if json:
+        records = [{"name": name, **value.to_dict()} for name, value in result.items()]
+        typer.echo(json_.dumps(records, indent=2))
+        return
+    for name, value in result.items():
+        typer.echo(_format_status(name, value))
+
+
+@app.command()
+def watch(
+    interval: float = typer.Option(1.0, help="Seconds between checks for changes."),
+    jobs: int = typer.Option(
+        1,
+        "--jobs",
+        "-j",
+        help="Number of threads to compute the node status (experimental).",
+    ),
+    json: bool = typer.Option(False, help="Output JSON lines."),
+    socket: pathlib.Path = typer.Option(
+        None, help="Also send the updates as JSON lines to clients of this Unix socket."
+    ),
+):
+    """Show the status of the nodes and every change until interrupted."""
+    import json as json_
+
+    from zntrack.utils.watch import StatusBroadcaster
+    from zntrack.utils.watch import watch as watch_
+
+    broadcaster = StatusBroadcaster(socket) if socket is not None else None
+
+    def _callback(name, value):
+        if json:
+            typer.echo(json_.dumps({"name": name, **value.to_dict()}))
+        else:
+            typer.echo(_format_status(name, value))
+        if broadcaster is not None:
+            broadcaster(name, value)
+
+    try:
+        watch_(_callback, interval=interval, jobs=jobs)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if broadcaster is not None:
+            broadcaster.close()
+
+
+@app.command()
+def profile(
+    name: str = typer.Argument(..., help="The name of the node."),
+    limit: int = typer.Option(20, help="The number of functions to show."),
+    sort: str = typer.Option(
+        "cumulative", help="The key to sort the cProfile entries by, e.g. 'tottime'."
+    ),
+):
+    """Summarize the profile of a node run with 'ZNTRACK_PROFILE' set."""
+    from zntrack.utils.profiling import summarize
+
+    nwd = dag.load_nwds(config.ZNTRACK_FILE_PATH).get(name, config.NWD_PATH / name)
+    try:
+        typer.echo(summarize(nwd, limit=limit, sort=sort))
+    except FileNotFoundError as err:
+        typer.echo(str(err), err=True)
+        raise typer.Exit(1) from err
+
+
 @app.command()
 def finalize(
     skip_cached: bool = typer.Option(True, help="Do not upload cached nodes."),
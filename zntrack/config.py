@@ -9,6 +9,21 @@ ZNTRACK_FILE_PATH = pathlib.Path("zntrack.json")
 ENV_FILE_PATH = pathlib.Path("env.yaml")
 NWD_PATH = pathlib.Path("nodes")
 EXP_INFO_PATH = pathlib.Path(".exp_info.yaml")
+# relative to the working directory of 'zntrack serve' and 'zntrack run'
+WORKER_SOCKET_PATH = pathlib.Path(".zntrack-worker.sock")
+# job queue of 'zntrack worker', must be on a filesystem shared by all hosts
+QUEUE_PATH = pathlib.Path(".zntrack-queue.db")
+# hashes of the dependencies reused by 'zntrack status' and 'zntrack list'
+HASH_CACHE_PATH = pathlib.Path(".dvc", "tmp", "zntrack-hashes.json")
+# key of the resources of a node in its zntrack.json entry, see ``zntrack.Resources``.
+# Not a valid identifier, so it can not clash with the name of a field.
+ZNTRACK_JSON_RESOURCES_KEY = "$resources$"
+# key of the fused stage running a node in its zntrack.json entry, see
+# ``zntrack.utils.fusion``. Not a valid identifier, like the key above.
+ZNTRACK_JSON_STAGE_KEY = "$stage$"
+# In the 'auto' lockfile mode, the lock of stages with dependencies smaller than
+# this size (in bytes) is computed inline instead of in a separate process.
+LOCKFILE_INLINE_MAX_SIZE: int = 64 * 1024**2
 
 
 # For "node-meta.json" and "dvc stage add ... --metrics-no-cache" the default is using
@@ -109,6 +124,13 @@ class _ZNTRACK_FIELD_SUFFIX_TYPE:
 ZNTRACK_FIELD_SUFFIX = _ZNTRACK_FIELD_SUFFIX_TYPE()
 
 
+class _ZNTRACK_FIELD_COMPRESSION_TYPE:
+    pass
+
+
+ZNTRACK_FIELD_COMPRESSION = _ZNTRACK_FIELD_COMPRESSION_TYPE()
+
+
 class NodeStatusEnum(enum.Enum):
     CREATED = 0
     RUNNING = 2
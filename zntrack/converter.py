@@ -14,6 +14,7 @@ from zntrack.add import DVCImportPath
 from zntrack.config import (
     FIELD_TYPE,
     PARAMS_FILE_PATH,
+    ZNTRACK_FIELD_COMPRESSION,
     ZNTRACK_FIELD_SUFFIX,
     ZNTRACK_INDEPENDENT_OUTPUT_TYPE,
     FieldTypes,
@@ -21,6 +22,7 @@ from zntrack.config import (
 
 from .node import Node
 from .utils import module_handler
+from .utils.compression import compressed_suffix
 
 
 def _reconstruct_value_recursively(value):
@@ -289,7 +291,10 @@ def node_to_output_paths(node: Node, attribute: str) -> t.List[str]:
             FieldTypes.PLOTS,
             FieldTypes.METRICS,
         ]:
-            suffix = field.metadata[ZNTRACK_FIELD_SUFFIX]
+            suffix = compressed_suffix(
+                field.metadata[ZNTRACK_FIELD_SUFFIX],
+                field.metadata.get(ZNTRACK_FIELD_COMPRESSION),
+            )
             paths.append((node.nwd / field.name).with_suffix(suffix).as_posix())
         elif option_type == FieldTypes.OUTS_PATH:
             paths.extend(_enforce_str_list(getattr(node, field.name)))
@@ -392,3 +397,14 @@ class DVCImportPathConverter(znjson.ConverterBase):
     def decode(self, value: str) -> pathlib.Path:
         # fallback decoder if used over pathlib converter
         return pathlib.Path(value)
+
+
+# the converters of the values written to 'zntrack.json'
+ZNTRACK_JSON_CONVERTERS = [
+    ConnectionConverter,
+    NodeConverter,
+    CombinedConnectionsConverter,
+    znjson.converter.PathlibConverter,
+    DVCImportPathConverter,
+    DataclassConverter,
+]
@@ -1,31 +1,565 @@
+import contextlib
+import dataclasses
 import datetime
-import unittest.mock as mock
+import io
+import json
+import logging
+import pickle
+import time
+import typing as t
 
+from znflow import handler
 from znflow.deployment import VanillaDeployment
 
+from zntrack.config import FIELD_TYPE, FieldTypes
+from zntrack.exceptions import NodeRunError
+from zntrack.resources import ResourcePool, Resources, get_resources
+from zntrack.utils import tracing
+from zntrack.utils.hashing import (
+    get_inputs,
+    get_output_hash,
+    hash_inputs,
+    outputs_exist,
+)
+from zntrack.utils.usage import UsageTracker
+
+if t.TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+    from zntrack import Node
+    from zntrack.utils.hash_cache import HashCache
+
+log = logging.getLogger(__name__)
+
+# output fields whose values are sent back from the worker processes
+_OUTPUT_FIELD_TYPES = (FieldTypes.OUTS, FieldTypes.PLOTS, FieldTypes.METRICS)
+
+
+@contextlib.contextmanager
+def _use_method(node: "Node") -> t.Iterator[None]:
+    """Replace ``node.run`` with the method selected via ``zntrack.apply``."""
+    if hasattr(node, "_method"):
+        import unittest.mock as mock
+
+        method = getattr(node, getattr(node, "_method"))
+        # mock the node.run with the method
+        with mock.patch.object(node, "run", method):
+            yield
+    else:
+        yield
+
+
+def _save_results(node: "Node", usage: UsageTracker | None = None) -> None:
+    """Save the outputs and the node-meta.json file including the output hash.
+
+    If a ``UsageTracker`` is given, the time of ``node.save()`` and the
+    resources used are recorded in the node-meta.json as well.
+    """
+    with contextlib.nullcontext() if usage is None else usage.phase("save"):
+        with tracing.span("Node.save", node=node.name):
+            node.save()
+    if node.state.input_hash is not None:
+        node.__dict__["state"]["output_hash"] = get_output_hash(node)
+    if usage is not None:
+        node.state.set_usage(usage.result())
+    node.state.save_node_meta()
+
+
+def _run_tracked(node: "Node", execute: bool = True) -> UsageTracker | None:
+    """Run a node with its connections resolved and record the run time.
+
+    The results are not saved, see ``_save_results``.
+
+    Parameters
+    ----------
+    node : Node
+        The node to run.
+    execute : bool
+        Call ``node.run()`` and track the resources used. Otherwise, only
+        the run count and run time are updated, e.g. for external nodes.
+
+    Returns
+    -------
+    UsageTracker | None
+        The resources used, if the node has been executed.
+    """
+    start_time = datetime.datetime.now()
+    node.state.increment_run_count()
+    node.state.save_node_meta()
+    usage = None
+    if execute:
+        usage = UsageTracker()
+        try:
+            with _use_method(node), usage.phase("run"):
+                with tracing.span("Node.run", node=node.name):
+                    node.run()
+        except BaseException:
+            usage.stop()
+            raise
+    node.state.add_run_time(datetime.datetime.now() - start_time)
+    return usage
+
+
+def _execute_node(node: "Node") -> None:
+    """Run a node with its connections resolved and save the results."""
+    _save_results(node, _run_tracked(node))
+
+
+def _read_node_meta(node: "Node") -> dict:
+    try:
+        return json.loads((node.nwd / "node-meta.json").read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
 
 class ZnTrackDeployment(VanillaDeployment):
+    """Run the nodes in the current process.
+
+    Nodes whose inputs did not change since the last ``Project.run`` are
+    skipped, unless ``force=True`` is passed. Their outputs are loaded
+    lazily from the previous run. See ``zntrack.utils.hashing``.
+
+    The outputs of nodes that have been run are hashed and compared with the
+    previous run. If they did not change, the downstream nodes are skipped,
+    as long as their own parameters did not change either (early cutoff).
+
+    Downstream nodes always receive the outputs of the nodes that ran before
+    them from memory. With ``background_save=True``, the outputs are also
+    written to disk in a background thread, while the next nodes are already
+    running. The nodes must not modify their inputs in place then. The
+    downstream nodes of a node whose outputs are still being written cannot
+    be skipped and ``Project.run`` returns once all outputs are written.
+
+    Parameters
+    ----------
+    background_save : bool
+        Save the outputs of the nodes in a background thread. The resources
+        used by saving are not included in the usage of the node then.
+    """
+
+    force = False
+    background_save = False
+    _saver: "Executor | None" = None
+    _hash_cache: "HashCache | None" = None
+
+    def __init__(self, background_save: bool = False):
+        super().__init__()
+        self.background_save = background_save
+        self._pending: dict[str, "Future"] = {}
+
+    @contextlib.contextmanager
+    def _use_hash_cache(self) -> t.Iterator[None]:
+        """Share the hashes of unchanged dependency files with ``zntrack status``."""
+        from zntrack.config import HASH_CACHE_PATH
+        from zntrack.utils.hash_cache import HashCache
+
+        self._hash_cache = HashCache(HASH_CACHE_PATH)
+        try:
+            yield
+        finally:
+            # only persist the cache inside of a DVC repository
+            if HASH_CACHE_PATH.parent.parent.is_dir():
+                self._hash_cache.save()
+            self._hash_cache = None
+
+    def run(self, nodes: list | None = None, force: bool = False):
+        self.force = force
+        if self.background_save:
+            from concurrent.futures import ThreadPoolExecutor
+
+            # a single thread, so the outputs are saved in the order the nodes ran
+            self._saver = ThreadPoolExecutor(max_workers=1)
+        try:
+            with self._use_hash_cache():
+                try:
+                    super().run(nodes)
+                finally:
+                    pending = self._wait_for_saves()
+        finally:
+            self.force = False
+        for future in pending:
+            future.result()
+
+    def _wait_for_saves(self) -> list["Future"]:
+        """Wait until all outputs are written and return the save futures."""
+        if self._saver is not None:
+            self._saver.shutdown(wait=True)
+            self._saver = None
+        pending = [*self._pending.values()]
+        self._pending = {}
+        return pending
+
+    def _is_saving(self, node_uuid) -> bool:
+        future = self._pending.get(node_uuid)
+        return future is not None and not future.done()
+
+    def _skip_unchanged(self, node: "Node") -> bool:
+        """Check if the inputs of the node changed and store the new input hash.
+
+        Must be called before the connections of the node are resolved.
+        """
+        try:
+            inputs = get_inputs(node, self.graph)
+        except (ValueError, NotImplementedError) as err:
+            # e.g. getitem connections or connections that have been resolved
+            log.debug(f"Unable to compute the input hash of '{node.name}': {err}")
+            return False
+        node_meta = _read_node_meta(node)
+        self.graph.nodes[node.uuid]["previous_output_hash"] = node_meta.get("output_hash")
+        if any(self._is_saving(x) for x in self.graph.predecessors(node.uuid)):
+            # the input hash is computed once the upstream outputs are written
+            self.graph.nodes[node.uuid]["inputs"] = inputs
+            return False
+        input_hash = hash_inputs(inputs, self._hash_cache)
+        if not (self.force or node.always_changed):
+            if node_meta.get("input_hash") == input_hash and outputs_exist(node):
+                if any(
+                    self.graph.nodes[x].get("outputs_changed") is False
+                    for x in self.graph.predecessors(node.uuid)
+                ):
+                    log.info(
+                        f"Skipping node '{node.name}', the outputs of its upstream"
+                        " nodes did not change."
+                    )
+                else:
+                    log.info(f"Skipping unchanged node '{node.name}'.")
+                node.__dict__["state"].update(
+                    run_count=node_meta.get("run_count", 0),
+                    run_time=datetime.timedelta(seconds=node_meta.get("run_time", 0)),
+                    input_hash=input_hash,
+                    output_hash=node_meta.get("output_hash"),
+                )
+                return True
+        node.__dict__["state"]["input_hash"] = input_hash
+        return False
+
+    def _check_outputs_changed(self, node_uuid) -> None:
+        """Compare the output hash of a node that has been run with the last run.
+
+        If the outputs did not change, the input hashes of the downstream nodes
+        do not change either and they are skipped (early cutoff).
+        """
+        node = self.graph.nodes[node_uuid]["value"]
+        previous = self.graph.nodes[node_uuid].pop("previous_output_hash", None)
+        if node.state.output_hash is None:
+            return
+        changed = node.state.output_hash != previous
+        self.graph.nodes[node_uuid]["outputs_changed"] = changed
+        if not changed:
+            log.info(f"The outputs of '{node.name}' did not change.")
+
+    def _save_node(self, node_uuid, usage: UsageTracker | None = None) -> None:
+        node = self.graph.nodes[node_uuid]["value"]
+        if (inputs := self.graph.nodes[node_uuid].pop("inputs", None)) is not None:
+            node.__dict__["state"]["input_hash"] = hash_inputs(inputs, self._hash_cache)
+        _save_results(node, usage)
+        self._check_outputs_changed(node_uuid)
+
     def _run_node(self, node_uuid):
         node = self.graph.nodes[node_uuid]["value"]
-        start_time = datetime.datetime.now()
-        node.state.increment_run_count()
-        node.state.save_node_meta()
-        if hasattr(node, "_method"):
-            method_string = getattr(node, "_method")
-            method = getattr(node, method_string)
-            if method != "run":
-                # mock the node.run with the method
-                with mock.patch.object(node, "run", method):
-                    # TODO: this needs to be fixed on the znflow side!
-                    super()._run_node(node_uuid)
-            else:
-                super()._run_node(node_uuid)
+        for predecessor in self.graph.predecessors(node_uuid):
+            predecessor_available = self.graph.nodes[predecessor].get("available", False)
+            if self.graph.immutable_nodes and predecessor_available:
+                continue
+            self._run_node(predecessor)
+
+        node_available = self.graph.nodes[node_uuid].get("available", False)
+        if self.graph.immutable_nodes and node_available or node._external_:
+            # TODO: the node-meta.json and outputs are saved again here
+            usage = _run_tracked(node, execute=False)
+        elif self._skip_unchanged(node):
+            self.graph.nodes[node_uuid]["available"] = True
+            return
         else:
-            super()._run_node(node_uuid)
+            self.graph._update_node_attributes(node, handler.UpdateConnectors())
+            usage = _run_tracked(node)
+            self.graph.nodes[node_uuid]["available"] = True
 
-        run_time = datetime.datetime.now() - start_time
-        node.state.add_run_time(run_time)
-        node.state.save_node_meta()
-        node.save()
+        if self._saver is not None:
+            if usage is not None:
+                # the downstream nodes run while saving in the background
+                usage.stop()
+            self._pending[node_uuid] = self._saver.submit(
+                self._save_node, node_uuid, usage
+            )
+        else:
+            self._save_node(node_uuid, usage)
 
     # TODO: when finished all Nodes, commit all changes
+
+
+class _NodePickler(pickle.Pickler):
+    """Pickle classes created by ``zntrack.apply`` by recreating them."""
+
+    def reducer_override(self, obj):
+        if isinstance(obj, type) and "_method" in vars(obj):
+            from zntrack.apply import apply
+
+            return apply, (obj.__bases__[0], obj._method)
+        return NotImplemented
+
+
+def _dump_node(node: "Node") -> bytes:
+    buffer = io.BytesIO()
+    _NodePickler(buffer).dump(node)
+    return buffer.getvalue()
+
+
+def _execute_pickled_node(data: bytes) -> tuple[dict, dict]:
+    """Run a pickled node in a worker process.
+
+    Returns
+    -------
+    tuple[dict, dict]
+        The values of the output fields and the updated node state.
+    """
+    node: Node = pickle.loads(data)
+    _execute_node(node)
+    outputs = {
+        field.name: node.__dict__[field.name]
+        for field in dataclasses.fields(node)
+        if field.metadata.get(FIELD_TYPE) in _OUTPUT_FIELD_TYPES
+        and field.name in node.__dict__
+    }
+    state = {
+        key: getattr(node.state, key)
+        for key in ("run_count", "run_time", "input_hash", "output_hash", "usage")
+    }
+    return outputs, state
+
+
+@dataclasses.dataclass
+class ExecutorDeployment(ZnTrackDeployment):
+    """Run the nodes through a ``concurrent.futures.Executor``.
+
+    Nodes are submitted to the executor as soon as all their upstream nodes
+    have finished. The connections of a node are always resolved in the main
+    process. For executors running in a separate process, the node is pickled
+    and the worker sends the values of the output fields back, after it has
+    saved the results.
+
+    If a ``budget`` is given, ready nodes are packed against it using the
+    ``zntrack.Resources`` declared on their classes, starting with the nodes
+    requiring the most CPUs. Smaller nodes are started while a larger node
+    waits for resources, until it has waited ``max_backfill_wait`` seconds.
+    Then no further nodes are started until it fits. A node requiring more
+    than the budget runs when no other node is running.
+
+    If a node fails, the independent nodes are still executed, but none of the
+    nodes depending on it. A ``NodeRunError`` listing the failed nodes is raised
+    at the end.
+
+    Attributes
+    ----------
+    executor : concurrent.futures.Executor
+        The executor to submit the nodes to, e.g. a ``ThreadPoolExecutor``.
+        It is not shut down after the graph has been run.
+    max_concurrency : int, optional
+        The maximum number of nodes submitted at the same time.
+        Defaults to no limit besides the one of the executor.
+    pickle_nodes : bool, optional
+        Send a copy of the node to the executor instead of running it in
+        place. Defaults to False for a ``ThreadPoolExecutor`` and True for
+        all other executors.
+    budget : zntrack.Resources, optional
+        The resources available to all running nodes together,
+        e.g. ``zntrack.Resources.from_machine()``.
+    max_backfill_wait : float, optional
+        The time in seconds a node waiting for resources can be overtaken by
+        smaller nodes. Defaults to 60 seconds, None overtakes forever.
+
+    Examples
+    --------
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> import zntrack
+    >>> from zntrack.deployment import ExecutorDeployment
+    >>> executor = ThreadPoolExecutor(max_workers=8)
+    >>> project = zntrack.Project(deployment=ExecutorDeployment(executor))
+    """
+
+    executor: "Executor | None" = None
+    max_concurrency: int | None = None
+    pickle_nodes: bool | None = None
+    budget: Resources | None = None
+    max_backfill_wait: float | None = 60.0
+
+    def __post_init__(self):
+        super().__init__()
+
+    @contextlib.contextmanager
+    def _get_executor(self) -> t.Iterator["Executor"]:
+        if self.executor is None:
+            raise ValueError(f"No executor has been provided to {self}.")
+        yield self.executor
+
+    def _is_done(self, node_uuid) -> bool:
+        """Whether the node does not have to be run (again)."""
+        if self.graph.nodes[node_uuid]["value"]._external_:
+            return True
+        return self.graph.immutable_nodes and self.graph.nodes[node_uuid].get(
+            "available", False
+        )
+
+    def _get_todo(self, nodes: list | None) -> set:
+        import networkx as nx
+
+        if nodes is None:
+            selected = set(self.graph.nodes)
+        else:
+            selected = set()
+            for node in nodes:
+                selected |= {node.uuid, *nx.ancestors(self.graph, node.uuid)}
+        return {node_uuid for node_uuid in selected if not self._is_done(node_uuid)}
+
+    def _submit(self, executor: "Executor", node: "Node") -> "Future":
+        from concurrent.futures import ThreadPoolExecutor
+
+        pickle_nodes = self.pickle_nodes
+        if pickle_nodes is None:
+            pickle_nodes = not isinstance(executor, ThreadPoolExecutor)
+        if pickle_nodes:
+            return executor.submit(_execute_pickled_node, _dump_node(node))
+        return executor.submit(_execute_node, node)
+
+    def _is_starving(self, since: float) -> bool:
+        if self.max_backfill_wait is None:
+            return False
+        return time.monotonic() - since >= self.max_backfill_wait
+
+    def _apply_result(self, node_uuid, result: tuple[dict, dict] | None) -> None:
+        if result is not None:
+            outputs, state = result
+            node = self.graph.nodes[node_uuid]["value"]
+            node.__dict__.update(outputs)
+            node.__dict__["state"].update(state)
+        self.graph.nodes[node_uuid]["available"] = True
+
+    def run(self, nodes: list | None = None, force: bool = False):
+        self.force = force
+        try:
+            with self._use_hash_cache():
+                self._run(nodes)
+        finally:
+            self.force = False
+
+    def _run(self, nodes: list | None):
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        todo = self._get_todo(nodes)
+        order = [
+            node_uuid for node_uuid in self.graph.get_sorted_nodes() if node_uuid in todo
+        ]
+        failed: dict[str, BaseException] = {}
+        broken, skipped = set(), []
+        running = {}
+
+        pool = None if self.budget is None else ResourcePool(self.budget)
+        waiting_since: dict = {}  # nodes that did not fit into the pool
+        resources = {
+            node_uuid: get_resources(self.graph.nodes[node_uuid]["value"])
+            for node_uuid in todo
+        }
+
+        with self._get_executor() as executor:
+            while todo or running:
+                ready = []
+                for node_uuid in order:
+                    upstream = set(self.graph.predecessors(node_uuid))
+                    if node_uuid not in todo or upstream & todo:
+                        continue
+                    if upstream & set(running.values()):
+                        continue
+                    if upstream & broken:
+                        todo.remove(node_uuid)
+                        broken.add(node_uuid)
+                        skipped.append(self.graph.nodes[node_uuid]["value"].name)
+                        continue
+                    ready.append(node_uuid)
+                if pool is not None:
+                    ready.sort(key=lambda node_uuid: -resources[node_uuid].cpus)
+
+                for node_uuid in ready:
+                    if self.max_concurrency and len(running) >= self.max_concurrency:
+                        break
+                    if pool is not None:
+                        if not pool.fits(resources[node_uuid]):
+                            since = waiting_since.setdefault(node_uuid, time.monotonic())
+                            if self._is_starving(since):
+                                break  # reserve the resources once they are released
+                            continue
+                        pool.acquire(resources[node_uuid])
+                        waiting_since.pop(node_uuid, None)
+                    todo.remove(node_uuid)
+                    node = self.graph.nodes[node_uuid]["value"]
+                    if self._skip_unchanged(node):
+                        if pool is not None:
+                            pool.release(resources[node_uuid])
+                        self._apply_result(node_uuid, None)
+                        continue
+                    self.graph._update_node_attributes(node, handler.UpdateConnectors())
+                    running[self._submit(executor, node)] = node_uuid
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node_uuid = running.pop(future)
+                    if pool is not None:
+                        pool.release(resources[node_uuid])
+                    try:
+                        self._apply_result(node_uuid, future.result())
+                    except Exception as err:
+                        broken.add(node_uuid)
+                        failed[self.graph.nodes[node_uuid]["value"].name] = err
+                    else:
+                        self._check_outputs_changed(node_uuid)
+
+        if failed:
+            msg = f"Failed to run the node(s) {', '.join(failed)}."
+            if skipped:
+                msg += f" Skipped the downstream node(s) {', '.join(skipped)}."
+            raise NodeRunError(msg) from next(iter(failed.values()))
+
+
+@dataclasses.dataclass
+class ProcessPoolDeployment(ExecutorDeployment):
+    """Run independent nodes in parallel worker processes.
+
+    Uses a new ``concurrent.futures.ProcessPoolExecutor`` for every run,
+    see ``ExecutorDeployment`` for details.
+
+    Attributes
+    ----------
+    max_workers : int, optional
+        The maximum number of worker processes. Defaults to the number of CPUs.
+    budget : zntrack.Resources, optional
+        The resources to pack the nodes against.
+        Defaults to ``zntrack.Resources.from_machine()``.
+
+    Examples
+    --------
+    >>> import zntrack
+    >>> from zntrack.deployment import ProcessPoolDeployment
+    >>> project = zntrack.Project(deployment=ProcessPoolDeployment(max_workers=4))
+    """
+
+    max_workers: int | None = None
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        budget: Resources | None = None,
+        max_backfill_wait: float | None = 60.0,
+    ):
+        super().__init__(
+            budget=budget or Resources.from_machine(),
+            max_backfill_wait=max_backfill_wait,
+        )
+        self.max_workers = max_workers
+
+    @contextlib.contextmanager
+    def _get_executor(self) -> t.Iterator["Executor"]:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            yield executor
@@ -8,3 +8,7 @@ class ZnTrackError(Exception):
 
 class InvalidOptionError(ZnTrackError, AttributeError):
     """Raised when using an invalid ZnTrackOption for a task."""
+
+
+class NodeRunError(ZnTrackError):
+    """Raised when one or more nodes failed to run."""
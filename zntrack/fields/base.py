@@ -7,6 +7,7 @@ import znfields
 from zntrack.config import (
     FIELD_TYPE,
     ZNTRACK_CACHE,
+    ZNTRACK_FIELD_COMPRESSION,
     ZNTRACK_FIELD_DUMP,
     ZNTRACK_FIELD_LOAD,
     ZNTRACK_FIELD_SUFFIX,
@@ -15,6 +16,7 @@ from zntrack.config import (
 )
 from zntrack.node import Node
 from zntrack.plugins import base_getter, plugin_getter
+from zntrack.utils.compression import validate_compression
 
 FN_WITH_SUFFIX = t.Callable[["Node", str, str], t.Any]
 FN_WITHOUT_SUFFIX = t.Callable[["Node", str], t.Any]
@@ -29,6 +31,7 @@ def field(
     dump_fn: FN_WITH_SUFFIX | FN_WITHOUT_SUFFIX | None = None,
     suffix: str | None = None,
     load_fn: FN_WITHOUT_SUFFIX | FN_WITH_SUFFIX | None = None,
+    compression: t.Literal["gzip", "zstd", "lz4"] | None = None,
     **kwargs,
 ):
     """Create a custom field.
@@ -52,6 +55,11 @@ def field(
         Can be None if the output is a directory.
     load_fn : FN_WITHOUT_SUFFIX | FN_WITH_SUFFIX
         Function to load the field.
+    compression : str, optional
+        Compress the file written by ``dump_fn`` with ``gzip``, ``zstd``
+        or ``lz4``. The codec is appended to the suffix, e.g. ``.h5.gz``,
+        and ``load_fn`` reads the decompressed stream through
+        ``node.state.fs.open``.
     **kwargs
         Additional arguments to pass to the field.
 
@@ -89,6 +97,9 @@ def field(
     ...     def run(self) -> None:
     ...         self.data = np.arange(9).reshape(3, 3)
     """
+    validate_compression(compression, suffix)
+    if compression is not None and field_type == FieldTypes.METRICS:
+        raise ValueError("Metrics can not be compressed, because DVC has to read them.")
     kwargs["metadata"] = kwargs.get("metadata", {})
     kwargs["metadata"][FIELD_TYPE] = field_type
     kwargs["metadata"][ZNTRACK_CACHE] = cache
@@ -101,4 +112,6 @@ def field(
         kwargs["metadata"][ZNTRACK_FIELD_DUMP] = dump_fn
     if suffix is not None:
         kwargs["metadata"][ZNTRACK_FIELD_SUFFIX] = suffix
+    if compression is not None:
+        kwargs["metadata"][ZNTRACK_FIELD_COMPRESSION] = compression
     return znfields.field(default=default, getter=plugin_getter, **kwargs)
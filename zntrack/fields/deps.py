@@ -4,23 +4,27 @@ import typing as t
 
 import znflow
 import znflow.handler
-import znjson
 
-from zntrack import converter
 from zntrack.config import ZNTRACK_FILE_PATH, FieldTypes
 from zntrack.fields.base import field
 from zntrack.node import Node
+from zntrack.utils import tracing
 from zntrack.utils.filesystem import resolve_state_file_path
 
 _T = t.TypeVar("_T")
 
 
 def _deps_getter(self: "Node", name: str):
+    import znjson
+
+    from zntrack import converter
+
     zntrack_path = resolve_state_file_path(
         self.state.fs, self.state.path, ZNTRACK_FILE_PATH
     )
     with self.state.fs.open(zntrack_path) as f:
         content = json.load(f)[self.name][name]
+        tracing.record_bytes(f)
         # TODO: Ensure deps are loaded from the correct revision
         try:
             content = znjson.loads(
@@ -1,24 +1,29 @@
 import json
 import typing as t
 
-import znjson
-
 from zntrack import config
 from zntrack.config import NOT_AVAILABLE, FieldTypes
 from zntrack.fields.base import field
 from zntrack.node import Node
+from zntrack.utils import tracing
 from zntrack.utils.filesystem import resolve_dvc_path
 
 
 def _outs_getter(self: "Node", name: str, suffix: str):
+    import znjson
+
     target_path = (self.nwd / name).with_suffix(suffix)
     outs_path = resolve_dvc_path(self.state.fs, self.state.path, target_path)
 
     with self.state.fs.open(outs_path) as f:
-        return json.load(f, cls=znjson.ZnDecoder)
+        content = json.load(f, cls=znjson.ZnDecoder)
+        tracing.record_bytes(f)
+        return content
 
 
 def _outs_save_func(self: "Node", name: str, suffix: str):
+    import znjson
+
     self.nwd.mkdir(parents=True, exist_ok=True)
     try:
         (self.nwd / name).with_suffix(suffix).write_text(
@@ -37,10 +42,22 @@ def _metrics_save_func(self: "Node", name: str, suffix: str):
 
 
 @t.overload
-def outs(*, cache: bool = True, independent: bool = False, **kwargs) -> t.Any: ...
+def outs(
+    *,
+    cache: bool = True,
+    independent: bool = False,
+    compression: t.Literal["gzip", "zstd", "lz4"] | None = None,
+    **kwargs,
+) -> t.Any: ...
 
 
-def outs(*, cache: bool = True, independent: bool = False, **kwargs) -> t.Any:
+def outs(
+    *,
+    cache: bool = True,
+    independent: bool = False,
+    compression: t.Literal["gzip", "zstd", "lz4"] | None = None,
+    **kwargs,
+) -> t.Any:
     """Define output for a node.
 
     An output can be anything that can be pickled.
@@ -52,6 +69,10 @@ def outs(*, cache: bool = True, independent: bool = False, **kwargs) -> t.Any:
        Default is ``zntrack.config.ALWAYS_CACHE``.
     independent : bool, optional
          Whether the output is independent of the node's inputs. Default is `False`.
+    compression : str, optional
+        Compress the output file with ``gzip``, ``zstd`` or ``lz4``.
+        The file is saved as e.g. ``<name>.json.gz``. ``zstd`` and ``lz4``
+        require the ``zstandard`` and ``lz4`` packages, respectively.
 
     Examples
     --------
@@ -70,6 +91,7 @@ def outs(*, cache: bool = True, independent: bool = False, **kwargs) -> t.Any:
         dump_fn=_outs_save_func,
         suffix=".json",
         load_fn=_outs_getter,
+        compression=compression,
         repr=False,
         init=False,
         **kwargs,
@@ -1,23 +1,26 @@
 import dataclasses
 import typing as t
 
-import yaml
-
 from zntrack.config import PARAMS_FILE_PATH, FieldTypes
 from zntrack.fields.base import field
 from zntrack.node import Node
+from zntrack.utils import tracing
 from zntrack.utils.filesystem import resolve_state_file_path
 
 _T = t.TypeVar("_T")
 
 
 def _params_getter(self: "Node", name: str):
+    import yaml
+
     params_path = resolve_state_file_path(
         self.state.fs, self.state.path, PARAMS_FILE_PATH
     )
 
     with self.state.fs.open(params_path) as f:
-        return yaml.safe_load(f)[self.name][name]
+        content = yaml.safe_load(f)
+        tracing.record_bytes(f)
+        return content[self.name][name]
 
 
 # Overloads for type checking
@@ -1,13 +1,22 @@
 import typing as t
 
-import pandas as pd
-
-from zntrack.config import NOT_AVAILABLE, ZNTRACK_OPTION_PLOTS_CONFIG, FieldTypes
+from zntrack.config import (
+    NOT_AVAILABLE,
+    ZNTRACK_FIELD_COMPRESSION,
+    ZNTRACK_OPTION_PLOTS_CONFIG,
+    FieldTypes,
+)
 from zntrack.fields.base import field
 from zntrack.node import Node
+from zntrack.utils.compression import compress_file
+
+if t.TYPE_CHECKING:
+    import pandas as pd
 
 
 def _plots_save_func(self: "Node", name: str, suffix: str):
+    import pandas as pd
+
     self.nwd.mkdir(parents=True, exist_ok=True)
     content = getattr(self, name)
     if not isinstance(content, pd.DataFrame):
@@ -15,13 +24,19 @@ def _plots_save_func(self: "Node", name: str, suffix: str):
     content.to_csv((self.nwd / name).with_suffix(suffix))
 
 
-def _plots_autosave_setter(self: Node, name: str, value: pd.DataFrame):
+def _plots_autosave_setter(self: Node, name: str, value: "pd.DataFrame"):
     self.nwd.mkdir(parents=True, exist_ok=True)
-    value.to_csv((self.nwd / name).with_suffix(".csv"))
+    path = (self.nwd / name).with_suffix(".csv")
+    value.to_csv(path)
+    if compression := self.state.get_field(name).metadata.get(ZNTRACK_FIELD_COMPRESSION):
+        # write the file declared in the dvc.yaml
+        compress_file(path, compression)
     self.__dict__[name] = value
 
 
 def _plots_getter(self: "Node", name: str, suffix: str):
+    import pandas as pd
+
     with self.state.fs.open((self.nwd / name).with_suffix(suffix)) as f:
         return pd.read_csv(f, index_col=0)
 
@@ -38,6 +53,7 @@ def plots(
     template: str | None = None,
     title: str | None = None,
     autosave: bool = False,
+    compression: t.Literal["gzip", "zstd", "lz4"] | None = None,
     **kwargs,
 ) -> t.Any: ...
 
@@ -53,6 +69,7 @@ def plots(
     template: str | None = None,
     title: str | None = None,
     autosave: bool = False,
+    compression: t.Literal["gzip", "zstd", "lz4"] | None = None,
     **kwargs,
 ):
     """Pandas plot options.
@@ -81,7 +98,12 @@ def plots(
         Title of the plot, by default None.
     autosave : bool, optional
         Save the data of this field every time it is being
-        updated. Disable for large dataframes.
+        updated. Disable for large dataframes. Compressed
+        fields are compressed on every update as well.
+    compression : str, optional
+        Compress the CSV file with ``gzip``, ``zstd`` or ``lz4``.
+        DVC can not render compressed plots, so no plot definition
+        is added to the ``dvc.yaml`` for compressed fields.
 
     Examples
     --------
@@ -123,6 +145,7 @@ def plots(
         dump_fn=_plots_save_func,
         suffix=".csv",
         load_fn=_plots_getter,
+        compression=compression,
         repr=False,
         init=False,
         **kwargs,
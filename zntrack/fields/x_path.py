@@ -4,7 +4,6 @@ import typing as t
 from pathlib import Path
 
 import znfields
-import znjson
 
 from zntrack import config
 from zntrack.config import (
@@ -21,6 +20,7 @@ from zntrack.config import (
 # if t.TYPE_CHECKING:
 from zntrack.node import Node
 from zntrack.plugins import plugin_getter
+from zntrack.utils import tracing
 from zntrack.utils.filesystem import resolve_state_file_path
 from zntrack.utils.misc import TempPathLoader
 from zntrack.utils.node_wd import NWDReplaceHandler
@@ -51,8 +51,11 @@ def _paths_getter(self: Node, name: str):
             self.state.fs, self.state.path, ZNTRACK_FILE_PATH
         )
 
+        import znjson
+
         with self.state.fs.open(zntrack_path) as f:
             content = json.load(f)[self.name][name]
+            tracing.record_bytes(f)
             content = znjson.loads(json.dumps(content))
 
             if self.state.tmp_path is not None:
@@ -1,11 +1,13 @@
 import importlib
+import json
 import pathlib
 import sys
+import typing as t
 
-import dvc.api
-import git
-from dvc.scm import SCMError
-from dvc.stage.exceptions import StageFileDoesNotExistError
+from zntrack.config import ZNTRACK_JSON_STAGE_KEY
+
+if t.TYPE_CHECKING:
+    import dvc.api
 
 
 def from_rev(
@@ -13,7 +15,7 @@ def from_rev(
     remote: str | None = None,
     rev: str | None = None,
     path: str | None = None,
-    fs: dvc.api.DVCFileSystem | None = None,
+    fs: "dvc.api.DVCFileSystem | None" = None,
 ):
     """Load a ZnTrack Node.
 
@@ -36,6 +38,13 @@ def from_rev(
         A DVCFileSystem instance to use for accessing the DVC repository.
         If not provided, a new DVCFileSystem will be created using the `remote` and `rev`.
     """
+    import dvc.api
+    import git
+    from dvc.scm import SCMError
+    from dvc.stage.exceptions import StageFileDoesNotExistError, StageNotFound
+
+    from zntrack.utils import fusion
+
     if path is not None:
         raise NotImplementedError
     if fs is None:
@@ -64,10 +73,16 @@ def from_rev(
                 pass
         except SCMError:
             rev = None
+    node_name = name.rsplit(":", 1)[-1]
     try:
         stage = fs.repo.stage.collect(target=name)[0]
     except StageFileDoesNotExistError:
         raise ValueError(f"Stage {name} not found in {fs.repo}")
+    except StageNotFound:
+        # the node might be part of a fused stage
+        if (fused_stage := _get_fused_stage(fs, name)) is None:
+            raise
+        stage = fs.repo.stage.collect(target=fused_stage)[0]
 
     try:
         cmd = stage.cmd
@@ -79,10 +94,16 @@ def from_rev(
     except AttributeError:
         raise ValueError("Stage is not a ZnTrack pipeline stage.")
 
-    # cmd will be "zntrack run module.name --name ..."
-    # and we need the module.name and --name part
-    run_str = cmd.split()[2]
-    name = cmd.split()[4]
+    if fusion.is_fused_cmd(cmd):
+        nodes = {x[1]: x[0] for x in fusion.parse_fused_cmd(cmd)}
+        if node_name not in nodes:
+            raise ValueError(f"Node {node_name} not found in the stage {stage.name}")
+        run_str, name = nodes[node_name], node_name
+    else:
+        # cmd will be "zntrack run module.name --name ..."
+        # and we need the module.name and --name part
+        run_str = cmd.split()[2]
+        name = cmd.split()[4]
 
     package_and_module, cls_name = run_str.rsplit(".", 1)
     sys.path.append(pathlib.Path.cwd().as_posix())
@@ -111,3 +132,18 @@ def from_rev(
     return cls.from_rev(
         name, remote=remote, rev=rev, path=path
     )  # rely on local filesystem
+
+
+def _get_fused_stage(fs: "dvc.api.DVCFileSystem", name: str) -> str | None:
+    """Get the fused stage running the node, see ``zntrack.utils.fusion``."""
+    *dvc_file, node_name = name.rsplit(":", 1)
+    path = pathlib.PurePosixPath(*dvc_file).parent / "zntrack.json"
+    try:
+        with fs.open(path.as_posix()) as f:
+            conf = json.load(f)
+    except FileNotFoundError:
+        return None
+    stage = conf.get(node_name, {}).get(ZNTRACK_JSON_STAGE_KEY)
+    if not isinstance(stage, str):
+        return None
+    return ":".join([*dvc_file, stage])
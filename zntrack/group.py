@@ -2,10 +2,9 @@ import pathlib
 import typing as t
 
 import znflow
-from dvc.stage.exceptions import InvalidStageName
-from dvc.stage.utils import is_valid_name
 
 from zntrack.config import NWD_PATH
+from zntrack.utils.misc import is_valid_name
 
 if t.TYPE_CHECKING:
     from zntrack import Node
@@ -30,6 +29,8 @@ class Group:
     def __init__(self, names: tuple[str], nodes: list | None = None) -> None:
         for name in names:
             if not is_valid_name(name):
+                from dvc.stage.exceptions import InvalidStageName
+
                 raise InvalidStageName
         self._names = names
         self._nodes = nodes if nodes else []
@@ -78,6 +79,12 @@ class Group:
         """Get the number of nodes in the group."""
         return len(self._nodes)
 
+    def changed(self, jobs: int = 1) -> dict[str, bool]:
+        """Check if the nodes in the group changed, see ``zntrack.changed``."""
+        from zntrack.changed import changed
+
+        return changed(self._nodes, jobs=jobs)
+
     @classmethod
     def from_znflow_group(cls, group: znflow.Group) -> "Group":
         return cls(names=group.names, nodes=group.nodes)
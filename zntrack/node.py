@@ -8,17 +8,15 @@ import typing as t
 import uuid
 import warnings
 
-import dvc.api
 import typing_extensions as ty_ex
 import znfields
 import znflow
-from dvc.stage.exceptions import InvalidStageName
-from dvc.stage.utils import is_valid_name
-from fsspec.implementations.local import LocalFileSystem
 
 from zntrack.group import Group
 from zntrack.state import NodeStatus
-from zntrack.utils.misc import get_plugins_from_env, nwd_to_name
+from zntrack.utils import tracing
+from zntrack.utils.compression import get_node_fs
+from zntrack.utils.misc import get_plugins_from_env, is_valid_name, nwd_to_name
 
 from .config import (
     FIELD_TYPE,
@@ -34,6 +32,9 @@ try:
 except ImportError:
     from typing_extensions import dataclass_transform
 
+if t.TYPE_CHECKING:
+    import dvc.api
+
 T = t.TypeVar("T", bound="Node")
 
 log = logging.getLogger(__name__)
@@ -66,6 +67,8 @@ def _name_setter(self, attr_name: str, value: str) -> None:
         return
 
     if not is_valid_name(value):
+        from dvc.stage.exceptions import InvalidStageName
+
         raise InvalidStageName
 
     if "_" in value:
@@ -179,7 +182,13 @@ class Node(znflow.Node, znfields.Base):
                             " Please set it before saving."
                         )
                     try:
-                        plugin.save(field)
+                        with tracing.span(
+                            "plugin.save",
+                            node=self.name,
+                            field=field.name,
+                            plugin=type(plugin).__name__,
+                        ):
+                            plugin.save(field)
                     except Exception as err:  # noqa: E722
                         if plugin._continue_on_error_:
                             warnings.warn(
@@ -200,6 +209,7 @@ class Node(znflow.Node, znfields.Base):
         return self.state.nwd
 
     @classmethod
+    @tracing.traced("Node.from_rev")
     def from_rev(
         cls: t.Type[T],
         name: str | None = None,
@@ -208,11 +218,12 @@ class Node(znflow.Node, znfields.Base):
         running: bool = False,
         lazy_evaluation: bool = True,
         path: str | None | pathlib.Path = None,
-        fs: dvc.api.DVCFileSystem | None = None,
+        fs: "dvc.api.DVCFileSystem | None" = None,
         **kwargs,
     ) -> T:
         if name is None:
             name = cls.__name__
+        tracing.add_attributes(node=name, remote=remote, rev=rev)
         if path is not None:
             path = pathlib.Path(path)
         else:
@@ -231,6 +242,8 @@ class Node(znflow.Node, znfields.Base):
             )
             instance = cls(**lazy_values)
         if remote is not None or rev is not None:
+            import dvc.api
+
             if fs is None:
                 _fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
             else:
@@ -253,6 +266,8 @@ class Node(znflow.Node, znfields.Base):
             if remote is not None or rev is not None:
                 fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
             else:
+                from fsspec.implementations.local import LocalFileSystem
+
                 fs = LocalFileSystem()
         instance.__dict__["state"] = NodeStatus(
             remote=remote,
@@ -282,6 +297,12 @@ class Node(znflow.Node, znfields.Base):
                     seconds=run_time
                 )
                 instance.__dict__["state"]["lockfile"] = lockfile
+                if (lockfile_time := content.get("lockfile_time")) is not None:
+                    instance.__dict__["state"]["lockfile_time"] = datetime.timedelta(
+                        seconds=lockfile_time
+                    )
+                for key in ("input_hash", "output_hash", "usage"):
+                    instance.__dict__["state"][key] = content.get(key)
         if not instance.state.lazy_evaluation:
             for field in dataclasses.fields(cls):
                 _ = getattr(instance, field.name)
@@ -299,6 +320,9 @@ class Node(znflow.Node, znfields.Base):
             self.__dict__["state"] = NodeStatus().to_dict()
             self.__dict__["state"]["plugins"] = get_plugins_from_env(self)
 
+        if (fs := get_node_fs(self)) is not None:
+            # e.g. while loading a compressed field
+            return NodeStatus(**{**self.__dict__["state"], "fs": fs}, node=self)
         return NodeStatus(**self.__dict__["state"], node=self)
 
     @ty_ex.deprecated("loading is handled automatically via lazy evaluation")
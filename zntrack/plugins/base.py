@@ -5,14 +5,13 @@ import dataclasses
 import pathlib
 import typing as t
 
-import yaml
-
 from zntrack.config import (
     EXP_INFO_PATH,
     NOT_AVAILABLE,
     PLUGIN_EMPTY_RETRUN_VALUE,
     ZNTRACK_LAZY_VALUE,
 )
+from zntrack.utils import tracing
 
 if t.TYPE_CHECKING:
     from zntrack import Node
@@ -52,12 +51,16 @@ def _gitignore_file(path: str):
 
 
 def get_exp_info() -> dict:
+    import yaml
+
     if EXP_INFO_PATH.exists():
         return yaml.safe_load(EXP_INFO_PATH.read_text())
     return {}
 
 
 def set_exp_info(data: dict) -> None:
+    import yaml
+
     EXP_INFO_PATH.write_text(yaml.safe_dump(data))
     _gitignore_file(EXP_INFO_PATH.as_posix())
 
@@ -90,7 +93,10 @@ class ZnTrackPlugin(abc.ABC):
     def convert_to_params_yaml(self) -> t.Any: ...
 
     def __enter__(self):
-        self.setup()
+        with tracing.span(
+            "plugin.setup", node=self.node.name, plugin=type(self).__name__
+        ):
+            self.setup()
 
     def __exit__(self, exc_type, exc_value, traceback):
         self.close()
@@ -109,6 +115,24 @@ class ZnTrackPlugin(abc.ABC):
 def base_getter(
     self: "Node", name: str, func: t.Callable, suffix: t.Optional[str] = None
 ):
+    if not tracing.is_enabled():
+        return _load_field(self, name, func, suffix)
+    if tracing.is_current("field.get", node=self.name, field=name):
+        # ``_load_field`` reads the loaded value via ``getattr``
+        return _load_field(self, name, func, suffix)
+    value = self.__dict__.get(name, ZNTRACK_LAZY_VALUE)
+    loaded = value is not ZNTRACK_LAZY_VALUE and value is not NOT_AVAILABLE
+    with tracing.span(
+        "field.get",
+        node=self.name,
+        field=name,
+        getter=getattr(func, "__name__", repr(func)),
+        cache="hit" if loaded else "miss",
+    ):
+        return _load_field(self, name, func, suffix)
+
+
+def _load_field(self: "Node", name: str, func: t.Callable, suffix: t.Optional[str]):
     if (
         name in self.__dict__
         and self.__dict__[name] is not ZNTRACK_LAZY_VALUE
@@ -9,9 +9,11 @@ from zntrack import config, converter
 from zntrack.config import (
     FIELD_TYPE,
     PLUGIN_EMPTY_RETRUN_VALUE,
+    ZNTRACK_FIELD_COMPRESSION,
     ZNTRACK_FIELD_DUMP,
     ZNTRACK_FIELD_LOAD,
     ZNTRACK_FIELD_SUFFIX,
+    ZNTRACK_JSON_RESOURCES_KEY,
     FieldTypes,
 )
 
@@ -29,6 +31,8 @@ from zntrack.plugins.dvc_plugin.dvc import (
     plots_to_dvc,
 )
 from zntrack.plugins.dvc_plugin.params import deps_to_params
+from zntrack.resources import DEFAULT_RESOURCES, get_resources
+from zntrack.utils.compression import compress_file, decompressing
 from zntrack.utils.misc import (
     sort_and_deduplicate,
 )
@@ -41,12 +45,18 @@ class DVCPlugin(ZnTrackPlugin):
     def getter(self, field: dataclasses.Field) -> t.Any:
         getter = field.metadata.get(ZNTRACK_FIELD_LOAD)
         suffix = field.metadata.get(ZNTRACK_FIELD_SUFFIX)
-
-        if getter is not None:
-            if suffix is not None:
+        compression = field.metadata.get(ZNTRACK_FIELD_COMPRESSION)
+
+        if getter is None:
+            return PLUGIN_EMPTY_RETRUN_VALUE
+        if compression is not None:
+            # the getter opens the uncompressed file name through
+            # `node.state.fs`, which decompresses the data on the fly.
+            with decompressing(self.node, compression):
                 return getter(self.node, field.name, suffix=suffix)
-            return getter(self.node, field.name)
-        return PLUGIN_EMPTY_RETRUN_VALUE
+        if suffix is not None:
+            return getter(self.node, field.name, suffix=suffix)
+        return getter(self.node, field.name)
 
     def save(self, field: dataclasses.Field) -> None:
         dump_func = field.metadata.get(ZNTRACK_FIELD_DUMP)
@@ -57,6 +67,10 @@ class DVCPlugin(ZnTrackPlugin):
                 dump_func(self.node, field.name, suffix=suffix)
             else:
                 dump_func(self.node, field.name)
+            if compression := field.metadata.get(ZNTRACK_FIELD_COMPRESSION):
+                compress_file(
+                    (self.node.nwd / field.name).with_suffix(suffix), compression
+                )
 
     def convert_to_params_yaml(self) -> dict | object:
         data = {}
@@ -153,15 +167,10 @@ class DVCPlugin(ZnTrackPlugin):
             data,
             indent=4,
             cls=znjson.ZnEncoder.from_converters(
-                [
-                    converter.ConnectionConverter,
-                    converter.NodeConverter,
-                    converter.CombinedConnectionsConverter,
-                    znjson.converter.PathlibConverter,
-                    converter.DVCImportPathConverter,
-                    converter.DataclassConverter,
-                ],
-                add_default=False,
+                converter.ZNTRACK_JSON_CONVERTERS, add_default=False
             ),
         )
-        return json.loads(data)
+        data = json.loads(data)
+        if (resources := get_resources(self.node)) is not DEFAULT_RESOURCES:
+            data[ZNTRACK_JSON_RESOURCES_KEY] = resources.to_dict()
+        return data
@@ -8,11 +8,13 @@ from zntrack import converter
 from zntrack.config import (
     FIELD_TYPE,
     ZNTRACK_CACHE,
+    ZNTRACK_FIELD_COMPRESSION,
     ZNTRACK_FIELD_SUFFIX,
     ZNTRACK_OPTION_PLOTS_CONFIG,
     FieldTypes,
 )
 from zntrack.node import Node
+from zntrack.utils.compression import compressed_suffix
 from zntrack.utils.misc import (
     RunDVCImportPathHandler,
     get_attr_always_list,
@@ -69,7 +71,10 @@ def metrics_path_to_dvc(self, field) -> list[str] | list[dict]:
 
 def outs_to_dvc(self, field) -> list[str] | list[dict]:
     """Convert outs field to DVC outs format."""
-    suffix = field.metadata[ZNTRACK_FIELD_SUFFIX]
+    suffix = compressed_suffix(
+        field.metadata[ZNTRACK_FIELD_SUFFIX],
+        field.metadata.get(ZNTRACK_FIELD_COMPRESSION),
+    )
     content = [(self.node.nwd / field.name).with_suffix(suffix).as_posix()]
     if field.metadata.get(ZNTRACK_CACHE) is False:
         return [{c: {"cache": False}} for c in content]
@@ -78,7 +83,10 @@ def outs_to_dvc(self, field) -> list[str] | list[dict]:
 
 def metrics_to_dvc(self, field) -> list[str] | list[dict]:
     """Convert metrics field to DVC metrics format."""
-    suffix = field.metadata[ZNTRACK_FIELD_SUFFIX]
+    suffix = compressed_suffix(
+        field.metadata[ZNTRACK_FIELD_SUFFIX],
+        field.metadata.get(ZNTRACK_FIELD_COMPRESSION),
+    )
     content = [(self.node.nwd / field.name).with_suffix(suffix).as_posix()]
     if field.metadata.get(ZNTRACK_CACHE) is False:
         return [{c: {"cache": False}} for c in content]
@@ -155,13 +163,19 @@ def plots_to_dvc(self, field) -> tuple[list, list[dict]]:
     """Convert plots field to DVC outs and plots format."""
     outs_content = []
     plots_content = []
-    suffix = field.metadata[ZNTRACK_FIELD_SUFFIX]
+    suffix = compressed_suffix(
+        field.metadata[ZNTRACK_FIELD_SUFFIX],
+        field.metadata.get(ZNTRACK_FIELD_COMPRESSION),
+    )
     file_path = (self.node.nwd / field.name).with_suffix(suffix).as_posix()
     outs_content.append(file_path)
     if field.metadata.get(ZNTRACK_CACHE) is False:
         outs_content = [{c: {"cache": False}} for c in outs_content]
 
     plots_config = field.metadata.get(ZNTRACK_OPTION_PLOTS_CONFIG)
+    if field.metadata.get(ZNTRACK_FIELD_COMPRESSION) is not None:
+        # DVC can not render compressed plots
+        plots_config = None
     if plots_config:
         plots_config = plots_config.copy()
         if "x" not in plots_config or "y" not in plots_config:
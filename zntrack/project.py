@@ -6,15 +6,13 @@ import pathlib
 import subprocess
 import warnings
 
-import git
-import tqdm
-import yaml
 import znflow
 
 from zntrack import utils
 from zntrack.config import NWD_PATH
 from zntrack.group import Group
 from zntrack.state import PLUGIN_LIST
+from zntrack.utils import fusion, tracing
 from zntrack.utils.finalize import make_commit
 from zntrack.utils.import_handler import import_handler
 from zntrack.utils.misc import load_env_vars
@@ -40,11 +38,17 @@ class Project(znflow.DiGraph):
         immutable_nodes=True,
         deployment=None,
         tags: dict[str, str] | None = None,
+        deduplicate: bool = False,
         **kwargs,
     ):
         if deployment is None:
             deployment = ZnTrackDeployment()
         self.tags = tags or {}
+        self.deduplicate = deduplicate
+        # the names of the removed duplicate nodes and the nodes they alias
+        self.aliases: dict[str, str] = {}
+        # the uuids of the removed duplicate nodes and the nodes they alias
+        self._aliased: dict = {}
         load_env_vars()
         super().__init__(
             *args,
@@ -54,6 +58,8 @@ class Project(znflow.DiGraph):
             **kwargs,
         )
         self.node_name_counter: dict[str, int] = {}
+        # the uuids of the nodes created within 'Project.fused'
+        self.fused_nodes: list[list] = []
         # keep track of all nwd paths, they should be unique, until
         # https://github.com/zincware/ZnFlow/issues/132 can be used
         # to set nwd directly as pk
@@ -122,11 +128,60 @@ class Project(znflow.DiGraph):
                     )
         finally:
             super().__exit__(exc_type, exc_val, exc_tb)
+        if self.deduplicate and exc_type is None:
+            self._remove_duplicates()
+
+    def _remove_duplicates(self) -> None:
+        """Replace nodes identical to another node by an alias of that node.
+
+        The connections of the downstream nodes are redirected to the
+        remaining node and the removed node loads its outputs from the node
+        working directory of the remaining node.
+        """
+        from zntrack.utils.dedup import ReplaceConnectionInstance, get_fingerprint
+
+        fingerprints = {}
+        for node_uuid in self.get_sorted_nodes():
+            node = self.nodes[node_uuid]["value"]
+            if node._external_:
+                continue
+            if (fingerprint := get_fingerprint(node)) is None:
+                log.debug(f"Unable to fingerprint '{node.name}', it is not deduplicated.")
+                continue
+            if fingerprint not in fingerprints:
+                fingerprints[fingerprint] = node
+                continue
+            original = fingerprints[fingerprint]
+            for successor in [*self.successors(node_uuid)]:
+                updater = ReplaceConnectionInstance(node, original)
+                self._update_node_attributes(self.nodes[successor]["value"], updater)
+            for group in self.groups.values():
+                if node_uuid in group.uuids:
+                    group.uuids.remove(node_uuid)
+            self.remove_node(node_uuid)
+            self.aliases[node.name] = original.name
+            self._aliased[node_uuid] = original
+            node.__dict__["nwd"] = original.nwd
+
+    @tracing.traced("Project.build")
+    def build(self, fuse: bool = False) -> None:
+        """Write the 'params.yaml', 'dvc.yaml' and 'zntrack.json' files.
+
+        Parameters
+        ----------
+        fuse : bool
+            Fuse every linear chain of nodes into a single DVC stage, see
+            ``zntrack.utils.fusion``. The nodes created within
+            ``Project.fused`` are always fused.
+        """
+        import git
+        import tqdm
+        import yaml
 
-    def build(self) -> None:
         log.info(f"Saving {config.PARAMS_FILE_PATH}")
         params_dict = {}
         dvc_dict = {"stages": {}, "plots": []}
+        stages = {}
         zntrack_dict = {}
         try:
             repo = git.Repo()
@@ -163,7 +218,7 @@ class Project(znflow.DiGraph):
                 if (
                     value := plugin.convert_to_dvc_yaml()
                 ) is not config.PLUGIN_EMPTY_RETRUN_VALUE:
-                    dvc_dict["stages"][node.name] = value["stages"]
+                    stages[node_uuid] = value["stages"]
                     # TODO: this won't work if multiple
                     # plugins want to modify the dvc.yaml
                     if len(value["plots"]) > 0:
@@ -172,9 +227,27 @@ class Project(znflow.DiGraph):
                     value := plugin.convert_to_zntrack_json(graph=self)
                 ) is not config.PLUGIN_EMPTY_RETRUN_VALUE:
                     zntrack_dict[node.name] = value
+            node.__dict__["state"]["dvc_stage"] = node.name
+
+        for chain in self._get_fused_chains(fuse, stages):
+            names = [self.nodes[node_uuid]["value"].name for node_uuid in chain]
+            fused = fusion.fuse_stages([stages[node_uuid] for node_uuid in chain])
+            for node_uuid, name in zip(chain[:-1], names[:-1]):
+                self.nodes[node_uuid]["value"].__dict__["state"]["dvc_stage"] = names[-1]
+                del stages[node_uuid]
+                if name in zntrack_dict:
+                    zntrack_dict[name][config.ZNTRACK_JSON_STAGE_KEY] = names[-1]
+            stages[chain[-1]] = fused
+        for node_uuid, stage in stages.items():
+            dvc_dict["stages"][self.nodes[node_uuid]["value"].name] = stage
 
         if len(dvc_dict["plots"]) == 0:
             del dvc_dict["plots"]
+        if self.aliases:
+            log.info(
+                f"Removed {len(self.aliases)} duplicate node(s): "
+                + ", ".join(f"{name} -> {other}" for name, other in self.aliases.items())
+            )
 
         config.PARAMS_FILE_PATH.write_text(yaml.safe_dump(params_dict))
         config.DVC_FILE_PATH.write_text(yaml.safe_dump(dvc_dict))
@@ -182,13 +255,149 @@ class Project(znflow.DiGraph):
 
         # TODO: update file or overwrite?
 
-    def repro(self, build: bool = True, force: bool = False):
+    def _get_fused_chains(self, fuse: bool, stages: dict) -> list[list]:
+        """Get the nodes to fuse, in the order they run."""
+        order = self.get_sorted_nodes()
+        chains = []
+        for uuids in self.fused_nodes:
+            chain = [x for x in order if x in uuids and x in stages]
+            if len(chain) > 1:
+                fusion.check_fusable(self, chain)
+                chains.append(chain)
+        if fuse:
+            fused = {node_uuid for chain in chains for node_uuid in chain}
+            candidates = [
+                node_uuid
+                for node_uuid in stages
+                if node_uuid not in fused
+                and not self.nodes[node_uuid]["value"].always_changed
+            ]
+            chains.extend(fusion.find_chains(self, candidates))
+        return chains
+
+    @contextlib.contextmanager
+    def fused(self):
+        """Run all nodes created within this context in a single DVC stage.
+
+        Examples
+        --------
+        >>> with project.fused():
+        ...     a = Preprocess(data=data)
+        ...     b = Normalize(data=a.data)
+        """
+        existing_nodes = set(self.nodes)
+        try:
+            if znflow.get_graph() is znflow.empty_graph:
+                with self:
+                    yield
+            else:
+                yield
+        finally:
+            self.fused_nodes.append([x for x in self.nodes if x not in existing_nodes])
+
+    def _get_targets(self, nodes: list) -> list:
+        """Get the nodes, expanding groups, and check they are part of the graph.
+
+        Duplicate nodes removed via ``deduplicate`` are replaced by the node
+        they alias.
+        """
+        from zntrack import Node
+
+        if not isinstance(nodes, (list, tuple)):
+            raise TypeError(f"'nodes' must be a list of nodes or groups, not {nodes}.")
+        targets = []
+        for entry in nodes:
+            if isinstance(entry, Group):
+                candidates = entry.nodes
+            elif isinstance(entry, Node) and entry.uuid in self._aliased:
+                candidates = [self._aliased[entry.uuid]]
+            elif isinstance(entry, Node) and entry.uuid in self.nodes:
+                candidates = [entry]
+            else:
+                raise ValueError(f"'{entry}' is not a node or group of this project.")
+            for node in candidates:
+                if node.uuid not in {x.uuid for x in targets}:
+                    targets.append(node)
+        return targets
+
+    def get_upstream_nodes(self, nodes: list) -> list:
+        """Get the given nodes and all nodes they depend on.
+
+        Parameters
+        ----------
+        nodes : list[Node | Group]
+            The nodes or groups of nodes.
+
+        Returns
+        -------
+        list[Node]
+            The nodes in the order they have to be run.
+        """
+        import networkx as nx
+
+        selected = set()
+        for node in self._get_targets(nodes):
+            selected |= {node.uuid, *nx.ancestors(self, node.uuid)}
+        return [
+            self.nodes[node_uuid]["value"]
+            for node_uuid in self.get_sorted_nodes()
+            if node_uuid in selected
+        ]
+
+    def run(self, nodes: list | None = None, force: bool = False):
+        """Run the graph in the current Python process.
+
+        Nodes whose inputs did not change since their last run are skipped
+        and their outputs are loaded lazily from the node working directory.
+
+        Parameters
+        ----------
+        nodes : list[Node | Group], optional
+            The nodes to run, including the nodes they depend on.
+            If None, all nodes are run.
+        force : bool
+            Run all nodes, even if their inputs did not change.
+        """
+        if nodes is not None:
+            nodes = self.get_upstream_nodes(nodes)
+        if isinstance(self.deployment, ZnTrackDeployment):
+            self.deployment.run(nodes, force=force)
+        elif force:
+            raise ValueError(f"'force' is not supported by {self.deployment}.")
+        else:
+            self.deployment.run(nodes)
+
+    def repro(self, build: bool = True, force: bool = False, nodes: list | None = None):
+        """Build the graph and run it via 'dvc repro'.
+
+        Parameters
+        ----------
+        build : bool
+            Write the 'dvc.yaml', 'params.yaml' and 'zntrack.json' files first.
+        force : bool
+            Reproduce the stages, even if they did not change.
+        nodes : list[Node | Group], optional
+            The nodes to reproduce, including the nodes they depend on.
+            They are passed as targets to 'dvc repro'. If None, all nodes
+            are reproduced.
+        """
+        if nodes is not None:
+            nodes = [x for x in self._get_targets(nodes) if not x._external_]
         if build:
             self.build()
+        targets = []
+        # 'dvc repro' reproduces the upstream stages of the targets and
+        # fused nodes are reproduced by the stage of their chain
+        for node in nodes or []:
+            if (stage_name := node.state.stage_name) not in targets:
+                targets.append(stage_name)
+        if nodes is not None and not targets:
+            log.info("No stages to reproduce.")
+            return
         cmd = ["dvc", "repro"]
         if force:
             cmd.append("--force")
-        subprocess.check_call(cmd)
+        subprocess.check_call(cmd + targets)
 
     def finalize(
         self,
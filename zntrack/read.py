@@ -0,0 +1,199 @@
+"""Read the metrics and parameters of a node without loading the node.
+
+The file paths are resolved from the ``dvc.yaml``, ``zntrack.json`` and
+``params.yaml`` files, so neither the module defining the node is imported
+nor the node is instantiated.
+"""
+
+import json
+import pathlib
+import typing as t
+
+from zntrack.config import (
+    DVC_FILE_PATH,
+    PARAMS_FILE_PATH,
+    ZNTRACK_FILE_PATH,
+    ZNTRACK_JSON_RESOURCES_KEY,
+    ZNTRACK_JSON_STAGE_KEY,
+)
+from zntrack.utils import fusion
+
+if t.TYPE_CHECKING:
+    import dvc.api
+
+
+class _NodeFiles(t.NamedTuple):
+    path: pathlib.PurePosixPath  # the directory of the dvc.yaml file
+    name: str
+    stage: dict
+    entry: dict  # the zntrack.json entry of the node
+    fused: bool  # the stage runs multiple nodes, see ``zntrack.utils.fusion``
+
+
+def _load(fs: "dvc.api.DVCFileSystem", path: pathlib.PurePosixPath) -> t.Any:
+    import yaml
+
+    text = fs.read_text(path.as_posix())
+    if path.suffix == ".json":
+        return json.loads(text)
+    if path.suffix in (".yaml", ".yml"):
+        return yaml.safe_load(text)
+    return text
+
+
+def _get_files(
+    name: str,
+    remote: str | None,
+    rev: str | None,
+    fs: "dvc.api.DVCFileSystem | None",
+) -> tuple["dvc.api.DVCFileSystem", _NodeFiles]:
+    import dvc.api
+
+    if fs is None:
+        fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
+    elif remote is not None or rev is not None:
+        raise ValueError("If 'fs' is provided, 'remote' and 'rev' should be None.")
+
+    *dvc_file, node_name = name.rsplit(":", 1)
+    path = pathlib.PurePosixPath(*dvc_file).parent
+    dvc_file = path / DVC_FILE_PATH.name
+    try:
+        stages = (_load(fs, dvc_file) or {}).get("stages", {})
+    except FileNotFoundError as err:
+        raise ValueError(f"Stage {name} not found in {dvc_file}") from err
+    try:
+        entry = _load(fs, path / ZNTRACK_FILE_PATH.name).get(node_name, {})
+    except FileNotFoundError:
+        entry = {}
+    # the node might be part of a fused stage
+    fused_stage = entry.get(ZNTRACK_JSON_STAGE_KEY)
+    if not isinstance(fused_stage, str):
+        fused_stage = None
+    stage = stages.get(node_name, stages.get(fused_stage))
+    if stage is None:
+        raise ValueError(f"Stage {name} not found in {dvc_file}")
+    fused = fusion.is_fused_cmd(stage.get("cmd", ""))
+    return fs, _NodeFiles(path, node_name, stage, entry, fused)
+
+
+def _field_paths(entry: dict) -> dict[str, str]:
+    """Map the paths of the ``*_path`` fields of a ``zntrack.json`` entry to them."""
+    from zntrack.utils.node_wd import nwd as nwd_placeholder
+
+    nwd = entry.get("nwd", {}).get("value", "")
+    paths = {}
+
+    def _collect(field: str, value: t.Any) -> None:
+        if isinstance(value, list):
+            for item in value:
+                _collect(field, item)
+        elif isinstance(value, dict) and value.get("_type") == "pathlib.Path":
+            _collect(field, value["value"])
+        elif isinstance(value, str):
+            path = pathlib.PurePosixPath(value.replace(nwd_placeholder, nwd))
+            paths[path.as_posix()] = field
+
+    for field, value in entry.items():
+        if field not in ("nwd", ZNTRACK_JSON_STAGE_KEY, ZNTRACK_JSON_RESOURCES_KEY):
+            _collect(field, value)
+    return paths
+
+
+def read_metrics(
+    name: str,
+    remote: str | None = None,
+    rev: str | None = None,
+    fs: "dvc.api.DVCFileSystem | None" = None,
+) -> dict[str, t.Any]:
+    """Read the metrics of a node.
+
+    Arguments
+    ---------
+    name : str
+        The name of the node, e.g. 'Node' or 'path/to/dvc.yaml:Node'.
+    remote : str, optional
+        The repository, e.g. a path or a git URL. Defaults to the workspace.
+    rev : str, optional
+        The revision, e.g. a commit hash, branch or tag.
+    fs : dvc.api.DVCFileSystem, optional
+        Reuse a file system instead of ``remote`` and ``rev``, e.g. to read
+        many nodes of the same revision.
+
+    Returns
+    -------
+    dict[str, Any]
+        The content of the ``zntrack.metrics`` and ``zntrack.metrics_path``
+        fields by field name. Metrics of the stage which can not be mapped
+        to a field are stored by their path. The ``node-meta.json`` is
+        not included.
+
+    Examples
+    --------
+    >>> zntrack.read_metrics("Node", rev="HEAD~1")
+    {'metrics': {'accuracy': 0.9}}
+    """
+    fs, node = _get_files(name, remote, rev, fs)
+    nwd = node.entry.get("nwd", {}).get("value")
+    fields = _field_paths(node.entry)
+
+    metrics = {}
+    for entry in node.stage.get("metrics", []):
+        if isinstance(entry, dict):
+            entry = next(iter(entry))
+        path = pathlib.PurePosixPath(entry)
+        if path.name == "node-meta.json":
+            continue
+        if path.as_posix() in fields:
+            key = fields[path.as_posix()]
+        elif path.parent.as_posix() == nwd and path.suffix == ".json":
+            key = path.stem  # zntrack.metrics
+        elif node.fused:
+            continue  # the metrics of another node of the fused stage
+        else:
+            key = path.as_posix()
+        metrics[key] = _load(fs, node.path / path)
+    return metrics
+
+
+def read_params(
+    name: str,
+    remote: str | None = None,
+    rev: str | None = None,
+    fs: "dvc.api.DVCFileSystem | None" = None,
+) -> dict[str, t.Any]:
+    """Read the parameters of a node.
+
+    See ``read_metrics`` for the arguments.
+
+    Returns
+    -------
+    dict[str, Any]
+        The values of the ``zntrack.params`` fields and the content of the
+        ``zntrack.params_path`` fields by field name.
+
+    Examples
+    --------
+    >>> zntrack.read_params("Node", rev="HEAD~1")
+    {'learning_rate': 0.01, 'config': {'layers': 3}}
+    """
+    fs, node = _get_files(name, remote, rev, fs)
+    fields = _field_paths(node.entry)
+    try:
+        params = dict(_load(fs, node.path / PARAMS_FILE_PATH.name).get(node.name) or {})
+    except FileNotFoundError:
+        params = {}
+    for entry in node.stage.get("params", []):
+        if not isinstance(entry, dict):
+            continue
+        for path in entry:
+            if path == PARAMS_FILE_PATH.as_posix():
+                continue
+            path = pathlib.PurePosixPath(path)
+            if path.as_posix() in fields:
+                key = fields[path.as_posix()]
+            elif node.fused:
+                continue  # the parameters of another node of the fused stage
+            else:
+                key = path.as_posix()
+            params[key] = _load(fs, node.path / path)
+    return params
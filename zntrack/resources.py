@@ -0,0 +1,131 @@
+"""Resource requirements of nodes for parallel deployments.
+
+Declare the requirements as a class attribute of the node:
+
+>>> import zntrack
+>>> class Train(zntrack.Node):
+...     resources = zntrack.Resources(cpus=32, memory="64G", gpus=1)
+...
+...     def run(self): ...
+
+The requirements are recorded in ``zntrack.json`` under the
+``zntrack.config.ZNTRACK_JSON_RESOURCES_KEY`` and used by the
+``ExecutorDeployment`` to pack ready nodes against a ``budget``.
+"""
+
+import dataclasses
+import os
+import re
+import typing as t
+
+if t.TYPE_CHECKING:
+    from zntrack import Node
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+_SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)(?:i?B)?\s*$", re.IGNORECASE)
+
+
+def parse_size(value: int | str) -> int:
+    """Convert a size like '512M' or '4GiB' to bytes."""
+    if isinstance(value, int):
+        return value
+    match = _SIZE_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f"Invalid size '{value}', use e.g. 1024, '512M' or '4GB'.")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.upper()])
+
+
+@dataclasses.dataclass(frozen=True)
+class Resources:
+    """Resources a node requires while running.
+
+    Attributes
+    ----------
+    cpus : float
+        Number of CPU cores.
+    memory : int | str, optional
+        Memory in bytes or as a string like '4GB'. Stored in bytes.
+    gpus : int
+        Number of GPUs.
+    exclusive : bool
+        Do not run any other node at the same time.
+    """
+
+    cpus: float = 1
+    memory: int | str | None = None
+    gpus: int = 0
+    exclusive: bool = False
+
+    def __post_init__(self):
+        if self.memory is not None:
+            object.__setattr__(self, "memory", parse_size(self.memory))
+        if self.cpus < 0 or self.gpus < 0 or (self.memory or 0) < 0:
+            raise ValueError(f"Resources must not be negative: {self}")
+
+    @classmethod
+    def from_machine(cls) -> "Resources":
+        """The CPUs, memory and visible GPUs available to the current process."""
+        try:
+            cpus = len(os.sched_getaffinity(0))
+        except AttributeError:
+            cpus = os.cpu_count() or 1
+        try:
+            memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+        except (AttributeError, ValueError, OSError):
+            memory = None
+        devices = os.environ.get("CUDA_VISIBLE_DEVICES", "").split(",")
+        gpus = len([device for device in devices if device.strip()])
+        return cls(cpus=cpus, memory=memory, gpus=gpus)
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+DEFAULT_RESOURCES = Resources()
+
+
+def get_resources(node: "Node | type[Node]") -> Resources:
+    """Get the resources declared on the class of a node."""
+    cls = node if isinstance(node, type) else type(node)
+    resources = getattr(cls, "resources", None)
+    if isinstance(resources, Resources):
+        return resources
+    return DEFAULT_RESOURCES
+
+
+class ResourcePool:
+    """Keep track of the resources used by running nodes.
+
+    Parameters
+    ----------
+    budget : Resources
+        The resources available in total. A memory of None is unlimited.
+    """
+
+    def __init__(self, budget: Resources):
+        self.budget = budget
+        self.running: list[Resources] = []
+
+    def fits(self, resources: Resources) -> bool:
+        """Whether a node with the given resources can be started now."""
+        if not self.running:
+            # a node larger than the budget runs on its own
+            return True
+        if resources.exclusive or any(x.exclusive for x in self.running):
+            return False
+        cpus = sum(x.cpus for x in self.running) + resources.cpus
+        gpus = sum(x.gpus for x in self.running) + resources.gpus
+        if cpus > self.budget.cpus or gpus > self.budget.gpus:
+            return False
+        if self.budget.memory is not None:
+            memory = sum(x.memory or 0 for x in self.running) + (resources.memory or 0)
+            if memory > self.budget.memory:
+                return False
+        return True
+
+    def acquire(self, resources: Resources) -> None:
+        self.running.append(resources)
+
+    def release(self, resources: Resources) -> None:
+        self.running.remove(resources)
@@ -8,25 +8,29 @@ import tempfile
 import typing as t
 import warnings
 
-import dvc.api
-import dvc.repo
-import dvc.stage.serialize
-from dvc.utils import dict_sha256
-from fsspec.implementations.local import LocalFileSystem
-from fsspec.spec import AbstractFileSystem
-
 from zntrack.config import NodeStatusEnum
 from zntrack.group import Group
 from zntrack.plugins import ZnTrackPlugin
+from zntrack.utils import tracing
 from zntrack.utils.node_wd import get_nwd
 
 if t.TYPE_CHECKING:
+    import dvc.api
+    import dvc.stage
+    from fsspec.spec import AbstractFileSystem
+
     from zntrack import Node
 
 PLUGIN_LIST = list[t.Type[ZnTrackPlugin]]
 PLUGIN_DICT = dict[str, ZnTrackPlugin]
 
 
+def _local_filesystem() -> "AbstractFileSystem":
+    from fsspec.implementations.local import LocalFileSystem
+
+    return LocalFileSystem()
+
+
 @dataclasses.dataclass(frozen=True)
 class NodeStatus:
     """Node status object.
@@ -63,6 +67,22 @@ class NodeStatus:
         Whether the Node was restarted and has been run at least once before.
     path: str
         The path to the directory where the ``zntrack.json`` file is located.
+    lockfile : dict, optional
+        The lock of the inputs of the Node, captured by ``zntrack run``.
+    lockfile_time : datetime.timedelta, optional
+        The time it took to compute the ``lockfile``.
+    input_hash : str, optional
+        Hash of the inputs of the last run via ``Project.run``.
+    output_hash : str, optional
+        Hash of the outputs of the last run via ``Project.run``.
+    usage : dict, optional
+        The resources used by the last run, i.e. the CPU time ('cpu_user',
+        'cpu_system'), the 'peak_rss' memory (or 'peak_rss_process' where it
+        can not be measured per node, None if other nodes ran at the same
+        time), the 'read_bytes' and 'write_bytes' and the wall time of the
+        'run' and 'save' phases. See ``zntrack.utils.usage``.
+    dvc_stage : str, optional
+        The name of the DVC stage running the Node, see ``stage_name``.
     """
 
     remote: str | None = None
@@ -81,8 +101,13 @@ class NodeStatus:
     run_time: datetime.timedelta | None = None
     path: pathlib.Path = dataclasses.field(default_factory=pathlib.Path)
     lockfile: dict | None = None
-    fs: AbstractFileSystem | None = dataclasses.field(
-        default_factory=LocalFileSystem, repr=False, compare=False, hash=False
+    lockfile_time: datetime.timedelta | None = None
+    input_hash: str | None = None
+    output_hash: str | None = None
+    usage: dict | None = None
+    dvc_stage: str | None = None
+    fs: "AbstractFileSystem | None" = dataclasses.field(
+        default_factory=_local_filesystem, repr=False, compare=False, hash=False
     )
     # TODO: move node name and nwd to here as well
 
@@ -97,8 +122,26 @@ class NodeStatus:
         return self.path / get_nwd(self.node)
 
     @property
-    def dvc_fs(self) -> dvc.api.DVCFileSystem:
+    def stage_name(self) -> str:
+        """The name of the DVC stage running the Node.
+
+        Nodes fused into a single stage are run by the stage of the last
+        node, see ``zntrack.utils.fusion``. Resolved from the ``zntrack.json``
+        once and stored in ``dvc_stage``.
+        """
+        from zntrack.from_rev import _get_fused_stage
+
+        if self.dvc_stage is None:
+            stage = _get_fused_stage(self.fs, self.name) or self.name
+            self.node.__dict__["state"]["dvc_stage"] = stage
+            return stage
+        return self.dvc_stage
+
+    @property
+    def dvc_fs(self) -> "dvc.api.DVCFileSystem":
         """Get the file system of the Node."""
+        import dvc.api
+
         return dvc.api.DVCFileSystem(
             url=self.remote,
             rev=self.rev,
@@ -171,9 +214,9 @@ class NodeStatus:
             finally:
                 self.node.__dict__["state"].pop("tmp_path")
 
-    def get_stage(self) -> dvc.stage.Stage:
+    def get_stage(self) -> "dvc.stage.Stage":
         """Access to the internal dvc.repo api."""
-        stage = next(iter(self.dvc_fs.repo.stage.collect(self.name)))
+        stage = next(iter(self.dvc_fs.repo.stage.collect(self.stage_name)))
         if self.rev is None and self.remote is None:
             # If we want to look at the current workspace result, we need to
             # load all the information, not just dvc.yaml
@@ -182,20 +225,22 @@ class NodeStatus:
 
     def get_stage_lock(self) -> dict:
         """Access to the internal dvc.repo api."""
+        from dvc.stage.serialize import to_single_stage_lockfile
+
         stage = self.get_stage()
-        return dvc.stage.serialize.to_single_stage_lockfile(stage)
+        return to_single_stage_lockfile(stage)
 
     def get_stage_hash(self, include_outs: bool = False) -> str:
-        """Get the hash of the stage."""
-        stage_lock = self.get_stage_lock()
+        """Get the hash of the stage.
 
-        if include_outs:
-            return dict_sha256(stage_lock)
-        else:
-            filtered_lock = {
-                k: v for k, v in stage_lock.items() if k in ["cmd", "deps", "params"]
-            }
-            return dict_sha256(filtered_lock)
+        In the workspace, the hash is memoized until the stage or its files
+        change, see ``zntrack.utils.stage_hash``.
+        """
+        from zntrack.utils import stage_hash
+
+        if self.rev is None and self.remote is None:
+            return stage_hash.get_stage_hash(self.stage_name, include_outs)
+        return stage_hash.hash_lock(self.get_stage_lock(), include_outs)
 
     def to_dict(self) -> dict:
         """Convert the NodeStatus to a dictionary."""
@@ -221,9 +266,17 @@ class NodeStatus:
     def increment_run_count(self) -> None:
         self.node.__dict__["state"]["run_count"] = self.run_count + 1
 
-    def set_lockfile(self, lockfile: dict) -> None:
+    def set_lockfile(
+        self, lockfile: dict, lockfile_time: datetime.timedelta | None = None
+    ) -> None:
         """Set the lockfile for the node."""
         self.node.__dict__["state"]["lockfile"] = lockfile
+        if lockfile_time is not None:
+            self.node.__dict__["state"]["lockfile_time"] = lockfile_time
+
+    def set_usage(self, usage: dict) -> None:
+        """Set the resources used by the last run."""
+        self.node.__dict__["state"]["usage"] = usage
 
     def save_node_meta(self) -> None:
         node_meta_content = {
@@ -236,15 +289,28 @@ class NodeStatus:
             node_meta_content["run_time"] = self.run_time.total_seconds()
         if self.lockfile is not None:
             node_meta_content["lockfile"] = self.lockfile
+        if self.lockfile_time is not None:
+            node_meta_content["lockfile_time"] = self.lockfile_time.total_seconds()
+        if self.input_hash is not None:
+            node_meta_content["input_hash"] = self.input_hash
+        if self.output_hash is not None:
+            node_meta_content["output_hash"] = self.output_hash
+        if self.usage is not None:
+            node_meta_content["usage"] = self.usage
 
         with contextlib.suppress(importlib.metadata.PackageNotFoundError):
             module = self.node.__module__.split(".")[0]
             node_meta_content["package_version"] = importlib.metadata.version(module)
-        self.nwd.mkdir(parents=True, exist_ok=True)
-        (self.nwd / "node-meta.json").write_text(json.dumps(node_meta_content, indent=2))
+        content = json.dumps(node_meta_content, indent=2)
+        with tracing.span(
+            "NodeStatus.save_node_meta", node=self.name, bytes=len(content)
+        ):
+            self.nwd.mkdir(parents=True, exist_ok=True)
+            (self.nwd / "node-meta.json").write_text(content)
 
     @property
     def changed(self) -> bool:
-        stage = self.get_stage()
-        with stage.repo.lock:
-            return stage.changed()
+        """Whether the node changed since its last run, see ``zntrack.changed``."""
+        from zntrack.changed import changed
+
+        return changed(self.node)[self.name]
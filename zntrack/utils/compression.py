@@ -0,0 +1,179 @@
+"""Transparent compression for file based node fields."""
+
+import contextlib
+import contextvars
+import importlib
+import io
+import pathlib
+import shutil
+import typing as t
+
+# The codec is encoded in the file suffix, e.g. ``outs.json.gz``.
+# Readers that are not aware of the compression will never
+# parse the compressed bytes as plain JSON / CSV.
+COMPRESSION_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+    "lz4": ".lz4",
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+# the file systems replacing ``node.state.fs`` by the id of the node, only
+# visible in the current thread / context, see ``decompressing``
+_NODE_FS: contextvars.ContextVar[dict[int, t.Any]] = contextvars.ContextVar(
+    "zntrack_node_fs", default={}
+)
+
+
+def compressed_suffix(suffix: str, compression: str | None) -> str:
+    """Get the on-disk suffix for a field with the given compression."""
+    if compression is None:
+        return suffix
+    return suffix + COMPRESSION_SUFFIXES[compression]
+
+
+def validate_compression(compression: str | None, suffix: str | None) -> None:
+    """Check that the compression can be used for a field."""
+    if compression is None:
+        return
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(
+            f"Unsupported compression '{compression}'."
+            f" Use one of {list(COMPRESSION_SUFFIXES)}."
+        )
+    if suffix is None:
+        raise ValueError(
+            "Compression is only supported for fields that are saved to a single file."
+        )
+
+
+def _import_codec(compression: str):
+    try:
+        if compression == "gzip":
+            return importlib.import_module("gzip")
+        if compression == "zstd":
+            try:
+                # Python >= 3.14
+                return importlib.import_module("compression.zstd")
+            except ModuleNotFoundError:
+                return importlib.import_module("zstandard")
+        if compression == "lz4":
+            return importlib.import_module("lz4.frame")
+    except ModuleNotFoundError as err:
+        package = {"zstd": "zstandard", "lz4": "lz4"}[compression]
+        raise ModuleNotFoundError(
+            f"Reading or writing '{compression}' compressed fields requires the"
+            f" '{package}' package. Install it via 'pip install {package}'."
+        ) from err
+    raise ValueError(f"Unsupported compression '{compression}'.")
+
+
+class _CompressedStream:
+    """File-like object that closes the underlying source together with the stream."""
+
+    def __init__(self, stream, source, mode: str) -> None:
+        self._stream = stream
+        self._source = source
+        # e.g. `gzip.GzipFile.mode` is an integer, which confuses pandas
+        self.mode = mode
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self._stream, name)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            self._source.close()
+
+
+def _wrap(source: t.BinaryIO, compression: str, mode: str):
+    codec = _import_codec(compression)
+    if compression == "gzip":
+        stream = codec.GzipFile(fileobj=source, mode=mode)
+    elif compression == "lz4":
+        stream = codec.LZ4FrameFile(source, mode=mode)
+    elif codec.__name__ == "zstandard":
+        if mode == "rb":
+            stream = codec.ZstdDecompressor().stream_reader(source, closefd=False)
+        else:
+            stream = codec.ZstdCompressor().stream_writer(source, closefd=False)
+    else:
+        stream = codec.ZstdFile(source, mode=mode)
+    return _CompressedStream(stream, source, mode)
+
+
+def open_decompressed(fs, path: str | pathlib.Path, compression: str, mode: str = "rb"):
+    """Open a compressed file through ``fs`` and stream the decompressed content."""
+    stream = _wrap(fs.open(path, mode="rb"), compression, mode="rb")
+    if "b" not in mode:
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return stream
+
+
+def compress_file(path: pathlib.Path, compression: str) -> pathlib.Path:
+    """Compress ``path`` next to the original file and remove the original.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the compressed file.
+    """
+    target = path.with_name(path.name + COMPRESSION_SUFFIXES[compression])
+    with open(path, "rb") as src, _wrap(open(target, "wb"), compression, "wb") as dst:
+        shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+    path.unlink()
+    return target
+
+
+class DecompressingFileSystem:
+    """Filesystem proxy that transparently decompresses files on ``open``.
+
+    Used while loading a compressed field, so that custom ``load_fn``
+    can open the uncompressed file name via ``node.state.fs``.
+    """
+
+    def __init__(self, fs, compression: str) -> None:
+        self._fs = fs
+        self._compression = compression
+
+    def open(self, path, mode: str = "rb", **kwargs):
+        if "r" not in mode:
+            return self._fs.open(path, mode=mode, **kwargs)
+        path = str(path) + COMPRESSION_SUFFIXES[self._compression]
+        return open_decompressed(self._fs, path, self._compression, mode=mode)
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self._fs, name)
+
+
+def get_node_fs(node) -> t.Any | None:
+    """Get the file system replacing ``node.state.fs`` in this context, if any."""
+    if overrides := _NODE_FS.get():
+        return overrides.get(id(node))
+    return None
+
+
+@contextlib.contextmanager
+def decompressing(node, compression: str) -> t.Iterator[None]:
+    """Read the files of a node through a ``DecompressingFileSystem``.
+
+    Only ``node.state.fs`` accessed in the current thread / context is
+    replaced, the state of the node is not modified.
+    """
+    fs = DecompressingFileSystem(node.state.fs, compression)
+    token = _NODE_FS.set({**_NODE_FS.get(), id(node): fs})
+    try:
+        yield
+    finally:
+        _NODE_FS.reset(token)
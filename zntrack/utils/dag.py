@@ -0,0 +1,141 @@
+"""Dependency graph of the stages defined in a ``dvc.yaml`` file.
+
+The graph is derived from the ``deps`` and ``outs`` / ``metrics`` / ``plots``
+entries of the stages, without instantiating a ``dvc.repo.Repo``.
+"""
+
+import json
+import pathlib
+import typing as t
+
+from zntrack.config import DVC_FILE_PATH, PARAMS_FILE_PATH, ZNTRACK_FILE_PATH
+
+STAGE_GRAPH = dict[str, set[str]]
+
+
+def load_stages(path: pathlib.Path = DVC_FILE_PATH) -> dict[str, dict]:
+    """Load the stages from a ``dvc.yaml`` file."""
+    import yaml
+
+    if not path.exists():
+        raise FileNotFoundError(
+            f"{path} not found. Make sure you're in the project root directory."
+        )
+    content = yaml.safe_load(path.read_text()) or {}
+    return content.get("stages", {})
+
+
+def load_nwds(path: pathlib.Path = ZNTRACK_FILE_PATH) -> dict[str, pathlib.Path]:
+    """Load the node working directories from a ``zntrack.json`` file."""
+    if not path.exists():
+        return {}
+    content = json.loads(path.read_text())
+    return {
+        name: pathlib.Path(value["nwd"]["value"])
+        for name, value in content.items()
+        if "nwd" in value
+    }
+
+
+def _paths(entries: list[str | dict]) -> t.Iterator[str]:
+    for entry in entries:
+        if isinstance(entry, dict):
+            yield from (pathlib.PurePosixPath(x).as_posix() for x in entry)
+        else:
+            yield pathlib.PurePosixPath(entry).as_posix()
+
+
+def stage_outputs(stage: dict) -> list[str]:
+    """All paths written by a stage."""
+    paths = []
+    for key in ("outs", "metrics", "plots"):
+        paths.extend(_paths(stage.get(key, [])))
+    return paths
+
+
+def stage_dependencies(stage: dict) -> list[str]:
+    """All file dependencies of a stage."""
+    return list(_paths(stage.get("deps", [])))
+
+
+def stage_params(stage: dict) -> dict[str, list[str]]:
+    """The parameter keys of a stage by file, no keys if the whole file is tracked."""
+    params: dict[str, list[str]] = {}
+    wholly_tracked = set()
+    for entry in stage.get("params", []):
+        if isinstance(entry, str):
+            entry = {PARAMS_FILE_PATH.as_posix(): [entry]}
+        for path, keys in entry.items():
+            params.setdefault(path, []).extend(keys or [])
+            if not keys:
+                wholly_tracked.add(path)
+    return {path: [] if path in wholly_tracked else keys for path, keys in params.items()}
+
+
+def get_stage_graph(stages: dict[str, dict]) -> STAGE_GRAPH:
+    """Map every stage to the set of stages it depends on."""
+    producers: dict[str, str] = {}
+    # directories containing outputs, for dependencies on a directory
+    nested_producers: dict[str, set[str]] = {}
+    for name, stage in stages.items():
+        for path in stage_outputs(stage):
+            producers[path] = name
+            for parent in pathlib.PurePosixPath(path).parents:
+                nested_producers.setdefault(parent.as_posix(), set()).add(name)
+
+    graph = {}
+    for name, stage in stages.items():
+        upstream = set()
+        for dep in stage_dependencies(stage):
+            dep_path = pathlib.PurePosixPath(dep)
+            for candidate in [dep_path, *dep_path.parents]:
+                if (producer := producers.get(candidate.as_posix())) is not None:
+                    upstream.add(producer)
+            upstream |= nested_producers.get(dep, set())
+        upstream.discard(name)
+        graph[name] = upstream
+    return graph
+
+
+def upstream_closure(graph: STAGE_GRAPH, targets: t.Iterable[str]) -> set[str]:
+    """Get the targets and all the stages they depend on."""
+    result = set()
+    todo = list(targets)
+    while todo:
+        name = todo.pop()
+        if name in result:
+            continue
+        result.add(name)
+        todo.extend(graph[name])
+    return result
+
+
+def topological_sort(graph: STAGE_GRAPH, names: t.Iterable[str]) -> list[str]:
+    """Sort the given stages so that every stage comes after its dependencies.
+
+    Dependencies that are not part of ``names`` are ignored.
+    """
+    names = list(dict.fromkeys(names))
+    selected = set(names)
+    result = []
+    visited = set()
+
+    for root in names:
+        if root in visited:
+            continue
+        # iterative post-order DFS to support deep graphs
+        stack = [(root, iter(sorted(graph.get(root, set()) & selected)))]
+        visited.add(root)
+        while stack:
+            name, children = stack[-1]
+            for child in children:
+                if child not in visited:
+                    visited.add(child)
+                    stack.append(
+                        (child, iter(sorted(graph.get(child, set()) & selected)))
+                    )
+                    break
+            else:
+                stack.pop()
+                result.append(name)
+    return result
@@ -0,0 +1,94 @@
+"""Find nodes that compute the same result.
+
+Two nodes are identical if they are instances of the same class, with the
+same parameters and the same connections to upstream nodes. The name of the
+node is not part of the fingerprint.
+"""
+
+import dataclasses
+import hashlib
+import json
+import pathlib
+import typing as t
+
+import znflow
+from znflow.utils import IterableHandler
+
+from zntrack.config import FIELD_TYPE, FieldTypes
+
+if t.TYPE_CHECKING:
+    from zntrack import Node
+
+# fields which are written by the node and therefore not part of the fingerprint
+_OUTPUT_FIELD_TYPES = (FieldTypes.OUTS, FieldTypes.PLOTS, FieldTypes.METRICS)
+
+
+def _default(value):
+    from zntrack import Node
+
+    if isinstance(value, Node):
+        # by identity, the fields of a node might be loaded lazily from disk
+        return str(value.uuid)
+    if isinstance(value, znflow.Connection):
+        instance = value.instance
+        if not isinstance(instance, znflow.Connection):
+            instance = str(instance.uuid)
+        return {"instance": instance, "attribute": value.attribute, "item": value.item}
+    if isinstance(value, znflow.CombinedConnections):
+        return {"connections": value.connections, "item": value.item}
+    if isinstance(value, slice):
+        return {"slice": [value.start, value.stop, value.step]}
+    if isinstance(value, pathlib.PurePath):
+        return value.as_posix()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        fields = {x.name: getattr(value, x.name) for x in dataclasses.fields(value)}
+        return {"cls": f"{type(value).__module__}.{type(value).__qualname__}", **fields}
+    raise TypeError(f"Unable to fingerprint {type(value)}.")
+
+
+def get_fingerprint(node: "Node") -> str | None:
+    """Hash the class, parameters and connections of a node.
+
+    Returns
+    -------
+    str | None
+        The fingerprint or None, if a value can not be fingerprinted reliably,
+        e.g. an array parameter.
+    """
+    content = {
+        "cls": f"{type(node).__module__}.{type(node).__qualname__}",
+        "method": getattr(node, "_method", None),
+    }
+    for field in dataclasses.fields(node):
+        if not field.init or field.name == "name":
+            continue
+        if field.metadata.get(FIELD_TYPE) in _OUTPUT_FIELD_TYPES:
+            continue
+        content[field.name] = node.__dict__.get(field.name)
+    try:
+        data = json.dumps(content, sort_keys=True, default=_default)
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class ReplaceConnectionInstance(IterableHandler):
+    """Point the connections to the node ``old`` to the node ``new``."""
+
+    def __init__(self, old: "Node", new: "Node"):
+        super().__init__()
+        self.old = old
+        self.new = new
+
+    def default(self, value, **kwargs):
+        if isinstance(value, znflow.Connection):
+            instance = self._handle(value.instance)
+            if instance is not value.instance:
+                return dataclasses.replace(value, instance=instance)
+        elif isinstance(value, znflow.CombinedConnections):
+            connections = [self._handle(x) for x in value.connections]
+            if any(x is not y for x, y in zip(connections, value.connections)):
+                return dataclasses.replace(value, connections=connections)
+        elif value is self.old:
+            return self.new
+        return value
@@ -1,7 +1,5 @@
 """Module containing functions to finalize an experiment."""
 
-import git
-
 
 def make_commit(msg: str, path: str = ".") -> str:
     """Create a new GIT commit.
@@ -19,6 +17,8 @@ def make_commit(msg: str, path: str = ".") -> str:
         The hash of the new commit.
 
     """
+    import git
+
     if msg is None:
         msg = "zntrack: auto commit"
     repo = git.Repo(path)
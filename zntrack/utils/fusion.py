@@ -0,0 +1,131 @@
+"""Fuse chains of nodes into a single DVC stage.
+
+Every stage adds the overhead of a process launch, a lock check and the
+lockfile computation. A chain of cheap nodes can instead be run by a single
+``zntrack run-fused`` command. The fused stage has the name of the last node
+of the chain and declares the outputs of all nodes, which keep their own
+node working directories and can be loaded via ``from_rev``. The name of the
+fused stage is stored under ``zntrack.config.ZNTRACK_JSON_STAGE_KEY`` in the
+``zntrack.json`` entry of the other nodes.
+"""
+
+import typing as t
+
+from zntrack.utils.dag import stage_outputs
+from zntrack.utils.misc import sort_and_deduplicate
+
+if t.TYPE_CHECKING:
+    import networkx as nx
+
+FUSED_CMD = "zntrack run-fused"
+
+
+def find_chains(graph: "nx.DiGraph", candidates: t.Iterable) -> list[list]:
+    """Find the linear chains of nodes that can be fused.
+
+    A node is fused with its successor, if it is its only successor and the
+    node is the only predecessor of the successor.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        The graph of the nodes.
+    candidates : Iterable
+        The nodes that may be fused.
+
+    Returns
+    -------
+    list[list]
+        The chains with at least two nodes, each in the order they run.
+    """
+    import networkx as nx
+
+    candidates = set(candidates)
+
+    def _next(node):
+        successors = [*graph.successors(node)]
+        if len(successors) != 1 or successors[0] not in candidates:
+            return None
+        # a graph with multiple edges might connect two nodes more than once
+        if len([*graph.predecessors(successors[0])]) != 1:
+            return None
+        return successors[0]
+
+    chains = []
+    for node in nx.topological_sort(graph):
+        if node not in candidates:
+            continue
+        predecessors = [*graph.predecessors(node)]
+        if len(predecessors) == 1 and predecessors[0] in candidates:
+            if _next(predecessors[0]) == node:
+                continue  # part of the chain of the predecessor
+        chain = [node]
+        while (node := _next(chain[-1])) is not None:
+            chain.append(node)
+        if len(chain) > 1:
+            chains.append(chain)
+    return chains
+
+
+def check_fusable(graph: "nx.DiGraph", nodes: list) -> None:
+    """Raise a ValueError if the nodes can not run in a single stage.
+
+    This is the case if a path between two of the nodes leads through
+    another node, because the fused stage would depend on itself.
+    """
+    import networkx as nx
+
+    selected = set(nodes)
+    downstream = set().union(*(nx.descendants(graph, node) for node in nodes))
+    for node in downstream - selected:
+        if nx.descendants(graph, node) & selected:
+            raise ValueError(
+                f"Unable to fuse the nodes, '{graph.nodes[node]['value'].name}'"
+                " depends on one of them and another one depends on it."
+            )
+
+
+def _to_entry(cmd: str) -> str:
+    """Convert 'zntrack run module.Node --name name' to 'module.Node:name'."""
+    parts = cmd.split()
+    entry = f"{parts[2]}:{parts[parts.index('--name') + 1]}"
+    if "--method" in parts:
+        entry += f":{parts[parts.index('--method') + 1]}"
+    return entry
+
+
+def parse_entry(entry: str) -> tuple[str, str, str]:
+    """Get the (node_path, name, method) from 'module.Node:name[:method]'."""
+    node_path, name, *method = entry.split(":")
+    return node_path, name, method[0] if method else "run"
+
+
+def parse_fused_cmd(cmd: str) -> list[tuple[str, str, str]]:
+    """Get the (node_path, name, method) of every node of a fused stage."""
+    return [parse_entry(entry) for entry in cmd.split()[len(FUSED_CMD.split()) :]]
+
+
+def is_fused_cmd(cmd: str) -> bool:
+    return cmd.split()[: len(FUSED_CMD.split())] == FUSED_CMD.split()
+
+
+def fuse_stages(stages: list[dict]) -> dict:
+    """Merge the ``dvc.yaml`` stages of nodes, given in the order they run.
+
+    Dependencies on the outputs of the fused nodes are removed.
+    """
+    outs = [path for stage in stages for path in stage_outputs(stage)]
+
+    def _is_internal(path: str) -> bool:
+        return any(path == out or path.startswith(f"{out}/") for out in outs)
+
+    fused = {"cmd": " ".join([FUSED_CMD, *(_to_entry(x["cmd"]) for x in stages)])}
+    for key in ("deps", "params", "outs", "metrics"):
+        values = [value for stage in stages for value in stage.get(key, [])]
+        if key == "deps":
+            values = [value for value in values if not _is_internal(value)]
+        if values:
+            fused[key] = sort_and_deduplicate(values)
+    if any(stage.get("always_changed") for stage in stages):
+        fused["always_changed"] = True
+    return fused
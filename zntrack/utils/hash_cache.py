@@ -0,0 +1,98 @@
+"""Persist the hashes of dependency files between status checks.
+
+A hash is reused as long as the path, modification time, size and inode of
+the file are unchanged. Files modified less than ``RACY_SECONDS`` before
+they were hashed are not stored, because a later change within the
+resolution of the modification time would go unnoticed.
+"""
+
+import json
+import os
+import pathlib
+import threading
+import time
+import typing as t
+
+from zntrack.config import HASH_CACHE_PATH
+
+RACY_SECONDS = 2
+
+
+def _stat_key(path: str) -> dict | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return {"mtime": stat.st_mtime_ns, "size": stat.st_size, "inode": stat.st_ino}
+
+
+def snapshot(path: str) -> t.Any:
+    """The stat of a file or of all files in a directory, None if missing."""
+    if not os.path.isdir(path):
+        return _stat_key(path)
+    files = []
+    for root, _, filenames in os.walk(path):
+        paths = (os.path.join(root, x) for x in filenames)
+        files.extend((x, _stat_key(x)) for x in paths)
+    return sorted(files, key=lambda x: x[0])
+
+
+def is_racy(stat: dict | None) -> bool:
+    """Whether a file was modified too recently to trust its stat."""
+    return stat is None or time.time_ns() - stat["mtime"] < RACY_SECONDS * 1e9
+
+
+class HashCache:
+    """A thread-safe mapping of file paths to their hashes, stored as JSON.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to load the cache from and to save it to.
+    """
+
+    def __init__(self, path: pathlib.Path = HASH_CACHE_PATH):
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self._modified = False
+        try:
+            self._entries: dict[str, dict] = json.loads(self.path.read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def get(self, path: str, hash_name: str) -> tuple[dict | None, dict | None]:
+        """Get the cached entry of a file.
+
+        Returns
+        -------
+        tuple[dict | None, dict | None]
+            The current stat of the file, to be passed to ``set``, and the
+            cached entry or None, if the file changed or is not cached.
+        """
+        stat = _stat_key(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if stat is None or entry is None:
+            return stat, None
+        if entry["stat"] != stat or entry["hash_name"] != hash_name:
+            return stat, None
+        return stat, entry
+
+    def set(self, path: str, stat: dict | None, hash_name: str, value: dict) -> None:
+        """Store the hash of a file, computed after it had the given stat."""
+        if is_racy(stat):
+            return
+        with self._lock:
+            self._entries[path] = {"stat": stat, "hash_name": hash_name, **value}
+            self._modified = True
+
+    def save(self) -> None:
+        """Write the cache to disk, if it changed."""
+        with self._lock:
+            if not self._modified:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(self._entries))
+            tmp_path.replace(self.path)
+            self._modified = False
@@ -0,0 +1,231 @@
+"""Hashes of the inputs and outputs of a node for ``Project.run``.
+
+The input hash covers the stage definition the node would write to
+``dvc.yaml`` (command, class, method and paths), its parameters, its entry
+in ``zntrack.json``, the output hashes of the upstream nodes and the content
+of all other dependency files. If it matches the ``input_hash`` stored in the
+``node-meta.json`` of the previous run, the node does not have to run again.
+The output hash covers the content of all output files of the node.
+
+Files are hashed with md5, like DVC does, so a ``HashCache`` shared with
+``zntrack status`` avoids reading files whose stat did not change.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import pathlib
+import typing as t
+
+from zntrack.config import PLUGIN_EMPTY_RETRUN_VALUE
+
+if t.TYPE_CHECKING:
+    import znflow
+
+    from zntrack import Node
+    from zntrack.utils.hash_cache import HashCache
+
+_CHUNK_SIZE = 2**20
+_MISSING = "missing"
+
+
+def _read_md5(path: pathlib.Path) -> str:
+    digest = hashlib.md5()
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _md5(path: pathlib.Path, cache: "HashCache | None") -> str:
+    if cache is None:
+        return _read_md5(path)
+    stat, entry = cache.get(path.as_posix(), "md5")
+    if entry is not None:
+        return entry["hash"]["value"]
+    value = _read_md5(path)
+    if stat is not None:
+        # the same entries as ``zntrack.utils.state.StatusCache`` stores
+        entry = {"hash": {"name": "md5", "value": value}, "meta": {"size": stat["size"]}}
+        cache.set(path.as_posix(), stat, "md5", entry)
+    return value
+
+
+def hash_file(path: str | os.PathLike, cache: "HashCache | None" = None) -> str:
+    """Get the md5 of the content of a file or directory.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The file or directory to hash.
+    cache : HashCache, optional
+        Reuse the hashes of files whose stat did not change.
+    """
+    path = pathlib.Path(path)
+    if path.is_dir():
+        digest = hashlib.md5()
+        for file in sorted(x for x in path.rglob("*") if x.is_file()):
+            digest.update(file.relative_to(path).as_posix().encode())
+            digest.update(hash_file(file, cache).encode())
+        return digest.hexdigest()
+    if not path.exists():
+        return _MISSING
+    return _md5(path, cache)
+
+
+def _paths(entries: list) -> t.Iterator[str]:
+    for entry in entries:
+        if isinstance(entry, dict):
+            yield from entry
+        else:
+            yield entry
+
+
+def _convert(node: "Node", graph: "znflow.DiGraph | None") -> dict:
+    """Get the stage, params and zntrack.json content of the node."""
+    content = {}
+    for plugin in node.state.plugins.values():
+        for key, value in [
+            ("params", plugin.convert_to_params_yaml()),
+            ("stage", plugin.convert_to_dvc_yaml()),
+            ("zntrack", plugin.convert_to_zntrack_json(graph=graph)),
+        ]:
+            if value is not PLUGIN_EMPTY_RETRUN_VALUE:
+                content.setdefault(key, value)
+    if "stage" in content:
+        content["stage"] = content["stage"]["stages"]
+    return content
+
+
+def _output_paths(node: "Node") -> list[str]:
+    from zntrack.converter import node_to_output_paths
+
+    node_meta = (node.nwd / "node-meta.json").as_posix()
+    return sorted(x for x in node_to_output_paths(node, None) if x != node_meta)
+
+
+def _upstream_nodes(node: "Node", graph: "znflow.DiGraph | None") -> list["Node"]:
+    if graph is None or node.uuid not in graph:
+        return []
+    nodes = [graph.nodes[x]["value"] for x in graph.predecessors(node.uuid)]
+    # the outputs of external nodes are not hashed by ``Project.run``
+    return [x for x in nodes if not x._external_]
+
+
+def get_inputs(node: "Node", graph: "znflow.DiGraph | None" = None) -> dict:
+    """Get the definition of the node, its upstream nodes and dependency paths.
+
+    Dependencies written by an upstream node in the graph are represented by
+    that node, all other dependencies by their path.
+    Must be called before the connections of the node are resolved.
+    """
+    from zntrack.converter import node_to_output_paths
+
+    content = _convert(node, graph)
+    stage = content.get("stage", {})
+    files = [*_paths(stage.get("deps", []))]
+    # parameter files, the values of the node's own parameters are in "params"
+    files += [*_paths(x for x in stage.get("params", []) if isinstance(x, dict))]
+
+    owners = {}
+    for upstream in _upstream_nodes(node, graph):
+        for path in node_to_output_paths(upstream, None):
+            owners[pathlib.PurePath(path).as_posix()] = upstream
+    content["upstream"] = {}
+    content["files"] = []
+    for path in files:
+        if (owner := owners.get(pathlib.PurePath(path).as_posix())) is not None:
+            content["upstream"][owner.name] = owner
+        else:
+            content["files"].append(path)
+    content["files"].sort()
+    return content
+
+
+def _upstream_hash(node: "Node", cache: "HashCache | None") -> str:
+    if node.state.output_hash is not None:
+        return node.state.output_hash
+    # e.g. nodes that have been run with ``force`` or outside of ``Project.run``
+    return get_output_hash(node, cache)
+
+
+@functools.cache
+def _get_encoder() -> type[json.JSONEncoder]:
+    """Encode the inputs like ``zntrack.json``, but all connections by reference.
+
+    The values of the connections are covered by the output hash of the
+    upstream nodes, so they are represented by the node, attribute and item.
+    """
+    import znflow
+    import znjson
+
+    from zntrack import converter
+
+    class ConnectionReferenceConverter(znjson.ConverterBase):
+        level = 200
+        representation = "znflow.Connection"
+        instance = znflow.Connection
+
+        def encode(self, obj: znflow.Connection) -> dict:
+            node = getattr(obj.instance, "name", obj.instance)
+            return {"node": node, "attribute": obj.attribute, "item": obj.item}
+
+        def decode(self, value: dict):
+            raise NotImplementedError
+
+    return znjson.ZnEncoder.from_converters(
+        [ConnectionReferenceConverter, *converter.ZNTRACK_JSON_CONVERTERS],
+        add_default=False,
+    )
+
+
+def hash_inputs(inputs: dict, cache: "HashCache | None" = None) -> str:
+    """Hash the result of ``get_inputs``.
+
+    Must be called after the upstream nodes have been run or skipped, so
+    their ``output_hash`` is up to date.
+
+    Parameters
+    ----------
+    inputs : dict
+        The result of ``get_inputs``.
+    cache : HashCache, optional
+        Reuse the hashes of dependency files whose stat did not change.
+
+    Raises
+    ------
+    TypeError
+        If a value can not be serialized like the ``zntrack.json`` file,
+        because its string representation might differ between processes.
+    """
+    content = {
+        **inputs,
+        "upstream": {
+            name: _upstream_hash(node, cache)
+            for name, node in inputs.get("upstream", {}).items()
+        },
+        "files": {path: hash_file(path, cache) for path in inputs["files"]},
+    }
+    try:
+        data = json.dumps(content, sort_keys=True, cls=_get_encoder())
+    except TypeError as err:
+        raise TypeError(f"Unable to hash the inputs of the node: {err}") from err
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def get_input_hash(node: "Node", graph: "znflow.DiGraph | None" = None) -> str:
+    """Hash the definition of the node, its upstream nodes and dependencies."""
+    return hash_inputs(get_inputs(node, graph))
+
+
+def get_output_hash(node: "Node", cache: "HashCache | None" = None) -> str:
+    """Hash the content of all outputs of the node, except ``node-meta.json``."""
+    files = {path: hash_file(path, cache) for path in _output_paths(node)}
+    data = json.dumps(files, sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def outputs_exist(node: "Node") -> bool:
+    """Whether all outputs of the node exist."""
+    return all(os.path.exists(path) for path in _output_paths(node))
@@ -0,0 +1,201 @@
+"""Job queue on a shared filesystem to run the stages of a project on many hosts.
+
+The queue is a SQLite database next to the ``dvc.yaml`` file. It stores every
+stage together with the stages it depends on. Workers claim a stage once all
+its upstream stages are done and hold a lease on it, which they renew via
+heartbeats while the stage is running. If a worker dies, its lease expires
+and the stage is claimed by another worker.
+
+SQLite relies on the file locking of the filesystem. Most network filesystems
+support this, but the database must not be used in WAL mode on them, which is
+why the default rollback journal is used.
+"""
+
+import pathlib
+import sqlite3
+import time
+import typing as t
+
+from zntrack.utils.dag import STAGE_GRAPH, topological_sort
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS deps (
+    name TEXT NOT NULL,
+    upstream TEXT NOT NULL,
+    PRIMARY KEY (name, upstream)
+);
+"""
+
+_READY = f"""
+SELECT name FROM jobs AS job
+WHERE (status = '{PENDING}' OR (status = '{RUNNING}' AND lease_expires < :now))
+AND NOT EXISTS (
+    SELECT 1 FROM deps JOIN jobs AS upstream ON upstream.name = deps.upstream
+    WHERE deps.name = job.name AND upstream.status != '{DONE}'
+)
+ORDER BY position
+LIMIT 1
+"""
+
+
+class JobQueue:
+    """A queue of stages, ordered by their dependencies.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path to the SQLite database, created if it does not exist.
+    lease : float
+        Seconds a claimed stage stays assigned to a worker without a heartbeat.
+    max_attempts : int
+        How often a stage is claimed again after its worker died,
+        before it is marked as failed.
+    """
+
+    def __init__(self, path: pathlib.Path, lease: float = 60.0, max_attempts: int = 3):
+        self.path = pathlib.Path(path)
+        self.lease = lease
+        self.max_attempts = max_attempts
+        # autocommit mode, transactions are started explicitly
+        self._connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "JobQueue":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def _transaction(self) -> sqlite3.Connection:
+        self._connection.execute("BEGIN IMMEDIATE")
+        return self._connection
+
+    def add(self, graph: STAGE_GRAPH, names: t.Iterable[str]) -> None:
+        """Add stages, keeping the status of stages which are already queued.
+
+        Parameters
+        ----------
+        graph : dict[str, set[str]]
+            The upstream stages of every stage, see ``dag.get_stage_graph``.
+        names : Iterable[str]
+            The stages to add. Their upstream stages must be included.
+        """
+        order = topological_sort(graph, names)
+        selected = set(order)
+        with self._transaction() as con:
+            offset = con.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            con.executemany(
+                "INSERT OR IGNORE INTO jobs (name, position, status) VALUES (?, ?, ?)",
+                [(name, offset + idx, PENDING) for idx, name in enumerate(order)],
+            )
+            con.executemany(
+                "INSERT OR IGNORE INTO deps (name, upstream) VALUES (?, ?)",
+                [
+                    (name, upstream)
+                    for name in order
+                    for upstream in graph[name] & selected
+                ],
+            )
+
+    def claim(self, worker: str) -> str | None:
+        """Claim the next stage whose upstream stages are done.
+
+        Returns
+        -------
+        str | None
+            The name of the stage or None, if no stage is ready.
+        """
+        now = time.time()
+        with self._transaction() as con:
+            con.execute(
+                f"UPDATE jobs SET status = '{FAILED}', error = 'lease expired'"
+                f" WHERE status = '{RUNNING}' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            row = con.execute(_READY, {"now": now}).fetchone()
+            if row is None:
+                return None
+            con.execute(
+                f"UPDATE jobs SET status = '{RUNNING}', worker = ?, lease_expires = ?,"
+                " attempts = attempts + 1 WHERE name = ?",
+                (worker, now + self.lease, row[0]),
+            )
+        return row[0]
+
+    def heartbeat(self, name: str, worker: str) -> bool:
+        """Renew the lease of a stage.
+
+        Returns
+        -------
+        bool
+            False, if the worker lost the lease to another worker.
+        """
+        with self._transaction() as con:
+            cursor = con.execute(
+                "UPDATE jobs SET lease_expires = ?"
+                f" WHERE name = ? AND worker = ? AND status = '{RUNNING}'",
+                (time.time() + self.lease, name, worker),
+            )
+        return cursor.rowcount == 1
+
+    def finish(self, name: str, worker: str, error: str | None = None) -> None:
+        """Mark a stage as done or as failed, if an error is given."""
+        status = DONE if error is None else FAILED
+        with self._transaction() as con:
+            con.execute(
+                "UPDATE jobs SET status = ?, error = ?, lease_expires = NULL"
+                f" WHERE name = ? AND worker = ? AND status = '{RUNNING}'",
+                (status, error, name, worker),
+            )
+
+    def is_active(self) -> bool:
+        """Whether a stage is running under a valid lease."""
+        row = self._connection.execute(
+            f"SELECT COUNT(*) FROM jobs WHERE status = '{RUNNING}'"
+            " AND lease_expires >= ?",
+            (time.time(),),
+        ).fetchone()
+        return row[0] > 0
+
+    def reset(self, statuses: t.Iterable[str] = (FAILED,)) -> None:
+        """Queue the stages with the given statuses again."""
+        statuses = [*statuses]
+        with self._transaction() as con:
+            con.execute(
+                f"UPDATE jobs SET status = '{PENDING}', worker = NULL,"
+                " lease_expires = NULL, attempts = 0, error = NULL"
+                f" WHERE status IN ({', '.join('?' for _ in statuses)})",
+                statuses,
+            )
+
+    def status(self) -> dict[str, dict]:
+        """Get the status, worker, attempts and error of every stage."""
+        rows = self._connection.execute(
+            "SELECT name, status, worker, attempts, error FROM jobs ORDER BY position"
+        )
+        return {
+            name: {
+                "status": status,
+                "worker": worker,
+                "attempts": attempts,
+                "error": error,
+            }
+            for name, status, worker, attempts, error in rows
+        }
@@ -1,4 +1,3 @@
-import json
 from pathlib import Path, PurePosixPath
 
 import dvc.api
@@ -10,7 +9,7 @@ from rich.text import Text
 from rich.tree import Tree
 
 from zntrack.group import Group
-from zntrack.utils.state import get_node_status
+from zntrack.utils.state import StatusCache, get_graph_status
 
 
 def normalize_path(path: str) -> PurePosixPath:
@@ -65,12 +64,55 @@ def build_forest(df: pd.DataFrame) -> list[Tree]:
     return forest
 
 
+def _group_path(stage: PipelineStage, cache: StatusCache) -> tuple[str, ...]:
+    """The directories of the dvc.yaml file and the zntrack group of a stage."""
+    if ":" in stage.addressing:
+        dvc_path_str, _ = stage.addressing.split(":")
+        # Exclude 'dvc.yaml' from the dvc_parts for grouping
+        dvc_path_obj = normalize_path(dvc_path_str)
+        dvc_parts = tuple(p for p in dvc_path_obj.parts if p != "dvc.yaml")
+    else:
+        # Single file project
+        stage_name = stage.addressing
+        # If addressing is a dvc.yaml, we treat its parent as the dvc_parts
+        if stage_name == "dvc.yaml":
+            dvc_parts = ()  # no dvc_parts if it's just dvc.yaml in root
+        elif PurePosixPath(stage_name).name == "dvc.yaml":
+            dvc_parts = PurePosixPath(stage_name).parent.parts
+        else:
+            dvc_parts = ()
+
+    # Load zntrack group per node (from its nwd)
+    try:
+        config_path = Path(stage.path_in_repo).parent / "zntrack.json"
+        config = cache.read_zntrack_json(config_path)
+        nwd = config[stage.name]["nwd"]["value"]
+        group = Group.from_nwd(Path(nwd))
+        group_parts = tuple(group.names) if group.names else ()
+    except Exception:
+        group_parts = ()
+
+    return dvc_parts + group_parts or ("__NO_GROUP__",)
+
+
 def list_nodes(
-    remote: str | None = None, rev: str | None = None, verbose: int = 1
+    remote: str | None = None,
+    rev: str | None = None,
+    verbose: int = 1,
+    jobs: int = 1,
 ) -> pd.DataFrame:
-    """List zntrack nodes from DVC repo and display a nested tree."""
+    """List zntrack nodes from DVC repo and display a nested tree.
+
+    The stages are collected once and their status is computed, optionally
+    in ``jobs`` threads (experimental), sharing the dependency hashes and the
+    files read between them.
+    Nodes with a changed upstream node are changed, see ``get_graph_status``.
+    """
     fs = dvc.api.DVCFileSystem(url=remote, rev=rev)
-    stages: list[Stage | PipelineStage] = list(fs.repo.stage.collect())
+    stages: list[Stage | PipelineStage] = [
+        x for x in fs.repo.stage.collect() if isinstance(x, PipelineStage)
+    ]
+    cache = StatusCache(fs)
     node_data = []
 
     with Progress(
@@ -78,7 +120,7 @@ def list_nodes(
         # First "column": Overall progress count
         TextColumn("[cyan]Node: {task.completed}/{task.total} |"),
         BarColumn(),
-        # Second "column": Current item being processed
+        # Second "column": Last item processed
         TextColumn(
             "[progress.description] [bold]{task.fields[current_node_address]}[/bold]"
         ),
@@ -87,59 +129,24 @@ def list_nodes(
     ) as progress:
         task = progress.add_task(
             "[cyan]Checking nodes...",
-            total=len(stages),
+            total=len(fs.repo.index.graph),
             current_node_address="",  # Initialize custom field
         )
-        for idx, stage in enumerate(stages, 1):
-            # Update the custom field for current node's addressing
-            progress.update(task, completed=idx, current_node_address=stage.addressing)
-            if not isinstance(stage, PipelineStage):
-                continue
-            # Determine stage_name and dvc_path if possible
-            if ":" in stage.addressing:
-                dvc_path_str, stage_name = stage.addressing.split(":")
-                # Exclude 'dvc.yaml' from the dvc_parts for grouping
-                dvc_path_obj = normalize_path(dvc_path_str)
-                dvc_parts = tuple(p for p in dvc_path_obj.parts if p != "dvc.yaml")
-            else:
-                # Single file project
-                stage_name = stage.addressing
-                # If addressing is a dvc.yaml, we treat its parent as the dvc_parts
-                if stage_name == "dvc.yaml":
-                    dvc_parts = ()  # no dvc_parts if it's just dvc.yaml in root
-                elif PurePosixPath(stage_name).name == "dvc.yaml":
-                    dvc_parts = PurePosixPath(stage_name).parent.parts
-                else:
-                    dvc_parts = ()
-
-            short_name = stage.name
-
-            # Load zntrack group per node (from its nwd)
-            try:
-                config_path = Path(stage.path_in_repo).parent / "zntrack.json"
-                config = json.loads(fs.read_text(config_path))
-                nwd = config[stage.name]["nwd"]["value"]
-                group = Group.from_nwd(Path(nwd))
-                group_parts = tuple(group.names) if group.names else ()
-            except Exception:
-                group_parts = ()
-
-            # Build group path
-            if dvc_parts and group_parts:
-                group_path = dvc_parts + group_parts
-            elif dvc_parts:
-                group_path = dvc_parts
-            elif group_parts:
-                group_path = group_parts
-            else:
-                group_path = ("__NO_GROUP__",)
-
+        status = get_graph_status(
+            fs,
+            jobs=jobs,
+            cache=cache,
+            callback=lambda stage, _: progress.update(
+                task, advance=1, current_node_address=stage.addressing
+            ),
+        )
+        for stage in stages:
             node_data.append(
                 {
-                    "name": short_name,
+                    "name": stage.name,
                     "full_name": stage.addressing,
-                    "group": group_path,
-                    "changed": get_node_status(stage.addressing, remote, rev, fs=fs),
+                    "group": _group_path(stage, cache),
+                    "changed": status[stage.addressing].changed,
                 }
             )
 
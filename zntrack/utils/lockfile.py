@@ -1,26 +1,182 @@
+"""Capture the lock of the inputs of a stage for the ``node-meta.json`` file.
+
+The dependencies are hashed through the ``dvc.repo.Repo`` of a
+``DVCFileSystem`` and thereby its state database, so files which have already
+been hashed by ``dvc repro`` are not read again, as long as their inode, size
+and mtime did not change.
+
+The lock can be computed in one of the ``LOCKFILE_MODES``:
+
+- ``inline``: in the current process before the node runs.
+- ``thread``: in a thread while the node runs.
+- ``process``: in a separate process while the node runs.
+- ``auto``: ``inline`` if the dependencies are smaller than
+  ``zntrack.config.LOCKFILE_INLINE_MAX_SIZE``, otherwise ``process``.
+"""
+
+import contextlib
+import datetime
+import os
+import threading
+import time
 import typing as t
 from multiprocessing import Process, Queue
+from queue import Empty
 
-from dvc.api import DVCFileSystem
 from dvc.stage.serialize import to_single_stage_lockfile
 
+from zntrack import config
+from zntrack.utils import tracing
+
+if t.TYPE_CHECKING:
+    from dvc.repo import Repo
+
+LOCKFILE_MODES = ("auto", "inline", "thread", "process")
+STAGE_LOCK_RESULT = tuple[dict, datetime.timedelta]
+
+# a dvc.repo.Repo must not be used by multiple threads at once
+_REPO_LOCK = threading.Lock()
+
+
+def compute_stage_lock(name: str, repo: "Repo") -> dict:
+    """Compute the lock of the inputs of a stage using an existing repo handle."""
+    with _REPO_LOCK:
+        stage = next(iter(repo.stage.collect(name)))
+        stage.save_deps(allow_missing=False)
+        result = to_single_stage_lockfile(stage)
+    return {k: v for k, v in result.items() if k in ["cmd", "deps", "params"]}
+
+
+def _timed_stage_lock(name: str, repo: "Repo | None" = None) -> STAGE_LOCK_RESULT:
+    from dvc.api import DVCFileSystem
+
+    start = time.perf_counter()
+    with tracing.span("lockfile", node=name):
+        if repo is None:
+            # also works outside of an initialized DVC repository
+            repo = DVCFileSystem().repo
+        lock = compute_stage_lock(name, repo)
+    return lock, datetime.timedelta(seconds=time.perf_counter() - start)
+
+
+def _put_result(queue: Queue, func: t.Callable, *args) -> None:
+    """Send the result or the error of ``func`` back to the main process."""
+    try:
+        queue.put((True, func(*args)))
+    except Exception as err:
+        try:
+            queue.put((False, err))
+        except Exception:  # the error can not be pickled
+            queue.put((False, RuntimeError(f"{type(err).__name__}: {err}")))
+
+
+def _join_result(queue: Queue, proc: Process, name: str) -> t.Any:
+    # read before joining, the child can not exit before the queue is drained
+    while proc.is_alive() or not queue.empty():
+        with contextlib.suppress(Empty):
+            success, result = queue.get(timeout=0.1)
+            proc.join()
+            if not success:
+                raise result
+            return result
+    raise RuntimeError(
+        f"Failed to compute the lock of stage '{name}',"
+        f" the process exited with code {proc.exitcode}."
+    )
+
 
 def get_stage_lock(name: str, queue: Queue) -> None:
-    fs = DVCFileSystem()
-    stage = next(iter(fs.repo.stage.collect(name)))
-    stage.save_deps(allow_missing=False)
-    result = to_single_stage_lockfile(stage)
-    result = {k: v for k, v in result.items() if k in ["cmd", "deps", "params"]}
-    queue.put(result)  # Send the result back to the main process
+    queue.put(_timed_stage_lock(name)[0])
 
 
 def mp_start_stage_lock(name: str) -> t.Tuple[Queue, Process]:
     queue = Queue()
-    p = Process(target=get_stage_lock, args=(name, queue))
+    p = Process(target=_put_result, args=(queue, _timed_stage_lock, name))
     p.start()
     return queue, p
 
 
-def mp_join_stage_lock(queue: Queue, p: Process) -> dict:
-    p.join()
-    return queue.get()
+def mp_join_stage_lock(queue: Queue, p: Process, name: str = "") -> dict:
+    return _join_result(queue, p, name)[0]
+
+
+def get_lockfile_mode(mode: str | None = None) -> str:
+    """Get the lockfile mode, defaulting to ``ZNTRACK_LOCKFILE_MODE`` or 'auto'."""
+    mode = mode or os.environ.get("ZNTRACK_LOCKFILE_MODE", "auto")
+    if mode not in LOCKFILE_MODES:
+        raise ValueError(
+            f"Invalid lockfile mode '{mode}'. Choose from {', '.join(LOCKFILE_MODES)}."
+        )
+    return mode
+
+
+def _iter_files(paths: t.Iterable[str]) -> t.Iterator[str]:
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                yield from (os.path.join(root, file) for file in files)
+        else:
+            yield path
+
+
+def _exceeds_size(paths: t.Iterable[str], limit: int) -> bool:
+    """Check if the files in paths are larger than limit, stopping early."""
+    size = 0
+    for file in _iter_files(paths):
+        with contextlib.suppress(OSError):
+            size += os.stat(file).st_size
+        if size > limit:
+            return True
+    return False
+
+
+def _has_small_deps(name: str) -> bool:
+    from zntrack.utils import dag
+
+    try:
+        stage = dag.load_stages(config.DVC_FILE_PATH)[name]
+    except (FileNotFoundError, KeyError):
+        return False
+    deps = dag.stage_dependencies(stage)
+    return not _exceeds_size(deps, config.LOCKFILE_INLINE_MAX_SIZE)
+
+
+def start_stage_lock(
+    name: str, mode: str | None = None, repo: "Repo | None" = None
+) -> t.Callable[[], STAGE_LOCK_RESULT]:
+    """Start computing the lock of the inputs of a stage.
+
+    Parameters
+    ----------
+    name : str
+        The name of the stage.
+    mode : str, optional
+        One of ``LOCKFILE_MODES``. Defaults to ``get_lockfile_mode()``.
+    repo : dvc.repo.Repo, optional
+        Reuse this repository instead of opening a new one.
+        Not used in the 'process' mode.
+
+    Returns
+    -------
+    Callable[[], tuple[dict, datetime.timedelta]]
+        Wait for the result and return the lock and the time it took to compute it.
+    """
+    mode = get_lockfile_mode(mode)
+    if mode == "auto":
+        mode = "inline" if repo is not None or _has_small_deps(name) else "process"
+
+    if mode == "inline":
+        result = _timed_stage_lock(name, repo)
+        return lambda: result
+    if mode == "thread":
+        from concurrent.futures import ThreadPoolExecutor
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(_timed_stage_lock, name, repo)
+        executor.shutdown(wait=False)
+        return future.result
+
+    queue = Queue()
+    proc = Process(target=_put_result, args=(queue, _timed_stage_lock, name))
+    proc.start()
+    return lambda: _join_result(queue, proc, name)
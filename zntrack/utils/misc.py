@@ -1,8 +1,8 @@
 import os
 import pathlib
+import string
 import typing as t
 
-import yaml
 import znflow.utils
 
 from zntrack.add import DVCImportPath
@@ -10,6 +10,9 @@ from zntrack.utils.import_handler import import_handler
 
 from ..config import ENV_FILE_PATH, NWD_PATH
 
+# same as 'dvc.stage.INVALID_STAGENAME_CHARS'
+_INVALID_STAGENAME_CHARS = set(string.punctuation) - {"_", "-"}
+
 
 class RunDVCImportPathHandler(znflow.utils.IterableHandler):
     """Replace the nwd placeholder with the actual nwd."""
@@ -38,9 +41,19 @@ def get_attr_always_list(obj: t.Any, attr: str) -> list:
     return value
 
 
+def is_valid_name(name: str) -> bool:
+    """Check if 'name' is a valid DVC stage name.
+
+    Same as 'dvc.stage.utils.is_valid_name' without importing 'dvc'.
+    """
+    return not _INVALID_STAGENAME_CHARS & set(name)
+
+
 def load_env_vars(name: str | None = None) -> None:
     # TODO: this should also use DVCFileSystem!
     if ENV_FILE_PATH.exists():
+        import yaml
+
         env = yaml.safe_load(ENV_FILE_PATH.read_text())
         global_config = env.get("global", {})
         for key, val in global_config.items():
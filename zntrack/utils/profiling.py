@@ -0,0 +1,191 @@
+"""Opt-in profiling of the node method executed by ``zntrack run``.
+
+Set the ``ZNTRACK_PROFILE`` environment variable, globally or for single
+stages via the ``env.yaml`` file, to
+
+- ``cprofile``: write a ``cProfile`` profile to
+  ``<nwd>/.zntrack-profile/profile.prof``,
+- ``sample``: sample the call stack and write the collapsed stacks, e.g. for
+  ``flamegraph.pl`` or speedscope, to ``<nwd>/.zntrack-profile/profile.folded``,
+- ``1``, ``true`` or ``all``: both.
+
+The files are not declared as outputs of the stage. Their directory ignores
+itself via a ``.gitignore`` file, so they do not show up in ``git status``.
+Summarize them via ``zntrack profile <node>``.
+"""
+
+import collections
+import contextlib
+import io
+import os
+import pathlib
+import sys
+import threading
+import typing as t
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_DIR = ".zntrack-profile"
+PROFILE_FILE = "profile.prof"
+FOLDED_FILE = "profile.folded"
+SAMPLE_INTERVAL = 0.005
+
+if t.TYPE_CHECKING:
+    import types
+
+
+def get_profile_modes(value: str | None = None) -> set[str]:
+    """Get the profilers selected via ``ZNTRACK_PROFILE``."""
+    if value is None:
+        value = os.environ.get("ZNTRACK_PROFILE", "")
+    value = value.strip().lower()
+    if value in ("", "0", "false"):
+        return set()
+    if value in ("1", "true", "all"):
+        return set(PROFILE_MODES)
+    modes = {mode.strip() for mode in value.split(",")}
+    if invalid := modes - set(PROFILE_MODES):
+        raise ValueError(
+            f"Invalid profile mode(s) {', '.join(sorted(invalid))}."
+            f" Choose from {', '.join(PROFILE_MODES)}, 'all' or '1'."
+        )
+    return modes
+
+
+def _frame_label(frame: "types.FrameType") -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    # ';' separates the frames of a collapsed stack
+    return f"{name} ({code.co_filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class StackSampler:
+    """Sample the call stack of a thread in a background thread.
+
+    Parameters
+    ----------
+    root : types.FrameType
+        The frame calling the profiled code. Frames above it are not recorded.
+    interval : float
+        Seconds between two samples.
+    """
+
+    def __init__(self, root: "types.FrameType", interval: float = SAMPLE_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.stacks: collections.Counter[str] = collections.Counter()
+        self._thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None and frame is not self.root:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, path: pathlib.Path) -> None:
+        """Write the stacks in the collapsed format, one 'a;b;c <count>' per line."""
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("".join(f"{line}\n" for line in lines))
+
+
+def get_profile_dir(nwd: pathlib.Path, create: bool = False) -> pathlib.Path:
+    """Get the directory of the profiles of a node.
+
+    The directory is ignored by git and not tracked by DVC, so the profiles
+    neither show up as changes nor collide with the outputs of the node.
+    """
+    directory = nwd / PROFILE_DIR
+    if create:
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / ".gitignore").write_text("*\n")
+    return directory
+
+
+@contextlib.contextmanager
+def profile(nwd: pathlib.Path, modes: set[str] | None = None) -> t.Iterator[None]:
+    """Profile the code in the context and write the results to the nwd.
+
+    Parameters
+    ----------
+    nwd : pathlib.Path
+        The node working directory, see ``get_profile_dir``.
+    modes : set[str], optional
+        The profilers to use. Defaults to ``get_profile_modes()``.
+    """
+    modes = get_profile_modes() if modes is None else modes
+    if not modes:
+        yield
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile() if "cprofile" in modes else None
+    sampler = None
+    if "sample" in modes:
+        # the frame of the code entering this context manager
+        sampler = StackSampler(root=sys._getframe(2))
+        sampler.start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        if sampler is not None:
+            sampler.stop()
+        directory = get_profile_dir(nwd, create=True)
+        if profiler is not None:
+            profiler.dump_stats(directory / PROFILE_FILE)
+        if sampler is not None:
+            sampler.dump(directory / FOLDED_FILE)
+
+
+def summarize(nwd: pathlib.Path, limit: int = 20, sort: str = "cumulative") -> str:
+    """Summarize the profiles written to the nwd.
+
+    Raises
+    ------
+    FileNotFoundError
+        If no profile has been written to the nwd.
+    """
+    import pstats
+
+    directory = get_profile_dir(nwd)
+    profile_file, folded_file = directory / PROFILE_FILE, directory / FOLDED_FILE
+    if not profile_file.exists() and not folded_file.exists():
+        raise FileNotFoundError(
+            f"No profile found in '{nwd}'. Run the node with 'ZNTRACK_PROFILE=1'."
+        )
+    sections = []
+    if profile_file.exists():
+        stream = io.StringIO()
+        stats = pstats.Stats(profile_file.as_posix(), stream=stream)
+        stats.strip_dirs().sort_stats(sort).print_stats(limit)
+        sections.append(stream.getvalue().strip())
+    if folded_file.exists():
+        # samples per function on top of the stack, i.e. the self time
+        own, total = collections.Counter(), 0
+        for line in folded_file.read_text().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            own[stack.rsplit(";", 1)[-1]] += int(count)
+            total += int(count)
+        lines = [f"{total} samples, functions with the most samples:"]
+        lines.extend(
+            f"{count:8d} {count / total:6.1%}  {function}"
+            for function, count in own.most_common(limit)
+        )
+        sections.append("\n".join(lines))
+    return "\n\n".join(sections)
@@ -0,0 +1,136 @@
+"""Memoize the stage hashes of the nodes in the workspace.
+
+A hash is memoized by the definition of the stage in ``dvc.yaml`` and the
+stat of its dependency, parameter and, if included, output files, so any
+change of them computes the hash again. It is not memoized while one of
+the files was modified less than ``RACY_SECONDS`` ago.
+
+Stages without file dependencies, i.e. only depending on parameters, are
+hashed from ``dvc.yaml`` and the parameter files without DVC. Otherwise,
+the dependencies are hashed via DVC, reusing the hashes of unchanged files
+from the persistent ``HashCache``.
+"""
+
+import os
+import pathlib
+import threading
+
+from zntrack.config import DVC_FILE_PATH, HASH_CACHE_PATH
+from zntrack.utils import dag
+from zntrack.utils.hash_cache import HashCache, is_racy, snapshot
+
+_memo: dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def clear() -> None:
+    """Forget all memoized stage hashes."""
+    with _lock:
+        _memo.clear()
+
+
+def hash_lock(lock: dict, include_outs: bool = False) -> str:
+    """Hash a lock as written to ``dvc.lock``."""
+    from dvc.utils import dict_sha256
+
+    from zntrack.utils.state import LOCK_KEYS
+
+    if not include_outs:
+        lock = {k: v for k, v in lock.items() if k in LOCK_KEYS}
+    return dict_sha256(lock)
+
+
+def _is_racy(value) -> bool:
+    if isinstance(value, list):  # a directory
+        return any(is_racy(stat) for _, stat in value)
+    return value is not None and is_racy(value)
+
+
+def get_key(stage: dict, include_outs: bool = False) -> str | None:
+    """The memoization key of a stage definition, None if it can not be memoized."""
+    from dvc.utils import dict_sha256
+
+    paths = [*dag.stage_dependencies(stage), *dag.stage_params(stage)]
+    if include_outs:
+        paths.extend(dag.stage_outputs(stage))
+    if any("://" in path for path in paths):
+        return None  # the stat of remote files is unknown
+    stats = {path: snapshot(path) for path in paths}
+    if any(_is_racy(value) for value in stats.values()):
+        return None
+    return dict_sha256(
+        {
+            "root": os.getcwd(),
+            "stage": stage,
+            "include_outs": include_outs,
+            "stats": stats,
+        }
+    )
+
+
+def params_lock(stage: dict, include_outs: bool = False) -> dict | None:
+    """Compute the lock of a stage depending only on parameters without DVC.
+
+    Returns None if the stage has file dependencies or uses features such
+    as templating, a ``wdir`` or wholly tracked parameter files.
+    """
+    import dpath
+    from dvc.fs import LocalFileSystem
+    from dvc.utils.serialize import load_path
+
+    if "cmd" not in stage or stage.get("deps") or "wdir" in stage:
+        return None
+    if "${" in str(stage):
+        return None
+    if include_outs and dag.stage_outputs(stage):
+        return None
+    lock = {"cmd": stage["cmd"]}
+    params = {}
+    for path, keys in dag.stage_params(stage).items():
+        if not keys or not os.path.isfile(path):
+            return None
+        config = load_path(os.path.abspath(path), LocalFileSystem())
+        try:
+            params[path] = {key: dpath.get(config, key, separator=".") for key in keys}
+        except KeyError:
+            return None  # let DVC raise the error
+    if params:
+        lock["params"] = params
+    return lock
+
+
+def compute_lock(name: str, include_outs: bool = False) -> dict:
+    """Compute the lock of a stage in the workspace via DVC."""
+    import dvc.api
+    from dvc.stage.serialize import to_single_stage_lockfile
+
+    from zntrack.utils.state import StatusCache
+
+    fs = dvc.api.DVCFileSystem()
+    stage = next(iter(fs.repo.stage.collect(name)))
+    cache = StatusCache(fs, HashCache(pathlib.Path(fs.repo.root_dir, HASH_CACHE_PATH)))
+    cache.save_deps(stage)
+    cache.hash_cache.save()
+    if include_outs:
+        stage.save_outs(allow_missing=True)
+    return to_single_stage_lockfile(stage)
+
+
+def get_stage_hash(name: str, include_outs: bool = False) -> str:
+    """Get the hash of a stage in the workspace, see ``NodeStatus.get_stage_hash``."""
+    stages = dag.load_stages(DVC_FILE_PATH) if DVC_FILE_PATH.exists() else {}
+    stage = stages.get(name)
+    key = None if stage is None else get_key(stage, include_outs)
+    if key is not None:
+        with _lock:
+            if (value := _memo.get(key)) is not None:
+                return value
+
+    lock = None if stage is None else params_lock(stage, include_outs)
+    if lock is None:
+        lock = compute_lock(name, include_outs)
+    value = hash_lock(lock, include_outs)
+    if key is not None:
+        with _lock:
+            _memo[key] = value
+    return value
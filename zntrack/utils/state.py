@@ -1,10 +1,280 @@
+import dataclasses
 import json
+import threading
+import typing as t
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import dvc.api
 import dvc.fs
 from dvc.stage.serialize import to_single_stage_lockfile
 
+# the entries of the lock stored in the node-meta.json
+LOCK_KEYS = ("cmd", "deps", "params")
+
+if t.TYPE_CHECKING:
+    from dvc.dependency import ParamsDependency
+    from dvc.stage import Stage
+
+    from zntrack.utils.hash_cache import HashCache
+
+
+class StatusCache:
+    """Share the work of computing the status of many stages.
+
+    Every ``zntrack.json`` and parameter file is read once and every
+    dependency path is hashed once, also if the status of the stages is
+    computed in parallel threads.
+
+    Parameters
+    ----------
+    fs : dvc.api.DVCFileSystem
+        The file system of the repository the stages were collected from.
+    hash_cache : HashCache, optional
+        Reuse the hashes of unchanged files in the workspace from previous
+        runs. Call ``hash_cache.save()`` to persist new hashes.
+    """
+
+    def __init__(self, fs: dvc.api.DVCFileSystem, hash_cache: "HashCache | None" = None):
+        self.fs = fs
+        self.hash_cache = hash_cache
+        self._lock = threading.Lock()
+        self._futures: dict[tuple, Future] = {}
+
+    def _once(self, key: tuple, func: t.Callable[[], t.Any]) -> t.Any:
+        """Compute ``func`` once per key and share the result or the error."""
+        with self._lock:
+            future = self._futures.get(key)
+            owner = future is None
+            if owner:
+                future = self._futures[key] = Future()
+        if owner:
+            try:
+                future.set_result(func())
+            except Exception as err:
+                future.set_exception(err)
+        return future.result()
+
+    def read_zntrack_json(self, path: Path) -> dict:
+        return self._once(
+            ("zntrack.json", Path(path).as_posix()),
+            lambda: json.loads(self.fs.read_text(path)),
+        )
+
+    def _save_params(self, dep: "ParamsDependency") -> bool:
+        """Set the values of a params dependency from the cached file content.
+
+        Returns False if the values have to be read by DVC, e.g. to raise
+        an error for a missing parameter.
+        """
+        import dpath
+        from dvc.dependency.param import MissingParamsFile
+        from dvc.utils.serialize import load_path
+        from dvc_data.hashfile.hash_info import HashInfo
+
+        if not dep.params:
+            return False  # the whole file is tracked
+        try:
+            dep.validate_filepath()
+        except MissingParamsFile:
+            return False
+        config = self._once(
+            ("params", dep.fs_path), lambda: load_path(dep.fs_path, dep.repo.fs)
+        )
+        values = {}
+        for key in dep.params:
+            try:
+                values[key] = dpath.get(config, key, separator=".")
+            except KeyError:
+                return False
+        dep.hash_info = HashInfo(dep.PARAM_PARAMS, values)
+        return True
+
+    def _load_hash(self, dep) -> tuple | None:
+        """Get the hash of a file from the ``hash_cache`` or compute and store it.
+
+        Returns None if the dependency is not a file in the workspace.
+        """
+        from dvc.dependency.base import DependencyDoesNotExistError
+        from dvc_data.hashfile.hash_info import HashInfo
+        from dvc_data.hashfile.meta import Meta
+
+        if self.hash_cache is None or getattr(dep.fs, "protocol", None) != "local":
+            return None
+        stat, entry = self.hash_cache.get(dep.fs_path, dep.hash_name)
+        if entry is not None:
+            hash_info = HashInfo(entry["hash"]["name"], entry["hash"]["value"])
+            return hash_info, Meta.from_dict(entry["meta"]), None, dep.fs_path
+        if stat is None:
+            return None  # missing or not accessible, let DVC decide
+        try:
+            dep.save()
+        except DependencyDoesNotExistError:
+            return None
+        if not dep.hash_info.isdir:
+            value = {
+                "hash": {"name": dep.hash_info.name, "value": dep.hash_info.value},
+                "meta": dep.meta.to_dict(),
+            }
+            self.hash_cache.set(dep.fs_path, stat, dep.hash_name, value)
+        return dep.hash_info, dep.meta, dep.obj, dep.fs_path
+
+    def hash_dep(self, dep) -> tuple | None:
+        """Hash a file dependency once for all stages depending on it.
+
+        Returns the (hash_info, meta, obj, fs_path) of the dependency or None
+        if it does not exist.
+        """
+        from dvc.dependency.base import DependencyDoesNotExistError
+
+        def _hash():
+            if (cached := self._load_hash(dep)) is not None:
+                return cached
+            try:
+                dep.save()
+            except DependencyDoesNotExistError:
+                return None
+            return dep.hash_info, dep.meta, dep.obj, dep.fs_path
+
+        return self._once((type(dep).__name__, dep.fs_path, dep.hash_name), _hash)
+
+    def save_deps(self, stage: "Stage") -> None:
+        """Like ``stage.save_deps(allow_missing=True)`` with shared results."""
+        from dvc.dependency import ParamsDependency
+        from dvc.dependency.base import DependencyDoesNotExistError
+
+        for dep in stage.deps:
+            if isinstance(dep, ParamsDependency):
+                if not self._save_params(dep):
+                    try:
+                        dep.save()
+                    except DependencyDoesNotExistError:
+                        pass
+                continue
+            if (result := self.hash_dep(dep)) is not None:
+                dep.hash_info, dep.meta, dep.obj, dep.fs_path = result
+
+
+def _map(func: t.Callable, items: list, jobs: int) -> list:
+    """Apply ``func`` to the items, in ``jobs`` threads if ``jobs > 1``."""
+    if jobs == 1:
+        return [func(x) for x in items]
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        return [*executor.map(func, items)]
+
+
+@dataclasses.dataclass(frozen=True)
+class StageStatus:
+    """The status of a stage computed by ``get_graph_status``.
+
+    Attributes
+    ----------
+    changed : bool | None
+        True if the stage has to run again, False if not and None if the
+        status is unknown, e.g. for stages that are not zntrack nodes.
+    upstream : tuple[str, ...]
+        The changed upstream stages, if the stage changed because of them.
+        The stage itself is not hashed in this case.
+    reasons : tuple[str, ...]
+        Why the stage changed or its status is unknown: the entries of the
+        lock that differ, i.e. 'cmd', 'deps' and 'params', or 'upstream',
+        'never_run', 'not_a_node', 'no_lockfile' and 'not_a_pipeline_stage'.
+    """
+
+    changed: bool | None
+    upstream: tuple[str, ...] = ()
+    reasons: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict:
+        labels = {True: "changed", False: "unchanged", None: "unknown"}
+        return {
+            "status": labels[self.changed],
+            "reasons": [*self.reasons],
+            "upstream": [*self.upstream],
+        }
+
+
+def get_graph_status(
+    fs: dvc.api.DVCFileSystem | None = None,
+    targets: list[str] | None = None,
+    jobs: int = 1,
+    cache: StatusCache | None = None,
+    callback: t.Callable[["Stage", StageStatus], None] | None = None,
+) -> dict[str, StageStatus]:
+    """Compute the status of the stages in topological order.
+
+    A stage with a changed upstream stage is changed as well and its
+    dependencies are not hashed. The other stages of a generation, i.e.
+    stages whose upstream stages are all known, can be checked in parallel.
+    Only changed pipeline stages are propagated, the status of a stage
+    with an unknown upstream status is computed from its own lock.
+
+    Parameters
+    ----------
+    fs : dvc.api.DVCFileSystem, optional
+        The repository to check, defaults to the workspace.
+    targets : list[str], optional
+        Only check these stages and their upstream stages.
+    jobs : int
+        The number of threads to check a generation with. Experimental: the
+        threads share ``fs.repo``, which DVC does not support officially.
+    cache : StatusCache, optional
+        Share the files read and the dependency hashes.
+    callback : callable, optional
+        Called with every stage and its status once it is known.
+
+    Returns
+    -------
+    dict[str, StageStatus]
+        The status by the addressing of the stage, e.g. 'Node' or
+        'path/dvc.yaml:Node'.
+    """
+    import networkx as nx
+    from dvc.stage import PipelineStage
+
+    if fs is None:
+        fs = dvc.api.DVCFileSystem()
+    if cache is None:
+        cache = StatusCache(fs)
+    # edges point from a stage to the stages it depends on
+    graph = fs.repo.index.graph
+    if targets is not None:
+        addressings = {
+            x.addressing for target in targets for x in fs.repo.stage.collect(target)
+        }
+        stages = [x for x in graph if x.addressing in addressings]
+        upstream = (nx.descendants(graph, x) for x in stages)
+        graph = graph.subgraph(set(stages).union(*upstream))
+
+    status: dict[str, StageStatus] = {}
+
+    def _set(stage, value: StageStatus) -> None:
+        status[stage.addressing] = value
+        if callback is not None:
+            callback(stage, value)
+
+    for generation in nx.topological_generations(graph.reverse(copy=False)):
+        todo = []
+        for stage in generation:
+            upstream = tuple(
+                sorted(
+                    x.addressing
+                    for x in graph.successors(stage)
+                    if status[x.addressing].changed
+                )
+            )
+            if upstream:
+                _set(stage, StageStatus(True, upstream, reasons=("upstream",)))
+            elif not isinstance(stage, PipelineStage):
+                _set(stage, StageStatus(None, reasons=("not_a_pipeline_stage",)))
+            else:
+                todo.append(stage)
+        for stage, value in zip(
+            todo, _map(lambda x: check_stage(x, fs, cache), todo, jobs)
+        ):
+            _set(stage, value)
+    return status
+
 
 def get_node_status(
     addressing: str,
@@ -14,14 +284,14 @@ def get_node_status(
 ) -> bool | None:
     """Check if a node has changed since the last DVC run.
 
+    A node is changed as well, if one of its upstream nodes changed,
+    see ``get_graph_status``.
+
     Returns:
-        - True if the node has changed
+        - True if the node or one of its upstream nodes has changed
         - False if the node has not changed
         - None if the node does not exist or is not a zntrack node
     """
-
-    # TODO: this should check the node status of all dependencies, and if
-    # any of them has changed, the value should be set to None / unknown.
     if fs is None:
         fs = dvc.fs.DVCFileSystem(
             repo=remote,
@@ -31,35 +301,129 @@ def get_node_status(
         stage = next(iter(fs.repo.stage.collect(addressing)))
     except Exception:
         return None
-    stage.save_deps(allow_missing=True)
-    dvc_lock = to_single_stage_lockfile(stage)
-    dvc_lock = {k: v for k, v in dvc_lock.items() if k in ["cmd", "deps", "params"]}
+    status = get_graph_status(fs, targets=[stage.addressing])
+    return status[stage.addressing].changed
 
-    try:
-        zntrack_meta = json.loads(
-            fs.read_text(Path(stage.path_in_repo).parent / "zntrack.json"),
-        )
-    except FileNotFoundError:
-        return None
 
+def get_stage_status(
+    stage: "Stage", fs: dvc.api.DVCFileSystem, cache: StatusCache | None = None
+) -> bool | None:
+    """Check if a collected stage has changed since the last DVC run.
+
+    Parameters
+    ----------
+    stage : dvc.stage.Stage
+        The stage, collected from ``fs.repo``.
+    fs : dvc.api.DVCFileSystem
+        The file system of the repository.
+    cache : StatusCache, optional
+        Share the files read and the dependency hashes between stages.
+
+    Returns
+    -------
+    bool | None
+        See ``get_node_status``.
+    """
+    return check_stage(stage, fs, cache).changed
+
+
+def check_stage(
+    stage: "Stage", fs: dvc.api.DVCFileSystem, cache: StatusCache | None = None
+) -> StageStatus:
+    """Like ``get_stage_status`` but including the reasons of the status.
+
+    The dependencies are only hashed if the node has been run before.
+    """
+    zntrack_path = Path(stage.path_in_repo).parent / "zntrack.json"
     try:
+        if cache is None:
+            zntrack_meta = json.loads(fs.read_text(zntrack_path))
+        else:
+            zntrack_meta = cache.read_zntrack_json(zntrack_path)
         nwd = Path(zntrack_meta[stage.name]["nwd"]["value"])
-    except KeyError:
-        return None
+    except (FileNotFoundError, KeyError):
+        return StageStatus(None, reasons=("not_a_node",))
 
     nwd_in_repo = Path(stage.path_in_repo).parent / nwd
     try:
         node_meta = json.loads(fs.read_text(nwd_in_repo / "node-meta.json"))
     except FileNotFoundError:
-        return True
+        return StageStatus(True, reasons=("never_run",))
 
     try:
         node_lock = node_meta["lockfile"]
     except KeyError:
-        return None  # old zntrack version
+        # old zntrack version
+        return StageStatus(None, reasons=("no_lockfile",))
 
-    # Compare dvc_lock with node_lock
-    if dvc_lock == node_lock:
-        return False
+    if cache is None:
+        stage.save_deps(allow_missing=True)
     else:
+        cache.save_deps(stage)
+    dvc_lock = to_single_stage_lockfile(stage)
+
+    reasons = tuple(key for key in LOCK_KEYS if dvc_lock.get(key) != node_lock.get(key))
+    return StageStatus(bool(reasons), reasons=reasons)
+
+
+def stage_changed(stage: "Stage", cache: StatusCache) -> bool:
+    """Like ``stage.changed()`` but hashing every file dependency once per cache.
+
+    Unlike ``check_stage``, the stage is compared to the ``dvc.lock`` file.
+    """
+    from dvc.dependency.base import Dependency
+
+    if stage.changed_stage():
         return True
+    if not stage.frozen:
+        if stage.is_callback or stage.always_changed:
+            return True
+        for dep in stage.deps:
+            if type(dep) is not Dependency:  # e.g. parameters or imports
+                if dep.status():
+                    return True
+                continue
+            locked = dep.hash_info
+            result = cache.hash_dep(dep)
+            if result is None or not locked or result[0] != locked:
+                return True
+    return stage.changed_outs()
+
+
+def get_changed(
+    fs: dvc.api.DVCFileSystem,
+    addressings: list[str],
+    jobs: int = 1,
+    cache: StatusCache | None = None,
+) -> dict[str, bool]:
+    """Check if many stages changed, see ``stage_changed``.
+
+    The stages are collected from a single index and checked under a
+    single repository lock, sharing the dependency hashes.
+
+    Parameters
+    ----------
+    fs : dvc.api.DVCFileSystem
+        The repository to check.
+    addressings : list[str]
+        The stages to check, e.g. 'Node' or 'path/dvc.yaml:Node'.
+    jobs : int
+        The number of threads, experimental, see ``get_graph_status``.
+    cache : StatusCache, optional
+        Share the dependency hashes, e.g. with a ``HashCache``.
+
+    Returns
+    -------
+    dict[str, bool]
+        Whether the stage changed by its addressing.
+    """
+    if cache is None:
+        cache = StatusCache(fs)
+    index = {x.addressing: x for x in fs.repo.index.stages}
+    stages = [
+        index[x] if x in index else next(iter(fs.repo.stage.collect(x)))
+        for x in addressings
+    ]
+    with fs.repo.lock:
+        result = _map(lambda stage: stage_changed(stage, cache), stages, jobs)
+    return dict(zip(addressings, result))
@@ -0,0 +1,170 @@
+"""Trace where the time goes while building, loading, running and saving nodes.
+
+Set the ``ZNTRACK_TRACE`` environment variable to a file path to record
+spans for e.g. ``Project.build``, ``Node.from_rev``, loading fields, the
+plugin ``setup`` and ``save``, the lockfile and ``node-meta.json``.
+The spans are appended to the file, so processes started via ``dvc repro``
+write to the same trace. If the path ends with ``.json``, the file uses the
+Chrome trace event format, which can be opened in ``chrome://tracing``,
+Perfetto or speedscope. Otherwise every span is written as a JSON line::
+
+    {"name": "field.get", "span_id": "...", "parent_id": "...",
+     "start_time": 1700000000000000000, "duration": 0.001, "pid": 1, "tid": 1,
+     "attributes": {"node": "A", "field": "outs", "cache": "miss", "bytes": 12}}
+
+Without ``ZNTRACK_TRACE`` every function of this module is a no-op.
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+import typing as t
+import uuid
+
+_T = t.TypeVar("_T", bound=t.Callable)
+
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "zntrack_span", default=None
+)
+_lock = threading.Lock()
+
+
+class Span:
+    """A timed operation, see ``span``."""
+
+    def __init__(self, name: str, attributes: dict, parent: "Span | None"):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_time = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self.duration_ns = 0
+
+    def end(self) -> None:
+        self.duration_ns = time.perf_counter_ns() - self._start
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration": self.duration_ns / 1e9,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attributes": self.attributes,
+        }
+
+    def to_chrome_event(self) -> dict:
+        return {
+            "name": self.name,
+            "cat": "zntrack",
+            "ph": "X",
+            "ts": self.start_time / 1e3,
+            "dur": self.duration_ns / 1e3,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.attributes,
+        }
+
+
+def get_trace_path() -> pathlib.Path | None:
+    """The file set via ``ZNTRACK_TRACE`` or None if tracing is disabled."""
+    if path := os.environ.get("ZNTRACK_TRACE"):
+        return pathlib.Path(path)
+    return None
+
+
+def is_enabled() -> bool:
+    return bool(os.environ.get("ZNTRACK_TRACE"))
+
+
+def _export(span: Span, path: pathlib.Path) -> None:
+    if path.suffix == ".json":
+        # the closing bracket of the JSON array format is optional
+        line = json.dumps(span.to_chrome_event(), default=str) + ",\n"
+    else:
+        line = json.dumps(span.to_json(), default=str) + "\n"
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as file:
+            if path.suffix == ".json" and file.tell() == 0:
+                line = "[\n" + line
+            file.write(line)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes) -> t.Iterator[None]:
+    """Record the time spent in the context as a span.
+
+    Parameters
+    ----------
+    name : str
+        The name of the operation, e.g. 'Node.from_rev'.
+    **attributes
+        Additional information, e.g. the node name or the number of bytes read.
+        Use ``add_attributes`` to add attributes within the context.
+    """
+    if (path := get_trace_path()) is None:
+        yield
+        return
+    current = Span(name, attributes, parent=_current_span.get())
+    token = _current_span.set(current)
+    try:
+        yield
+    except BaseException as err:
+        current.attributes["error"] = type(err).__name__
+        raise
+    finally:
+        current.end()
+        _current_span.reset(token)
+        _export(current, path)
+
+
+def is_current(name: str, **attributes) -> bool:
+    """Whether the current span has the given name and attributes."""
+    current = _current_span.get()
+    if current is None or current.name != name:
+        return False
+    return all(current.attributes.get(k) == v for k, v in attributes.items())
+
+
+def add_attributes(**attributes) -> None:
+    """Add attributes to the current span."""
+    if (current := _current_span.get()) is not None:
+        current.attributes.update(attributes)
+
+
+def record_bytes(file: t.IO) -> None:
+    """Add the position of a file read to the end, i.e. its size, to the span."""
+    if _current_span.get() is not None:
+        with contextlib.suppress(OSError, AttributeError, ValueError):
+            add_attributes(bytes=file.tell())
+
+
+def traced(name: str) -> t.Callable[[_T], _T]:
+    """Decorate a function to record every call as a span."""
+
+    def decorator(func: _T) -> _T:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def load_trace(path: pathlib.Path) -> list[dict]:
+    """Load the spans or the Chrome trace events written to a file."""
+    text = path.read_text()
+    if path.suffix == ".json":
+        return json.loads(text.rstrip().rstrip(",").rstrip("]") + "]")
+    return [json.loads(line) for line in text.splitlines() if line]
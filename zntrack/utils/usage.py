@@ -0,0 +1,174 @@
+"""Measure the resources used while running a node.
+
+The CPU time is taken from ``getrusage`` for the current process and its
+terminated child processes. The bytes read and written are the ``rchar`` and
+``wchar`` counters of ``/proc/self/io`` and include reads served from the
+page cache. All values are process wide, so nodes running in parallel
+threads are included. Values not available on the platform are omitted.
+
+The peak resident memory of a node ('peak_rss') is measured on Linux by
+resetting the high-water mark of the process via ``/proc/self/clear_refs``
+before the node runs and reading ``VmHWM`` afterwards. Child processes are
+included if they exceeded the peak of all earlier children. The high-water
+mark belongs to the whole process, so 'peak_rss' is None for nodes that
+ran at the same time as other nodes in the process. Elsewhere only
+the peak over the whole lifetime of the process is available from
+``getrusage``. As it includes all nodes that ran in the same process before,
+e.g. with ``Project.run`` or ``zntrack run-many``, it is stored as
+'peak_rss_process' instead.
+"""
+
+import contextlib
+import pathlib
+import sys
+import threading
+import time
+import typing as t
+import weakref
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PROC_IO = pathlib.Path("/proc/self/io")
+_PROC_CLEAR_REFS = pathlib.Path("/proc/self/clear_refs")
+_PROC_STATUS = pathlib.Path("/proc/self/status")
+
+# the trackers currently measuring in this process
+_ACTIVE: "weakref.WeakSet[UsageTracker]" = weakref.WeakSet()
+_ACTIVE_LOCK = threading.Lock()
+
+
+def _cpu_times() -> dict[str, float]:
+    if resource is None:
+        return {}
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return {
+        "cpu_user": usage.ru_utime + children.ru_utime,
+        "cpu_system": usage.ru_stime + children.ru_stime,
+    }
+
+
+def _io_bytes() -> dict[str, int]:
+    try:
+        lines = _PROC_IO.read_text().splitlines()
+    except OSError:
+        return {}
+    counters = dict(line.split(": ") for line in lines if ": " in line)
+    return {"read_bytes": int(counters["rchar"]), "write_bytes": int(counters["wchar"])}
+
+
+def _to_bytes(maxrss: int) -> int:
+    # bytes on macOS, kilobytes on Linux
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _children_peak_rss() -> int | None:
+    if resource is None:
+        return None
+    return _to_bytes(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+def peak_rss() -> int | None:
+    """The peak resident memory of the process and its children in bytes.
+
+    This is the peak over the whole lifetime of the process.
+    """
+    if resource is None:
+        return None
+    return max(
+        _to_bytes(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss),
+        _children_peak_rss(),
+    )
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak resident memory of the process, only possible on Linux."""
+    try:
+        _PROC_CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _vm_hwm() -> int | None:
+    """The peak resident memory since the last ``reset_peak_rss`` in bytes."""
+    try:
+        lines = _PROC_STATUS.read_text().splitlines()
+    except OSError:
+        return None
+    for line in lines:
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+class UsageTracker:
+    """Collect the resources used from its creation until ``stop``.
+
+    The wall times of phases, e.g. saving the results, can be recorded
+    after the tracker has been stopped.
+
+    Examples
+    --------
+    >>> tracker = UsageTracker()
+    >>> with tracker.phase("run"):
+    ...     node.run()
+    >>> tracker.stop()
+    >>> tracker.result()
+    {'cpu_user': 0.1, 'cpu_system': 0.0, ..., 'run': 0.1}
+    """
+
+    def __init__(self):
+        self._start = {**_cpu_times(), **_io_bytes()}
+        self._children_peak = _children_peak_rss()
+        self._usage: dict[str, float | int | None] | None = None
+        self.phases: dict[str, float] = {}
+        with _ACTIVE_LOCK:
+            # resetting the high-water mark would corrupt the other trackers
+            self._shared = bool(_ACTIVE)
+            for tracker in _ACTIVE:
+                tracker._shared = True
+            _ACTIVE.add(self)
+            self._reset = not self._shared and reset_peak_rss()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> t.Iterator[None]:
+        """Measure the wall time of a phase, e.g. 'run' or 'save'."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def stop(self) -> None:
+        """Stop measuring the resources, the phases can still be recorded."""
+        if self._usage is not None:
+            return
+        end = {**_cpu_times(), **_io_bytes()}
+        usage = {key: end[key] - value for key, value in self._start.items()}
+        with _ACTIVE_LOCK:
+            _ACTIVE.discard(self)
+            shared, reset = self._shared, self._reset
+        if shared:
+            usage["peak_rss"] = None
+        elif reset and (peak := _vm_hwm()) is not None:
+            children = _children_peak_rss()
+            if children is not None and children > self._children_peak:
+                peak = max(peak, children)
+            usage["peak_rss"] = peak
+        elif (peak := peak_rss()) is not None:
+            usage["peak_rss_process"] = peak
+        self._usage = usage
+
+    def result(self) -> dict[str, float | int | None]:
+        """Get the resources used until ``stop`` and the phases.
+
+        CPU and wall times are in seconds, memory and I/O in bytes. The
+        tracker is stopped, if it is still running.
+        """
+        self.stop()
+        return {**self._usage, **self.phases}
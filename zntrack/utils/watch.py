@@ -0,0 +1,251 @@
+"""Keep the status of the nodes up to date while files change.
+
+The paths each stage depends on are derived once from ``dvc.yaml`` and
+``zntrack.json``: its dependencies, its parameter files and its
+``node-meta.json``, which is written when the node runs. Changes are
+detected via ``watchdog``, if it is installed, or by polling the
+modification time, size and inode of the watched paths. Only the stages
+depending on a changed path and their downstream stages are checked again.
+A change of ``dvc.yaml`` or ``zntrack.json`` reloads everything.
+"""
+
+import json
+import logging
+import os
+import pathlib
+import queue
+import socket
+import threading
+import typing as t
+
+from zntrack.config import (
+    DVC_FILE_PATH,
+    HASH_CACHE_PATH,
+    ZNTRACK_FILE_PATH,
+)
+from zntrack.utils import dag
+from zntrack.utils.hash_cache import HashCache, snapshot
+
+if t.TYPE_CHECKING:
+    from zntrack.utils.state import StageStatus
+
+log = logging.getLogger(__name__)
+
+_RELOAD_PATHS = {DVC_FILE_PATH.as_posix(), ZNTRACK_FILE_PATH.as_posix()}
+
+
+def get_watched_paths(
+    stages: dict[str, dict], nwds: dict[str, pathlib.Path]
+) -> dict[str, set[str]]:
+    """Map every path to watch to the stages that depend on it."""
+    watched: dict[str, set[str]] = {}
+    for name, stage in stages.items():
+        paths = [*dag.stage_dependencies(stage), *dag.stage_params(stage)]
+        if name in nwds:
+            paths.append((nwds[name] / "node-meta.json").as_posix())
+        for path in paths:
+            watched.setdefault(pathlib.PurePosixPath(path).as_posix(), set()).add(name)
+    return watched
+
+
+def get_downstream(graph: dag.STAGE_GRAPH, names: t.Iterable[str]) -> set[str]:
+    """Get the given stages and all stages depending on them."""
+    downstream: dict[str, set[str]] = {}
+    for name, upstream in graph.items():
+        for other in upstream:
+            downstream.setdefault(other, set()).add(name)
+    result, todo = set(), [*names]
+    while todo:
+        if (name := todo.pop()) not in result:
+            result.add(name)
+            todo.extend(downstream.get(name, ()))
+    return result
+
+
+class Poller:
+    """Detect changes of the watched paths by comparing their stat."""
+
+    def __init__(self, paths: t.Iterable[str]):
+        self.snapshots = {path: snapshot(path) for path in paths}
+
+    def changes(self) -> set[str]:
+        changed = set()
+        for path, previous in self.snapshots.items():
+            if (current := snapshot(path)) != previous:
+                self.snapshots[path] = current
+                changed.add(path)
+        return changed
+
+
+def _start_observer(root: pathlib.Path, events: queue.Queue):
+    """Watch the directory via ``watchdog`` or return None if not installed."""
+    try:
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+    except ImportError:
+        return None
+
+    class _Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            for path in (event.src_path, getattr(event, "dest_path", "")):
+                if path:
+                    events.put(pathlib.Path(os.fsdecode(path)))
+
+    observer = Observer()
+    observer.schedule(_Handler(), os.fspath(root), recursive=True)
+    observer.start()
+    return observer
+
+
+def _match(path: pathlib.Path, root: pathlib.Path, watched: t.Iterable[str]) -> set[str]:
+    """Get the watched paths that are the path or one of its parents."""
+    try:
+        relative = pathlib.PurePosixPath(path.resolve().relative_to(root).as_posix())
+    except ValueError:
+        return set()
+    candidates = {relative.as_posix(), *(x.as_posix() for x in relative.parents)}
+    return candidates & set(watched)
+
+
+def watch(
+    callback: t.Callable[[str, "StageStatus"], None],
+    interval: float = 1.0,
+    jobs: int = 1,
+    stop: threading.Event | None = None,
+    use_events: bool = True,
+) -> None:
+    """Report the status of every stage and then every change of a status.
+
+    Parameters
+    ----------
+    callback : callable
+        Called with the name and the ``StageStatus`` of a stage, first for
+        all stages and then every time the status of a stage changes.
+    interval : float
+        Seconds to wait for changes, i.e. the polling interval.
+    jobs : int
+        The number of threads to compute the status, see ``get_graph_status``.
+    stop : threading.Event, optional
+        Stop watching once the event is set. Otherwise, watch forever.
+    use_events : bool
+        Use file system events via ``watchdog``, if installed.
+    """
+    import dvc.api
+
+    from zntrack.utils.state import StatusCache, get_graph_status
+
+    stop = stop or threading.Event()
+    root = pathlib.Path.cwd().resolve()
+    hash_cache = HashCache(root / HASH_CACHE_PATH)
+    status: dict[str, StageStatus] = {}
+
+    def _update(targets: set[str] | None) -> None:
+        cache = StatusCache(fs, hash_cache)
+        if targets is not None:
+            targets = [x for x in targets if x in stages]
+        result = get_graph_status(fs, targets=targets, jobs=jobs, cache=cache)
+        hash_cache.save()
+        for name, value in result.items():
+            if status.get(name) != value:
+                status[name] = value
+                callback(name, value)
+
+    events: queue.Queue = queue.Queue()
+    observer = _start_observer(root, events) if use_events else None
+    if observer is None:
+        log.debug("Polling for changes every %s seconds.", interval)
+    reload = True
+    try:
+        while not stop.is_set():
+            if reload:
+                stages = dag.load_stages(DVC_FILE_PATH)
+                graph = dag.get_stage_graph(stages)
+                watched = get_watched_paths(stages, dag.load_nwds(ZNTRACK_FILE_PATH))
+                watched.update({path: set() for path in _RELOAD_PATHS})
+                poller = Poller(watched)
+                fs = dvc.api.DVCFileSystem()
+                for name in set(status) - set(stages):
+                    del status[name]
+                _update(None)
+                reload = False
+
+            if observer is None:
+                stop.wait(interval)
+                changed = poller.changes()
+            else:
+                changed = set()
+                try:
+                    paths = [events.get(timeout=interval)]
+                    while not events.empty():
+                        paths.append(events.get_nowait())
+                except queue.Empty:
+                    continue
+                for path in paths:
+                    changed |= _match(path, root, watched)
+            if changed & _RELOAD_PATHS:
+                reload = True
+            elif changed:
+                affected = set().union(*(watched[path] for path in changed))
+                log.debug("Changed: %s, checking %s", changed, affected)
+                _update(get_downstream(graph, affected))
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+class StatusBroadcaster:
+    """Send status updates as JSON lines to the clients of a Unix socket.
+
+    A client receives the current status of every stage when it connects.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path of the Unix socket.
+    """
+
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        self.status: dict[str, dict] = {}
+        self._clients: list[socket.socket] = []
+        self._lock = threading.Lock()
+        self._server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.path.unlink(missing_ok=True)
+        self._server.bind(os.fspath(self.path))
+        self._server.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return  # closed
+            with self._lock:
+                lines = [json.dumps(x) for x in self.status.values()]
+                if self._send(client, lines):
+                    self._clients.append(client)
+
+    @staticmethod
+    def _send(client: socket.socket, lines: list[str]) -> bool:
+        try:
+            client.sendall("".join(f"{line}\n" for line in lines).encode())
+        except OSError:
+            client.close()
+            return False
+        return True
+
+    def __call__(self, name: str, value: "StageStatus") -> None:
+        record = {"name": name, **value.to_dict()}
+        with self._lock:
+            self.status[name] = record
+            line = json.dumps(record)
+            self._clients = [x for x in self._clients if self._send(x, [line])]
+
+    def close(self) -> None:
+        self._server.close()
+        with self._lock:
+            for client in self._clients:
+                client.close()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,206 @@
+"""Persistent worker to execute 'zntrack run' with warm imports.
+
+The worker imports ZnTrack, its runtime dependencies (see ``PRELOAD_MODULES``)
+and optionally heavy user dependencies once and listens on a local Unix
+socket. Each request is executed in a forked child process, so every run
+starts from the warm parent state but is isolated from all other runs with
+respect to the working directory, the environment variables, ``sys.path``
+and any module imported while running the node.
+
+The client sends its standard streams together with the request, so the
+output of the node appears in the terminal of the ``zntrack run`` call.
+"""
+
+import contextlib
+import importlib
+import json
+import logging
+import os
+import pathlib
+import signal
+import socket
+import sys
+import traceback
+import typing as t
+
+from zntrack.config import WORKER_SOCKET_PATH
+
+log = logging.getLogger(__name__)
+
+_MAX_MESSAGE_SIZE = 1024 * 1024
+
+# imported lazily by ZnTrack, but needed by every 'zntrack run'
+PRELOAD_MODULES = (
+    "dvc.api",
+    "dvc.repo",
+    "dvc.stage",
+    "git",
+    "pandas",
+    "yaml",
+    "zntrack.from_rev",
+    "zntrack.utils.lockfile",
+)
+
+
+def get_socket_path() -> pathlib.Path:
+    """Get the path of the worker socket.
+
+    Can be configured via the ``ZNTRACK_WORKER_SOCKET`` environment variable.
+    """
+    return pathlib.Path(os.environ.get("ZNTRACK_WORKER_SOCKET", WORKER_SOCKET_PATH))
+
+
+def _std_fds() -> list[int] | None:
+    try:
+        return [sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno()]
+    except (AttributeError, OSError, ValueError):
+        # e.g. captured output in tests
+        return None
+
+
+def forward(command: str, kwargs: dict, socket_path: pathlib.Path | None = None):
+    """Forward a command to a running worker.
+
+    Returns
+    -------
+    int | None
+        The exit code of the command or None, if no worker is available and
+        the command must be executed in the current process.
+    """
+    if os.environ.get("ZNTRACK_WORKER_DISABLE", "").lower() in ("1", "true"):
+        return None
+    socket_path = socket_path or get_socket_path()
+    if not socket_path.exists() or not hasattr(socket, "AF_UNIX"):
+        return None
+    fds = _std_fds()
+    if fds is None:
+        return None
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    request = {
+        "command": command,
+        "kwargs": kwargs,
+        "cwd": os.getcwd(),
+        "env": dict(os.environ),
+        "sys_path": sys.path,
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(os.fspath(socket_path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            # stale socket file without a worker
+            return None
+        message = json.dumps(request).encode()
+        sent = socket.send_fds(sock, [message], fds)
+        sock.sendall(message[sent:])
+        sock.shutdown(socket.SHUT_WR)
+        response = b""
+        while chunk := sock.recv(4096):
+            response += chunk
+    if not response:
+        # the child process died without reporting back
+        return 1
+    return json.loads(response)["exit_code"]
+
+
+def _recv_request(conn: socket.socket) -> tuple[dict, list[int]]:
+    message, fds, _, _ = socket.recv_fds(conn, _MAX_MESSAGE_SIZE, 3)
+    while chunk := conn.recv(4096):
+        message += chunk
+    return json.loads(message), fds
+
+
+def _handle(conn: socket.socket, handlers: dict[str, t.Callable]) -> int:
+    request, fds = _recv_request(conn)
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.path[:] = request["sys_path"]
+    importlib.invalidate_caches()
+
+    try:
+        handlers[request["command"]](**request["kwargs"])
+        exit_code = 0
+    except SystemExit as err:
+        # like the interpreter: None is success, other objects are printed
+        if err.code is None or isinstance(err.code, int):
+            exit_code = err.code or 0
+        else:
+            print(err.code, file=sys.stderr)
+            exit_code = 1
+    except Exception:
+        traceback.print_exc()
+        exit_code = 1
+    return exit_code
+
+
+def _run_child(conn: socket.socket, handlers: dict[str, t.Callable]) -> t.NoReturn:
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    exit_code = 1
+    try:
+        exit_code = _handle(conn, handlers)
+    finally:
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(json.dumps({"exit_code": exit_code}).encode())
+            conn.close()
+        os._exit(exit_code)
+
+
+def serve(
+    handlers: dict[str, t.Callable],
+    socket_path: pathlib.Path | None = None,
+    preload: list[str] | None = None,
+) -> None:
+    """Run the worker until interrupted.
+
+    Parameters
+    ----------
+    handlers : dict[str, Callable]
+        The commands that can be executed by the worker.
+    socket_path : pathlib.Path, optional
+        The path to the Unix socket. Defaults to ``get_socket_path()``.
+    preload : list[str], optional
+        Additional modules to import once in the worker, e.g. ``torch``.
+        The ``PRELOAD_MODULES`` are always imported. Modules which change
+        between runs should not be preloaded, because the worker would keep
+        using the version imported at startup.
+    """
+    socket_path = socket_path or get_socket_path()
+    for module in [*PRELOAD_MODULES, *(preload or [])]:
+        importlib.import_module(module)
+
+    if socket_path.exists():
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(os.fspath(socket_path))
+            except ConnectionRefusedError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"A worker is already listening on '{socket_path}'.")
+
+    # reap the finished children automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(os.fspath(socket_path))
+        server.listen()
+        log.info(f"ZnTrack worker listening on '{socket_path}'")
+        try:
+            while True:
+                conn, _ = server.accept()
+                if os.fork() == 0:
+                    server.close()
+                    _run_child(conn, handlers)
+                conn.close()
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)